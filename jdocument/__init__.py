@@ -5,7 +5,24 @@
     Modulos:
         jDocument
         json2table
+        jpath
+        jindex
+        jfilter
+        jlock
+        jparallel
+        jplan
+        jaggregate
+        jnumeric
+        jcolumn
+        jsketch
+        jview
+        jsort
+        jstream
+        jmmap
+        jbulk
 """
 from .jDocument import jDocument
 from .jsjson import loads, dumps
-
+from .jfilter import jFilter, compileFilter, jExpression, compileExpression
+from .jsort import sortJsonl, iterMerge, mergeJsonl
+from .jbulk import iterBulkChunks, writeBulk
@@ -6,13 +6,19 @@
 
     Functions:
         adjustText(txt: str, case:int = 0) -> str
+        foldText(txt: str) -> str
+        textTokens(txt: str) -> set
         str2date(dd: str) -> date
         getDocAttributes(attribs:dict, obj: dict, prefix: str = '')
         getDataType(dt:any) -> str
-        dumpBulkElastik(jList: list) -> str
+        dumpBulkElastik(jList: list, idAttrib: str = None, filename: str = None, ...) -> str
 """
+from __future__ import annotations
+
 import copy
+import io
 import re
+from concurrent.futures import Executor
 from datetime import datetime, date
 import cProfile
 import pstats
@@ -22,11 +28,14 @@ import pstats
 # import jsjson as js
 import unidecode
 
+from jDocument.jbulk import writeBulk, CONST_BULK_MAX_DOCS, CONST_BULK_MAX_BYTES
+
 HELPER_NOACCENTS = 0
 HELPER_CAMELCASE = 1
 HELPER_PASCALCASE = 2
 
 refind = re.compile(r".*'(.*)'.*")  # RegEx para extrair o tipo do atributo
+retoken = re.compile(r"[a-z0-9]+")  # RegEx para separar as palavras de um texto sem acentos e em minúsculas
 
 
 def getDateGroup(dateValue: datetime, groupType: str) -> str:
@@ -233,6 +242,32 @@ def adjustText(txt: str, case: int = 0) -> str:
     return s
 
 
+def foldText(txt: str) -> str:
+    """
+    Remove a acentuação (unidecode) e converte o texto para minúsculas, para comparações 'Case Insensitive' e sem acentos.
+
+    Args:
+        txt (str): texto a ser ajustado.
+
+    Returns:
+        str: texto sem acentos e em minúsculas.
+    """
+    return unidecode.unidecode(txt).lower()
+
+
+def textTokens(txt: str) -> set:
+    """
+    Retorna as palavras (sequências de letras e números) do texto sem acentos e em minúsculas, veja foldText().
+
+    Args:
+        txt (str): texto a ser separado em palavras.
+
+    Returns:
+        set: conjunto das palavras do texto.
+    """
+    return set(retoken.findall(foldText(txt)))
+
+
 def escapeRegEx(txt: str) -> str:
     """
     Adiciona '\' aos caracteres de RegEx.
@@ -329,45 +364,37 @@ def getDataType(var: any) -> str:
     return tp.split('.')[0]
 
 
-def dumpBulkElastik(jlist: list, idAttrib: str, filename: str = None) -> str:
+def dumpBulkElastik(jlist: list, idAttrib: str = None, filename: str = None, action: str = 'index', index: str = None,
+                    maxDocs: int = CONST_BULK_MAX_DOCS, maxBytes: int = CONST_BULK_MAX_BYTES, parallel: int | Executor = None) -> str:
     """
-    Cria um script de BULK INSERT para o Eslastic com os objectos da lista.
+    Cria um script de BULK para o Elastic com os documentos da lista (veja jbulk), gravado de forma incremental: num arquivo,
+    em um arquivo por chunk (quando o nome contém '{}') ou, sem arquivo, num buffer cujo conteúdo é retornado.
+
+    Examples:
+        dumpBulkElastik(jProducts, 'sku', 'products.ndjson')
+        dumpBulkElastik(jProducts, 'sku', 'products_{:04d}.ndjson', index='products', maxBytes=10 * 1024 * 1024)
 
     Args:
-        jlist (list): list de dicionários com documento Json
+        jlist (list): lista (ou jDocument array) de documentos, dicionários ou jDocuments
         idAttrib: nome do atributo que será usado como ID
-        filename (str): arquivo para gravação do arquivo de BULK INSERT
+        filename (str): arquivo para gravação do arquivo de BULK, com '{}' um arquivo por chunk
+        action (str): 'index', 'create', 'update' ou 'delete'
+        index (str): nome do índice (_index) dos documentos
+        maxDocs (int): número máximo de documentos de um chunk
+        maxBytes (int): tamanho máximo de um chunk em bytes (http.max_content_length)
+        parallel: número de processos (ou um Executor) que codificam os documentos
 
     Returns:
-        str: string contendo o documento
+        str: string contendo o documento, vazio quando é gravado em arquivo
     """
     if filename:
-        jFile = open(filename, "w", encoding='utf-8')
-    else:
-        jFile = None
-    # endif --
-
-    # itera em cada objeto da lista
-    s = ''
-    for jDoc in jlist:
-        idx = '{ "index" : { "_id" : "' + jDoc.get(idAttrib) + '" } }\n'
-
-        if not filename:
-            s += idx
-            s += f'{jDoc.getJson(flagPretty=False)}\n'
-        else:
-            jFile.write(idx)
-            jFile.write(f'{jDoc.getJson(flagPretty=False)}\n')
-        # ndeif --
-    # endif --
-
-    if not filename:
-        return s
+        writeBulk(jlist, filename, idAttrib, action, index, maxDocs, maxBytes, parallel)
+        return ''
     # endif --
 
-    jFile.close()
-
-    return ''
+    buffer = io.BytesIO()
+    writeBulk(jlist, buffer, idAttrib, action, index, maxDocs, maxBytes, parallel)
+    return buffer.getvalue().decode('utf-8')
 
 
 def startProfiling():
@@ -398,8 +425,6 @@ def stopProfiling(profiling: cProfile.Profile, sortField: str = None, profFile:
 
 
 def profiling2csv(prof: cProfile.Profile, csvFile: str, flagBR: bool = True):
-    import io
-
     out_stream = io.StringIO()
     pstats.Stats(prof, stream=out_stream).print_stats()
     result = out_stream.getvalue()
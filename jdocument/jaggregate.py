@@ -0,0 +1,221 @@
+"""
+jaggregate
+
+Aggregate functions of the array jDocuments: the functions over the list of the filled values of an attribute (used by
+count(), sum(), ..., aggregate()) and the accumulators used by groupBy(), which compute count, sum, min, max and mean
+value by value, so that the memory of a group does not depend on the number of documents of the group.
+When NumPy is installed, the numeric values are converted once into an ndarray and the functions of NUMERIC_FUNCTIONS
+(sum, mean, min, max, median and std) are computed vectorized, see jnumeric.
+
+Classes:
+    Accumulator
+
+Functions:
+    aggregateValues(lstValues: list, functions: list | tuple) -> dict
+    checkFunctions(functions: list | tuple, allowed: dict | tuple = AGGREGATE_FUNCTIONS)
+    dateGroup(val: any, groupType: str) -> str
+    parseGroupKeys(keys: str | dict | list) -> list
+    parseAggregations(aggregations: dict, lstKeys: list, allowed: dict | tuple = AGGREGATE_FUNCTIONS) -> list
+    groupKey(obj: any, lstKeys: list) -> tuple
+    copyKeyValues(keyValues: list) -> list
+    rowPath(attribute: str, steps: tuple) -> tuple
+"""
+from __future__ import annotations
+
+import statistics
+from collections import Counter
+from copy import deepcopy
+from datetime import date
+
+from jDocument.helpers import getDateGroup, str2datetime
+from jDocument.jpath import compilePath, getPathDefault
+from jDocument.jnumeric import NUMERIC_FUNCTIONS, stdev, toArray
+
+CONST_AGGREGATE_DEFAULT = ('count', 'sum', 'min', 'max', 'mean', 'median')
+CONST_AGGREGATE_STREAM = ('count', 'sum', 'min', 'max', 'mean')  # funções calculadas sem guardar os valores
+CONST_DATE_GROUPS = ('day', 'week', 'month', 'year')
+
+# funções de agregação, cada uma recebe a lista (não vazia) dos valores preenchidos do atributo, veja jDocument.aggregate()
+AGGREGATE_FUNCTIONS = {
+    'count': len,
+    'sum': sum,
+    'min': min,
+    'max': max,
+    'mean': statistics.mean,
+    'mode': statistics.mode,
+    'median': statistics.median,
+    'median_low': statistics.median_low,
+    'median_high': statistics.median_high,
+    'median_grouped': statistics.median_grouped,
+    'std': stdev,
+    'ocorrences': lambda lstValues: dict(Counter(lstValues)),
+    'countDistinct': lambda lstValues: len(set(lstValues)),
+}
+
+
+def aggregateValues(lstValues: list, functions: list | tuple) -> dict:
+    """
+    Returns the result of each aggregate function over the list of filled values of an attribute, "None" when there are no
+    values (except for 'count'). The numeric values are converted once into an ndarray for the functions of NUMERIC_FUNCTIONS.
+    """
+    if not lstValues:
+        return {name: 0 if name == 'count' else None for name in functions}
+
+    arr = toArray(lstValues) if any(name in NUMERIC_FUNCTIONS for name in functions) else None
+    if arr is None:
+        return {name: AGGREGATE_FUNCTIONS[name](lstValues) for name in functions}
+
+    return {name: NUMERIC_FUNCTIONS[name](arr, lstValues) if name in NUMERIC_FUNCTIONS else AGGREGATE_FUNCTIONS[name](lstValues) for name in functions}
+
+
+def checkFunctions(functions: list | tuple, allowed: dict | tuple = AGGREGATE_FUNCTIONS):
+    """
+    Raises an exception if one of the functions is not an aggregate function (see AGGREGATE_FUNCTIONS) or is not one of the allowed functions.
+    """
+    for name in functions:
+        if name not in allowed:
+            raise Exception(f"Invalid aggregate function '{name}'")
+    # endfor --
+
+
+def dateGroup(val: any, groupType: str) -> str:
+    """
+    Returns the label of the period (day, week, month or year) of a date, see helpers.getDateGroup().
+    The value can be a datetime, a date or a string, that is converted with str2datetime(); an invalid date returns "None".
+    """
+    if val and not isinstance(val, date):
+        try:
+            val = str2datetime(val)
+        except Exception:
+            val = None
+    # endif --
+
+    return getDateGroup(val, groupType)
+
+
+def parseGroupKeys(keys: str | dict | list) -> list:
+    """
+    Returns the keys of a grouping (see jDocument.groupBy()) as a list of tuples (name, compiled path, date group or None).
+    """
+    lstKeys = []
+    for key in ([keys] if isinstance(keys, (str, dict)) else keys):
+        for at, groupType in ({key: None} if isinstance(key, str) else key).items():
+            if groupType is not None and groupType not in CONST_DATE_GROUPS:
+                raise Exception(f"Invalid date group '{groupType}', it must be one of {CONST_DATE_GROUPS}")
+            lstKeys.append((at, compilePath(at), groupType))
+    # endfor --
+
+    return lstKeys
+
+
+def parseAggregations(aggregations: dict, lstKeys: list, allowed: dict | tuple = AGGREGATE_FUNCTIONS) -> list:
+    """
+    Returns the aggregations of a grouping (see jDocument.groupBy()) as a list of tuples (name, compiled path, functions).
+    """
+    lstAggregations = []
+    for at, functions in (aggregations or {}).items():
+        functions = [functions] if isinstance(functions, str) else functions
+        checkFunctions(functions, allowed)
+        if at == 'count' or any(at == key[0] for key in lstKeys):
+            raise Exception(f"Err: the attribute '{at}' is a key of the group!")
+        lstAggregations.append((at, compilePath(at), functions))
+    # endfor --
+
+    return lstAggregations
+
+
+def groupKey(obj: any, lstKeys: list) -> tuple:
+    """
+    Returns the key (hashable) of the group of a document and the values of its keys, see parseGroupKeys().
+    """
+    keyValues = []
+    for _, steps, groupType in lstKeys:
+        val = getPathDefault(obj, steps)
+        keyValues.append(val if groupType is None else dateGroup(val, groupType))
+    # endfor --
+
+    # os valores que não podem ser chave de um dicionário (dict, list) são agrupados pela sua representação
+    return tuple(repr(val) if isinstance(val, (dict, list)) else val for val in keyValues), keyValues
+
+
+def copyKeyValues(keyValues: list) -> list:
+    """
+    Returns the values of the keys of a group with the objects and lists copied, so that the group (and its rows) never share them
+    with the documents: changing a row does not change the list and the aggregations of a row are not written inside a document.
+    """
+    return [deepcopy(val) if isinstance(val, (dict, list)) else val for val in keyValues]
+
+
+def rowPath(attribute: str, steps: tuple) -> tuple:
+    """
+    Returns the path of an attribute in the document of a group: subdocuments for the dot notation, the whole name if the path has indexes.
+    """
+    return steps if all(step.__class__ is str for step in steps) else (attribute,)
+
+
+class Accumulator:
+    """
+    Accumulates the filled values of an attribute and computes the aggregate functions.
+    count, sum, min, max and mean are computed value by value (mean = sum / count); the other functions keep the list of values.
+
+    Examples:
+        acc = Accumulator(['count', 'mean'])
+        for val in [10, 20, 30]:
+            acc.add(val)
+        acc.result()  # {'count': 3, 'mean': 20.0}
+    """
+    __slots__ = ('functions', 'count', 'total', 'minimum', 'maximum', 'values', 'flagSum', 'flagMin', 'flagMax')
+
+    def __init__(self, functions: list | tuple):
+        self.functions = functions
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.values = None if all(name in CONST_AGGREGATE_STREAM for name in functions) else []
+        self.flagSum = 'sum' in functions or 'mean' in functions
+        self.flagMin = 'min' in functions
+        self.flagMax = 'max' in functions
+
+    def add(self, val: any):
+        """
+        Adds a (filled) value.
+        """
+        self.count += 1
+        if self.flagSum:
+            self.total += val
+        if self.flagMin and (self.minimum is None or val < self.minimum):
+            self.minimum = val
+        if self.flagMax and (self.maximum is None or val > self.maximum):
+            self.maximum = val
+        if self.values is not None:
+            self.values.append(val)
+
+    def result(self) -> dict:
+        """
+        Returns the result of each function, "None" when there are no values (except for 'count').
+        """
+        # as funções que precisam dos valores são calculadas de uma vez, com um único ndarray
+        values = {}
+        if self.count and self.values is not None:
+            values = aggregateValues(self.values, [name for name in self.functions if name not in CONST_AGGREGATE_STREAM])
+
+        result = {}
+        for name in self.functions:
+            if not self.count:
+                result[name] = 0 if name == 'count' else None
+            elif name == 'count':
+                result[name] = self.count
+            elif name == 'sum':
+                result[name] = self.total
+            elif name == 'min':
+                result[name] = self.minimum
+            elif name == 'max':
+                result[name] = self.maximum
+            elif name == 'mean':
+                result[name] = self.total / self.count
+            else:
+                result[name] = values[name]
+        # endfor --
+
+        return result
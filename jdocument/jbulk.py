@@ -0,0 +1,248 @@
+"""
+jbulk
+
+Export of documents to the Elasticsearch Bulk API (NDJSON: an action line followed, except for 'delete', by a source line).
+The documents (dict or jDocument) are encoded one at a time and grouped in chunks limited by the number of documents and by
+the size in bytes (the limit of a request is the http.max_content_length of the cluster, 100 MB by default), so each chunk is
+a complete body for one request and the memory depends on the size of a chunk, not on the number of documents.
+When orjson is the backend of jsjson (see jsjson.setBackend()) the documents are encoded by orjson, several times faster:
+the Bulk API does not depend on the layout of the Json (separators, representation of the floats), only on its values, and the
+dates are written in the same ISO format; the documents that orjson does not accept are encoded by jsjson.dumps().
+When the number of workers (or an Executor) is informed, batches of documents are encoded by a pool of processes (the shared
+pool of jparallel.getPool()), in order.
+
+Functions:
+    iterBulkChunks(docs, idAttrib: str = None, action: str = 'index', index: str = None, maxDocs: int = CONST_BULK_MAX_DOCS,
+                   maxBytes: int = CONST_BULK_MAX_BYTES, parallel: int | Executor = None)
+    writeBulk(docs, file, idAttrib: str = None, action: str = 'index', index: str = None, maxDocs: int = CONST_BULK_MAX_DOCS,
+              maxBytes: int = CONST_BULK_MAX_BYTES, parallel: int | Executor = None) -> int
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor
+
+from jDocument import jsjson as js
+from jDocument.jsjson import orjson as _orjson
+from jDocument.jparallel import resolveExecutor
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_BULK_ACTIONS = ('index', 'create', 'update', 'delete')
+CONST_BULK_MAX_DOCS = 5000  # documentos por requisição
+CONST_BULK_MAX_BYTES = 100 * 1024 * 1024  # http.max_content_length padrão do Elasticsearch
+CONST_BULK_BATCH_SIZE = 2000  # documentos codificados por um worker de cada vez
+CONST_BULK_BUFFER_SIZE = 1024 * 1024
+
+
+def _rawDoc(obj: any) -> any:
+    # dicionário de um documento, jDocument ou dict
+    return obj if obj.__class__ is dict or not hasattr(obj, 'jData') else obj.jData
+
+
+def _orjsonDumps(obj: any) -> bytes:
+    try:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # valores que o orjson não codifica (inteiros com mais de 64 bits, ...)
+        return js.dumps(obj).encode('utf-8')
+
+
+def _jsonDumps(obj: any) -> bytes:
+    return js.dumps(obj).encode('utf-8')
+
+
+def _encodeBatch(docs: list, action: str, idAttrib: str | None, index: str | None, flagOrjson: bool) -> tuple:
+    # codifica as linhas de um lote de documentos: retorna os bytes e a posição final das linhas de cada documento
+    dumps = _orjsonDumps if flagOrjson else _jsonDumps
+    steps = compilePath(idAttrib) if idAttrib else None
+    meta = f', "_index": {js.dumps(index)}' if index else ''
+    header = f'{{"{action}": {{{meta[2:]}}}}}\n'.encode('utf-8')
+    prefix = f'{{"{action}": {{"_id": '.encode('utf-8')
+    suffix = f'{meta}}}}}\n'.encode('utf-8')
+    parts = []
+    ends = []
+    size = 0
+    for obj in docs:
+        obj = _rawDoc(obj)
+        if steps is None:
+            parts.append(header)
+            size += len(header)
+        else:
+            docId = getPathDefault(obj, steps)
+            if docId is None:
+                raise Exception(f"Err: the document has no '{idAttrib}' (id)!")
+
+            line = prefix + js.dumps(str(docId)).encode('utf-8') + suffix
+            parts.append(line)
+            size += len(line)
+        # endif --
+
+        if action != 'delete':
+            line = dumps(obj)
+            if action == 'update':
+                line = b'{"doc": ' + line + b'}'
+
+            parts.append(line)
+            parts.append(b'\n')
+            size += len(line) + 1
+        # endif --
+
+        ends.append(size)
+    # endfor --
+
+    return b''.join(parts), ends
+
+
+def _iterBatches(docs, batchSize: int):
+    # gera listas de documentos de uma lista, de um jDocument ou de um iterável
+    if hasattr(docs, 'isArray'):
+        docs = docs.jData
+
+    if isinstance(docs, list):
+        for start in range(0, len(docs), batchSize):
+            yield docs[start:start + batchSize]
+        return
+    # endif --
+
+    batch = []
+    for obj in docs:
+        batch.append(obj)
+        if len(batch) >= batchSize:
+            yield batch
+            batch = []
+    # endfor --
+
+    if batch:
+        yield batch
+
+
+def _iterEncoded(docs, action: str, idAttrib: str | None, index: str | None, parallel: int | Executor | None):
+    # gera os lotes codificados, na ordem dos documentos
+    flagOrjson = js.getBackend() == js.CONST_BACKEND_ORJSON
+    if not parallel:
+        for batch in _iterBatches(docs, CONST_BULK_BATCH_SIZE):
+            yield _encodeBatch(batch, action, idAttrib, index, flagOrjson)
+        return
+    # endif --
+
+    executor, workers = resolveExecutor(parallel)
+
+    # no máximo 2 lotes por worker aguardando, para que a memória não dependa do número de documentos
+    pending = deque()
+    try:
+        for batch in _iterBatches(docs, CONST_BULK_BATCH_SIZE):
+            pending.append(executor.submit(_encodeBatch, [_rawDoc(obj) for obj in batch], action, idAttrib, index, flagOrjson))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        # endfor --
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        # o pool é compartilhado: apenas os lotes que não serão lidos são cancelados
+        for future in pending:
+            future.cancel()
+
+
+def _iterChunks(docs, idAttrib: str | None, action: str, index: str | None, maxDocs: int, maxBytes: int, parallel: int | Executor | None):
+    # gera os pares (chunk, número de documentos)
+    if action not in CONST_BULK_ACTIONS:
+        raise Exception(f"Invalid bulk action '{action}', it must be one of {CONST_BULK_ACTIONS}")
+
+    if action in ('update', 'delete') and not idAttrib:
+        raise Exception(f"Err: the action '{action}' needs the attribute of the id!")
+
+    parts = []
+    q = 0
+    size = 0
+    for blob, ends in _iterEncoded(docs, action, idAttrib, index, parallel):
+        # trechos contíguos do lote são copiados de uma vez
+        start = segment = 0
+        for end in ends:
+            length = end - start
+            if q and (q >= maxDocs or size + length > maxBytes):
+                parts.append(blob[segment:start])
+                yield b''.join(parts), q
+                parts = []
+                q = 0
+                size = 0
+                segment = start
+            # endif --
+
+            q += 1
+            size += length
+            start = end
+        # endfor --
+
+        parts.append(blob[segment:])
+    # endfor --
+
+    if q:
+        yield b''.join(parts), q
+
+
+def iterBulkChunks(docs, idAttrib: str = None, action: str = 'index', index: str = None, maxDocs: int = CONST_BULK_MAX_DOCS,
+                   maxBytes: int = CONST_BULK_MAX_BYTES, parallel: int | Executor = None):
+    """
+    Generates the bodies (bytes, UTF-8) of the bulk requests of the documents, each one with at most "maxDocs" documents and
+    "maxBytes" bytes (a single document larger than "maxBytes" is sent alone).
+
+    Examples:
+        for body in iterBulkChunks(jProducts, 'sku', index='products', maxBytes=10 * 1024 * 1024):
+            requests.post(f'{url}/_bulk', data=body, headers={'Content-Type': 'application/x-ndjson'})
+
+    Args:
+        docs: list, array jDocument or iterable of documents (dict or jDocument).
+        idAttrib: attribute (dot notation) whose value is the _id of the document, when "None" the _id is created by Elasticsearch
+                  ('index' and 'create' only).
+        action: 'index', 'create', 'update' (partial document, {"doc": ...}) or 'delete' (only the action line).
+        index: name of the index of the documents (_index), when "None" the index of the URL of the request.
+        maxDocs: maximum number of documents of a chunk.
+        maxBytes: maximum size of a chunk in bytes (http.max_content_length of the cluster).
+        parallel: number of worker processes (or an Executor) that encode batches of documents.
+    """
+    for chunk, _ in _iterChunks(docs, idAttrib, action, index, maxDocs, maxBytes, parallel):
+        yield chunk
+
+
+def writeBulk(docs, file, idAttrib: str = None, action: str = 'index', index: str = None, maxDocs: int = CONST_BULK_MAX_DOCS,
+              maxBytes: int = CONST_BULK_MAX_BYTES, parallel: int | Executor = None) -> int:
+    """
+    Writes the bulk requests of the documents (see iterBulkChunks()) through a buffered file: in a single file (or a binary
+    file already opened, e.g. io.BytesIO) or, when the name has '{}', in a file per chunk (numbered from 1).
+
+    Examples:
+        writeBulk(jProducts, 'products.ndjson', 'sku')
+        writeBulk(jProducts, 'products_{:04d}.ndjson', 'sku', maxBytes=10 * 1024 * 1024)   # products_0001.ndjson, ...
+
+        buffer = io.BytesIO()
+        writeBulk(lstOrders, buffer, 'id', action='delete')
+
+    Args:
+        docs: list, array jDocument or iterable of documents (dict or jDocument).
+        file: name of the file, name with '{}' (a file per chunk) or a binary file already opened.
+        idAttrib, action, index, maxDocs, maxBytes, parallel: see iterBulkChunks().
+
+    Returns:
+        int: the number of documents written.
+    """
+    if isinstance(file, (str, os.PathLike)) and '{' not in os.fspath(file):
+        with open(file, 'wb', buffering=CONST_BULK_BUFFER_SIZE) as f:
+            return writeBulk(docs, f, idAttrib, action, index, maxDocs, maxBytes, parallel)
+    # endif --
+
+    total = 0
+    for i, (chunk, q) in enumerate(_iterChunks(docs, idAttrib, action, index, maxDocs, maxBytes, parallel), 1):
+        if isinstance(file, (str, os.PathLike)):
+            with open(os.fspath(file).format(i), 'wb') as f:
+                f.write(chunk)
+        else:
+            file.write(chunk)
+        # endif --
+
+        total += q
+    # endfor --
+
+    return total
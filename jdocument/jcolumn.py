@@ -0,0 +1,246 @@
+"""
+jcolumn
+
+Cache of the columns of an array jDocument: the values of an attribute of all documents of the list, extracted once and
+reused by the aggregate functions, by the range filters of searchDocs() and by the sorts until the list is changed.
+The numeric columns are stored in compact arrays (array('q') when all the values are int, array('d') when all are float),
+where a missing value is stored as 0 (as it is not filled, the aggregate functions and the range filters skip it);
+the other columns are lists.
+The cache is created by jDocument.createColumnCache() (opt-in, like the indexes, because a document changed through another
+reference does not change the version). Each change of the list increments the version of the cache, the columns of an
+older version are rebuilt on the next use; a sort reorders the columns with the list (see reorder()).
+The number of columns is bounded, the least recently used column is discarded.
+
+Classes:
+    Column
+    ColumnCache
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict
+
+from jDocument import jnumeric
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_COLUMN_CACHE_SIZE = 16  # número máximo de colunas por jDocument
+CONST_COLUMN_OPERATORS = ('eq', 'lt', 'lteq', 'gt', 'gteq')
+CONST_INT64_MIN = -2 ** 63
+CONST_INT64_MAX = 2 ** 63 - 1
+
+
+class Column:
+    """
+    Values of an attribute of all documents of the list, in the order of the list.
+    """
+    __slots__ = ('attribute', 'values', 'typecode', 'version', 'allFilled')
+
+    def __init__(self, attribute: str, values: array | list, typecode: str | None, version: int):
+        self.attribute = attribute
+        self.values = values
+        self.typecode = typecode  # 'q', 'd' ou None (lista)
+        self.version = version
+        self.allFilled = None  # valores preenchidos de todos os documentos, veja filled()
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.attribute}> : {len(self.values)} values ({self.typecode or 'list'})"
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def build(cls, attribute: str, lstDocs: list, version: int) -> Column:
+        """
+        Extracts the values of the attribute of all documents of the list.
+        """
+        steps = compilePath(attribute)
+        values = [getPathDefault(obj, steps) for obj in lstDocs]
+
+        types = {type(val) for val in values if val is not None}
+        if types == {int}:
+            numbers = [val for val in values if val is not None]
+            if CONST_INT64_MIN <= min(numbers) and max(numbers) <= CONST_INT64_MAX:
+                return cls(attribute, array('q', [val or 0 for val in values]), 'q', version)
+        # endif --
+
+        if types == {float}:
+            return cls(attribute, array('d', [val or 0.0 for val in values]), 'd', version)
+
+        # valores de tipos diferentes (ex.: int e float) ficam numa lista, para que as funções retornem os mesmos tipos
+        return cls(attribute, values, None, version)
+
+    def filled(self, positions=None) -> array | list:
+        """
+        Returns the filled values, of all documents or only of the informed positions (in ascending order).
+        """
+        values = self.values
+        if positions is None:
+            if self.allFilled is None:
+                lstValues = [val for val in values if val]
+                self.allFilled = array(self.typecode, lstValues) if self.typecode else lstValues
+            # endif --
+
+            # uma cópia, a coluna não pode ser alterada por quem recebe os valores
+            return self.allFilled[:]
+        # endif --
+
+        lstValues = [val for val in (values[i] for i in positions) if val]
+        return array(self.typecode, lstValues) if self.typecode else lstValues
+
+    def reader(self, lstDocs: list):
+        """
+        Returns a function that returns the value of the attribute of the document at a position of the list, None when it is missing.
+        """
+        values = self.values
+        if not self.typecode:
+            return values.__getitem__
+
+        # nas colunas numéricas o valor não preenchido é 0: o documento informa se o valor é 0 ou se o atributo não existe
+        steps = compilePath(self.attribute)
+
+        def read(i: int) -> any:
+            val = values[i]
+            return val if val else getPathDefault(lstDocs[i], steps)
+
+        return read
+
+    def reorder(self, order: list) -> Column:
+        """
+        Returns the column of the list reordered by a sort, "order" is the old position of each document in the new order.
+        """
+        values = self.values
+        lstValues = [values[i] for i in order]
+        return Column(self.attribute, array(self.typecode, lstValues) if self.typecode else lstValues, self.typecode, self.version)
+
+    def select(self, oper: str, value: any) -> list | None:
+        """
+        Returns the positions of the documents that match the condition "attribute oper value" of searchDocs(), or None if the
+        column cannot answer it (the column is not numeric or the value is not a number).
+        """
+        if not self.typecode or oper not in CONST_COLUMN_OPERATORS or not value or type(value) not in (int, float):
+            return None
+
+        values = self.values
+        arr = jnumeric.toArray(values) if self.typecode == 'd' or isinstance(value, int) else None
+        if arr is not None:
+            numpy = jnumeric.numpy
+            match oper:
+                case 'eq':
+                    mask = arr == value
+                case 'lt':
+                    mask = arr < value
+                case 'lteq':
+                    mask = arr <= value
+                case 'gt':
+                    mask = arr > value
+                case _:
+                    mask = arr >= value
+            # endmatch --
+
+            # os valores não preenchidos (0) não satisfazem a condição, como em searchDocs()
+            return numpy.flatnonzero(mask & (arr != 0)).tolist()
+        # endif --
+
+        match oper:
+            case 'eq':
+                return [i for i, val in enumerate(values) if val and val == value]
+            case 'lt':
+                return [i for i, val in enumerate(values) if val and val < value]
+            case 'lteq':
+                return [i for i, val in enumerate(values) if val and val <= value]
+            case 'gt':
+                return [i for i, val in enumerate(values) if val and val > value]
+            case _:
+                return [i for i, val in enumerate(values) if val and val >= value]
+        # endmatch --
+
+
+class ColumnCache:
+    """
+    Columns of an array jDocument, with LRU eviction and a version counter: invalidate() (called on each change of the list)
+    increments the version, so the cached columns are rebuilt on the next use.
+
+    Examples:
+        cache = ColumnCache()
+        column = cache.get('features.price', lstDocs)
+        cache.stats()   # {'columns': 1, 'maxSize': 16, 'version': 0, 'hits': 0, 'misses': 1, 'evictions': 0}
+    """
+    __slots__ = ('columns', 'maxSize', 'version', 'hits', 'misses', 'evictions', 'lock')
+
+    def __init__(self, maxSize: int = CONST_COLUMN_CACHE_SIZE):
+        self.columns = OrderedDict()
+        self.maxSize = maxSize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()  # as consultas (que podem rodar em paralelo, veja jlock) alteram a ordem do LRU
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {len(self.columns)} columns, version {self.version}"
+
+    def __bool__(self):
+        return bool(self.columns)
+
+    def peek(self, attribute: str, lstDocs: list) -> Column | None:
+        """
+        Returns the column of the attribute if it is cached and up to date, without building it.
+        """
+        with self.lock:
+            column = self.columns.get(attribute)
+            if column is None or column.version != self.version or len(column) != len(lstDocs):
+                return None
+
+            self.columns.move_to_end(attribute)
+            self.hits += 1
+
+        return column
+
+    def get(self, attribute: str, lstDocs: list) -> Column:
+        """
+        Returns the column of the attribute, building it if it is not cached or if the list was changed.
+        """
+        column = self.peek(attribute, lstDocs)
+        if column is not None:
+            return column
+
+        version = self.version
+        column = Column.build(attribute, lstDocs, version)
+
+        with self.lock:
+            self.misses += 1
+            if version == self.version:
+                self.columns[attribute] = column
+                self.columns.move_to_end(attribute)
+                while len(self.columns) > self.maxSize:
+                    self.columns.popitem(last=False)
+                    self.evictions += 1
+            # endif --
+
+        return column
+
+    def reorder(self, order: list):
+        """
+        The list was sorted: the up to date columns are reordered with it, "order" is the old position of each document in the new order.
+        """
+        with self.lock:
+            for attribute, column in self.columns.items():
+                if column.version == self.version:
+                    self.columns[attribute] = column.reorder(order)
+        # endwith --
+
+    def invalidate(self):
+        """
+        The list was changed: the cached columns will be rebuilt on the next use.
+        """
+        self.version += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the number of columns (up to date), the maximum size, the version and the counters of hits, misses and evictions.
+        """
+        return {
+            'columns': sum(1 for column in self.columns.values() if column.version == self.version),
+            'maxSize': self.maxSize, 'version': self.version, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+        }
@@ -13,15 +13,35 @@ Classes:
 from __future__ import annotations
 
 import datetime as dt
+import random
 import re
 import sys
 from copy import deepcopy
 import statistics
-# import numpy
+from collections import Counter
+from heapq import nlargest, nsmallest
+from operator import itemgetter
 from collections.abc import Sequence
+from concurrent.futures import Executor
 
 from jDocument import jsjson as js
+from jDocument import jnumeric
 from jDocument.helpers import getDocAttributes, str2datetime
+from jDocument.jpath import compilePath, getPathValue, getPathDefault, setPathValue, removePathValue, PathPredicate
+from jDocument.jindex import HashIndex, SortedIndex, TextIndex, CONST_INDEX_TEXT
+from jDocument.jcolumn import CONST_COLUMN_CACHE_SIZE, Column, ColumnCache
+from jDocument.jsketch import SpaceSaving, HyperLogLog, KLLSketch
+from jDocument.jview import View
+from jDocument.jsort import parseSortKeys, sortKey, positionKey, isDescending
+from jDocument.jstream import iterJsonArray, iterJsonl, writeJsonl
+from jDocument.jmmap import MappedArray, readOnly, CONST_MMAP_CACHE_SIZE
+from jDocument.jfilter import jFilter, compileFilter, jExpression, compileExpression
+from jDocument.jlock import RWLock, readLocked, writeLocked
+from jDocument.jparallel import parallelScan
+from jDocument.jaggregate import AGGREGATE_FUNCTIONS, CONST_AGGREGATE_DEFAULT, Accumulator, aggregateValues, checkFunctions, parseGroupKeys, \
+    parseAggregations, groupKey, copyKeyValues, rowPath
+from jDocument.jplan import CONST_PLAN_MIN_DOCS, CONST_PLAN_SAMPLE, CONST_PLAN_STATISTICS_SIZE, conditionCost, defaultSelectivity, \
+    findCondition, planAnd
 
 CONST_JDATA = 'jdata'
 CONST_TYPE_ARRAY = 'Array'
@@ -30,16 +50,40 @@ CONST_ERR_ARRAY = 'This Json document must be a List/Array'
 CONST_ERR_OBJECT = 'This Json document must be a Object'
 CONST_ERR_ITEM = 'The Item must be a jDocument or a Json Dictionary (dict) or a list of dic'
 
+# métodos que executam com o lock de leitura ou de escrita, veja jDocument(flagThreadSafe=True)
+CONST_READ_METHODS = (
+    'value', 'get', 'exists', 'getJson', 'getAttributes', 'clone', 'getDataType', 'item',
+    'findDocs', 'findOneDoc', 'findAnyDocs', 'findAttribDocs', 'searchDocs', 'searchOneDoc',
+    'count', 'sum', 'min', 'max', 'mean', 'mode', 'median', 'median_low', 'median_high', 'median_grouped', 'ocorrences', 'explain',
+    'aggregate', 'groupBy', 'std', 'quantile', 'histogram', 'columnStats', 'topOccurrences', 'countDistinct', 'getView', 'topDocs', 'toJsonl',
+)
+CONST_WRITE_METHODS = (
+    'set', 'removeAttrib', 'copyFrom', 'clear', 'addDoc', 'removeOneDoc', 'removeDocs', 'createIndex', 'dropIndex', 'sortDocs', '_setDoc',
+    'createView', 'dropView', 'createColumnCache', 'dropColumnCache',
+)
+# métodos que alteram os documentos, bloqueados nos documentos somente leitura, veja mapFile()
+CONST_DATA_WRITE_METHODS = (
+    'set', 'removeAttrib', 'copyFrom', 'clear', 'addDoc', 'removeOneDoc', 'removeDocs', 'sortDocs', '_setDoc',
+)
+
 
 class jDocument(Sequence):
     """
     Representa um documento Json ou uma lista de documentos.
     """
 
-    def __init__(self, jdata=None):
+    def __init__(self, jdata=None, flagThreadSafe: bool = False):
+        """
+        Args:
+            jdata: dict, list, json string or a MappedArray (read-only documents of a file, see mapFile()).
+            flagThreadSafe: if "True" the queries run holding a shared (read) lock and the mutations an exclusive (write) lock,
+                            so the same jDocument can be used by many threads. The lock protects the operations made through this
+                            jDocument, not through other jDocuments that reference the same data (e.g. returned by get() or item()).
+                            The generators (iterFindDocs, iterSearchDocs, ...) do not hold the lock while they are consumed.
+        """
         super().__init__()
 
-        self._current = -1  # para iterações na classe
+        self._current = -1  # para iterações na classe (__next__)
         if jdata is None:
             # self._jdata = DotDict({})
             self._jdata = {}
@@ -50,7 +94,7 @@ class jDocument(Sequence):
             self._jdata = jdata
             self._type = CONST_TYPE_OBJECT
 
-        elif isinstance(jdata, list):
+        elif isinstance(jdata, (list, MappedArray)):
             self._jdata = jdata
             self._type = CONST_TYPE_ARRAY
 
@@ -66,13 +110,28 @@ class jDocument(Sequence):
             # endif --
         # endif --
 
-        self._findDocs_lstFilters = []
-        self._findDocs_qty = None
-        self._findDocs_flagMacros = None
+        self._indexes = {}  # índices das listas, veja createIndex()
+        self._sortedIndexes = {}
+        self._textIndex = None
+        self._statistics = {}  # seletividade das condições medida por amostragem, veja explain()
+        self._columns = None  # colunas dos atributos, veja createColumnCache()
+        self._views = {}  # agrupamentos atualizados documento a documento, veja createView()
+
+        self._lock = None
+        if flagThreadSafe:
+            # troca os métodos desta instância por versões que adquirem o lock
+            self._lock = RWLock()
+            for name in CONST_READ_METHODS:
+                setattr(self, name, readLocked(self._lock, getattr(self, name)))
+            for name in CONST_WRITE_METHODS:
+                setattr(self, name, writeLocked(self._lock, getattr(self, name)))
+        # endif --
 
-        self._searhDocs_jOrFilters = None
-        self._searhDocs_exprFilter = None
-        self._searhDocs_qty = None
+        if isinstance(self._jdata, MappedArray):
+            # documentos de um arquivo mapeado: as consultas, os índices e as visões são permitidos, as alterações não
+            for name in CONST_DATA_WRITE_METHODS:
+                setattr(self, name, readOnly(name))
+        # endif --
 
     def __bool__(self):
         """
@@ -82,10 +141,13 @@ class jDocument(Sequence):
 
     def __iter__(self):
         """
-        Depending on the json type, it iterates over the "dict" keys or over the "list" elements.
+        Depending on the json type, it iterates over the "dict" values or over the "list" elements.
+        Each iteration has its own cursor, so the same jDocument can be iterated by nested loops or by many threads.
         """
-        self._current = -1
-        return self
+        if self._type == CONST_TYPE_ARRAY:
+            return (jDocument(obj) for obj in self._jdata)
+
+        return iter(list(self._jdata.values()))
 
     def __next__(self):
         """
@@ -141,12 +203,31 @@ class jDocument(Sequence):
         Depending on the json type, it updates the value of a "dict" key or a "list" item.
         """
         if self._type == CONST_TYPE_ARRAY:
-            self._jdata[key] = value
+            self._setDoc(key, value)
         else:
             self.set({key: value})
 
         return value
 
+    def _setDoc(self, key, value):
+        # substitui um elemento da lista, atualizando os índices
+        if (self._indexes or self._sortedIndexes or self._textIndex or self._views) and isinstance(key, int):
+            oldObj = self._jdata[key]
+            position = key % len(self._jdata)
+            self._jdata[position] = value
+            for index in self._iterIndexes():
+                if not index.stale:
+                    index.replace(position, oldObj, value)
+            for view in self._views.values():
+                if not view.stale:
+                    view.replace(oldObj, value)
+
+            if self._columns is not None:
+                self._columns.invalidate()
+        else:
+            self._jdata[key] = value
+            self._invalidateIndexes()
+
     def __delitem__(self, item):
         """
         Depending on the type of json, it removes a key from "dict" or an element from "list".
@@ -213,6 +294,19 @@ class jDocument(Sequence):
         """
         return self.doc
 
+    @property
+    def lock(self) -> RWLock | None:
+        """
+        Returns the reader/writer lock of a thread safe jDocument (flagThreadSafe=True), or None.
+        It can be used to run a sequence of operations atomically.
+
+        Example:
+            with jCatalog.lock.write():
+                if not jCatalog.findOneDoc({'id': '10'}):
+                    jCatalog.addDoc({'id': '10'})
+        """
+        return self._lock
+
     @property
     def jData(self) -> dict:
         """
@@ -256,10 +350,11 @@ class jDocument(Sequence):
         Returns:
             str: json document
         """
+        jdata = list(self._jdata) if isinstance(self._jdata, MappedArray) else self._jdata
         if flagPretty:
-            return js.dumps(self._jdata, flagPretty=flagPretty, ensure_ascii=flagEnsureAscii)
+            return js.dumps(jdata, flagPretty=flagPretty, ensure_ascii=flagEnsureAscii)
 
-        return js.dumps(self._jdata, flagPretty=flagPretty, ensure_ascii=flagEnsureAscii)
+        return js.dumps(jdata, flagPretty=flagPretty, ensure_ascii=flagEnsureAscii)
 
     def clone(self) -> jDocument:
         """
@@ -305,7 +400,12 @@ class jDocument(Sequence):
         Returns:
             bool: "True" if attribute exists
         """
-        return self.value(attribute, None, flagRaiseError=False)
+        try:
+            getPathValue(self._jdata, compilePath(attribute))
+        except Exception:
+            return False
+
+        return True
 
     def removeAttrib(self, attribute: str | list) -> int:
         """
@@ -330,34 +430,33 @@ class jDocument(Sequence):
 
         # if the Json document is an object
         if self._type == CONST_TYPE_OBJECT:
-            q = 0
-            if attribute:
-                # if the name of a specific attribute was informed
-                if '.' in attribute:
-                    # if an attribute of a subObject was informed
-                    at = attribute.split('.')
-                    lastAt = at.pop()
-                    obj = self
+            if not attribute:
+                return 0
 
-                    for atSub in at:
-                        obj = obj.get(atSub)
+            if '.' not in attribute and '[' not in attribute:
+                # it is an attribute of the object itself
+                if attribute in self._jdata:
+                    # if attribute exists on this object then remove attribute
+                    del self._jdata[attribute]
+                    return 1
 
-                    q += obj.removeAttrib(lastAt)
+                return 0
 
-                else:
-                    # otherwise, it is an attribute of the object itself
-                    if attribute in self._jdata:
-                        # if attribute exists on this object then remove attribute
-                        del self._jdata[attribute]
-                        q = 1
+            # if an attribute of a subObject was informed
+            try:
+                steps = compilePath(attribute)
+            except ValueError:
+                return 0
 
-            return q
+            return removePathValue(self._jdata, steps)
 
         # otherwise, if it is an ARRAY
         q = 0
-        for obj in self:
+        for obj in self._jdata:
             # removes the attribute on each object in the list
-            q += obj.removeAttrib(attribute=attribute)
+            q += jDocument(obj).removeAttrib(attribute=attribute)
+
+        self._invalidateIndexes()
 
         return q
 
@@ -389,32 +488,9 @@ class jDocument(Sequence):
             # if the Json document is a list
             if self._type == CONST_TYPE_ARRAY:
                 # if the sought attribute does not start with "ARRAY"
-                if not attribute.startswith(CONST_TYPE_ARRAY):
-                    if '[' in attribute:
-                        # tratamento especial para listas
-                        #   itens[10].nome --> pega o valor do atributo "nome" do objeto 10 da lista "itens"
-                        #   itens[nome=maria].idade --> pega o valor do atributo "idade" do objeto cujo
-                        #                               atributo "nome" é igual a "maria" da lista "itens"
-                        # nome da lista - string antes da '['
-                        lst = attribute.split('[')[0]
-                        # pega indice ou condição dentro das chaves '[...]'
-                        pont = attribute.split('[')[1].replace(']', '')
-                        if pont.isdigit():
-                            # indice numérico
-                            idx = int(pont)
-                            return self._jdata[lst][idx]
-                        else:
-                            # condição
-                            expr = attribute.split('=')
-                            p1 = expr[0].strip()
-                            p2 = expr[1].strip()
-                            if lst == CONST_TYPE_ARRAY:
-                                return self.findOneDoc({p1: p2})
-                            else:
-                                return self.get(lst).findOneDoc({p1: p2})
-                    else:
-                        # coleta uma lista de valores, um para cada objeto da lista
-                        return [jDocument(obj).value(attribute, defaultValue) for obj in self._jdata]
+                if not attribute.startswith(CONST_TYPE_ARRAY) and '[' not in attribute:
+                    # coleta uma lista de valores, um para cada objeto da lista
+                    return self._getValues(self._jdata, attribute, defaultValue)
 
             # o documento Json é um documento único ou
             # é uma lista e o atributo procurado começa com 'Array'
@@ -430,44 +506,26 @@ class jDocument(Sequence):
                     else:
                         return defaultValue
 
-            k = attribute.split('.')
-            val = defaultValue
-            dic = self._jdata
-
+            # tratamento especial para listas e subdocumentos
+            #   itens[10].nome --> pega o valor do atributo "nome" do objeto 10 da lista "itens"
+            #   itens[nome=maria].idade --> pega o valor do atributo "idade" do objeto cujo
+            #                               atributo "nome" é igual a "maria" da lista "itens"
+            # o caminho é compilado apenas uma vez (cache LRU)
             try:
-                for tk in k:
-                    if '[' in tk:
-                        # tratamento especial para listas
-                        #   itens[10].nome --> pega o valor do atributo "nome" do objeto 10 da lista "itens"
-                        #   itens[nome=maria].idade --> pega o valor do atributo "idade" do objeto cujo
-                        #                               atributo "nome" é igual a "maria" da lista "itens"
-                        # nome da lista - string antes da '['
-                        lst = tk.split('[')[0]
-                        # pega indice ou condição dentro das chaves '[...]'
-                        pont = tk.split('[')[1].replace(']', '')
-                        if pont.replace('-', '').isnumeric():
-                            # indice numérico
-                            idx = int(pont)
-                            val = dic[idx] if lst == CONST_TYPE_ARRAY else dic[lst][idx]
-                        else:
-                            # condição
-                            expr = tk.split('[')[1].split('=')
-                            p1 = expr[0].strip()
-                            p2 = expr[1].replace(']', '').strip()
-                            val = jDocument(dic).findOneDoc({p1: p2}).value() if lst == CONST_TYPE_ARRAY else jDocument(dic[lst]).findOneDoc({p1: p2}).value()
-                        # endif --
-                    else:
-                        val = dic[tk]
+                steps = compilePath(attribute)
 
-                    dic = val
+                if self._indexes and steps[0].__class__ is PathPredicate and steps[0].attribute in self._indexes:
+                    # Array[atributo=valor] --> usa o índice do atributo para localizar o documento
+                    positions = self._getIndex(steps[0].attribute).lookup(steps[0].value)
+                    return getPathValue(self._jdata[positions[0]], steps[1:])
+
+                return getPathValue(self._jdata, steps)
 
             except Exception:
                 if flagRaiseError:
                     raise Exception(f"*** {sys.exc_info()[0]}")
                 else:
-                    val = defaultValue
-
-            return val
+                    return defaultValue
 
         # se foi informado uma lista de atributos
         if isinstance(attribute, list):
@@ -481,14 +539,27 @@ class jDocument(Sequence):
             # o documento Json é uma lista de documentos
             else:
                 # monta uma lista os valores dos atributos para cada objeto
-                lst = [
-                    {at: jDocument(obj).value(at, defaultValue) for at in attribute}
-                    for obj in self._jdata
-                ]
+                lstValues = [self._getValues(self._jdata, at, defaultValue) for at in attribute]
+                lst = [dict(zip(attribute, values)) for values in zip(*lstValues)]
                 return lst
 
         return None
 
+    @staticmethod
+    def _getValues(lstDocs: list, attribute: str, defaultValue: any = None) -> list:
+        """
+        Returns a list with the value of the attribute for each document in the list, using the compiled path.
+        """
+        try:
+            steps = compilePath(attribute)
+        except ValueError:
+            return [defaultValue] * len(lstDocs)
+
+        return [
+            getPathDefault(obj, steps, defaultValue) if isinstance(obj, dict) else jDocument(obj).value(attribute, defaultValue)
+            for obj in lstDocs
+        ]
+
     def get(self, attribute: str, defaultValue=None, flagRaiseError: bool = False, flagReturnEmptyListAsDoc: bool = False) -> any:
         """
         Similar to value(), but if the returned value is a 'dict' or 'list' then the returned value is converted to "jDocument".
@@ -546,23 +617,16 @@ class jDocument(Sequence):
                 # remove caracteres inválidos
                 returnAt = at
 
-                # se houver documento dentro de documento
-                if '.' in at:
-                    lstAttrib = at.split('.')
-                    subAt: str = at.replace(lstAttrib[0] + '.', '')
-
-                    if not self.get(lstAttrib[0]):
-                        # cria o subdocumento se não existir
-                        self.set({lstAttrib[0]: {}})
+                # se estivermos atribuindo um documento Json, transforma no valor nativo
+                val = values[at].value() if isinstance(values[at], jDocument) else values[at]
 
-                    self.get(lstAttrib[0]).set({subAt: values[at]})
+                # se houver documento dentro de documento ou lista
+                if '.' in at or '[' in at:
+                    # cria os subdocumentos que não existirem (caminho compilado)
+                    setPathValue(self._jdata, compilePath(at), val)
 
                 else:
-                    if isinstance(values[at], jDocument):
-                        # se estivermos atribuindo um documento Json, transforma no valor nativo
-                        self._jdata[at] = values[at].value()
-                    else:
-                        self._jdata[at] = values[at]
+                    self._jdata[at] = val
 
             if isinstance(values[returnAt], dict):
                 return jDocument(values[returnAt])
@@ -571,9 +635,21 @@ class jDocument(Sequence):
 
         else:
             # senão, é uma lista
+            # as visões que dependem dos atributos retiram cada documento antes da alteração e o incluem de novo depois dela
+            lstViews = [view for view in self._views.values() if not view.stale and view.tracks(values)]
+
             # adiciona/atualiza o atributo em todos os objetos da lista
             for obj in self._jdata:
-                obj.set(values)
+                for view in lstViews:
+                    view.remove(obj)
+
+                jDocument(obj).set(values)
+
+                for view in lstViews:
+                    view.add(obj)
+            # endfor --
+
+            self._invalidateIndexes(flagKeepViews=True)
 
             return None
 
@@ -637,6 +713,7 @@ class jDocument(Sequence):
         Cleans the json content, keeping its type ('Array' or 'Object').
         """
         self._jdata.clear()
+        self._invalidateIndexes()
 
     def item(self, position: int) -> any:
         """
@@ -691,25 +768,36 @@ class jDocument(Sequence):
 
         if isinstance(item, jDocument):
             obj = item
-            if item.type == CONST_TYPE_ARRAY:
-                # it is a list
-                list(self._jdata).extend(item.value())
-            else:
-                # it is a dict
-                list(self._jdata).append(item.value())
-            # endif --
+            lstNew = item.value() if item.type == CONST_TYPE_ARRAY else [item.value()]
 
         elif isinstance(item, dict):
             obj = jDocument(item)
-            list(self._jdata).append(item)
+            lstNew = [item]
 
         elif isinstance(item, list):
             obj = jDocument(item)
-            list(self._jdata).extend(item)
+            lstNew = item
 
         else:
             raise Exception(CONST_ERR_ITEM)
 
+        position = len(self._jdata)
+        self._jdata.extend(lstNew)
+
+        # adiciona os novos documentos aos índices e às visões
+        for index in self._iterIndexes():
+            if not index.stale:
+                for i, newObj in enumerate(lstNew, position):
+                    index.add(i, newObj)
+
+        for view in self._views.values():
+            if not view.stale:
+                for newObj in lstNew:
+                    view.add(newObj)
+
+        if self._columns is not None:
+            self._columns.invalidate()
+
         return obj
 
     def removeOneDoc(self, filters: dict | list = None) -> int:
@@ -758,7 +846,7 @@ class jDocument(Sequence):
             if self._type != CONST_TYPE_ARRAY:
                 raise Exception(CONST_ERR_ARRAY)
 
-            del self._jdata[position]
+            self._deletePositions([position])
 
             return 1
         # endif --
@@ -770,16 +858,11 @@ class jDocument(Sequence):
                 raise Exception(CONST_ERR_ARRAY)
             # endif --
 
-            # gera a lista dos elementos a remover
-            jDocsToRemove = self.findDocs(filters, qty)
+            # gera a lista das posições dos elementos a remover
+            lstRemove = self._findPositions(filters, qty)
 
-            lstRemove = [] if not jDocsToRemove else jDocsToRemove.value()
-
-            # exclui os elementos listados
-            for i in reversed(range(len(lstRemove))):
-                idel = lstRemove[i - 1]
-                list(self._jdata).remove(idel)
-            # endfor --
+            if lstRemove:
+                self._deletePositions(lstRemove)
 
             return len(lstRemove)
         # endif --
@@ -792,270 +875,1022 @@ class jDocument(Sequence):
 
             q = len(self._jdata)
             self._jdata.clear()
+            self._invalidateIndexes()
 
             return q
         # endif --
 
         return 0
 
-    def findDocs(self, filters: dict | list, qty: int = None, flagMacros: bool = False) -> jDocument | None:
+    def createIndex(self, attribute: str | list, flagSorted: bool = False) -> jDocument:
         """
-        It generates a list with the first N documents that correspond to the informed filter, the json needs to be a 'list' otherwise it generates an error.
-        If N is not informed then all documents will be returned.
-        The filter is a dictionary with attributes and values, the search is 'Case Insensitive'.
-        When "flagMacros" is "True" the routine will test macros provided through the filters. The recognized macros are:
-            IN:<value> --> tests whether the attribute's value is contained in <value>.
-            NIN:<value> --> tests if attribute value is not contained in <value>.
-            CT:<value> --> tests whether <value> is contained in the attribute value.
-            NCT:<value> --> tests if <value> is not contained in the attribute value.
-            RE:<RegExp> --> tests the attribute value matches the regular expression <RegExp>.
+        Creates an index of an attribute of the documents in the list, the json needs to be a 'list' otherwise it generates an error.
+        The hash index (default) is used by findDocs(), findOneDoc(), removeDocs() and by the bracket notation (Array[attribute=value]) to locate
+        the documents whose attribute is equal to a value without scanning the whole list. Only the filters without macros use the hash index.
+        The sorted index (flagSorted=True) is used by searchDocs(), searchOneDoc() and the aggregate functions to answer the operators
+        eq, lt, lteq, gt and gteq (including datetime values) with a binary search; count(), min() and max() without filters are
+        answered by the index itself.
+        The attribute 'all' creates a text index: an inverted index of the words of the documents (case and accent insensitive) used by
+        findAnyDocs() and by the text search of searchDocs() (attribute 'all', operator 'ct') when the searched text is a plain text.
+        The indexes are kept up to date by addDoc(), removeDocs(), set() and by the bracket operators of this jDocument;
+        if the documents are changed through another reference, call createIndex() again to rebuild it.
 
         Examples:
-            jPerson = jTeam.findDocs(filters={'name': 'Maria'})
-            jPerson = jTeam.findDocs(filters={'name': 'CT:ria'}, flagMacros=True) 	# people whose name contains 'ria'
-            jPerson = jTeam.findDocs(filters={'name': 'NCT:ria'}, flagMacros=True) 	# people whose name does not contain 'ria'
-            jPerson = jTeam.findDocs(filters={'name': "RE:(g\w+)\W(g\w+)"}, flagMacros=True) 	# people whose name matches the regular expression
+            jProducts.createIndex('id')
+            jProducts.createIndex(['type', 'features.rating'])
+            jProducts.findDocs({'id': '1234'})
+
+            jProducts.createIndex('features.price', flagSorted=True)
+            jProducts.searchDocs(jOrFilters=[{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 28}]}])
+
+            jProducts.createIndex('all')
+            jProducts.findAnyDocs(['strawberry', 'blueberries'])
 
         Args:
-            filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
-            qty: maximum amount of documents to be removed, when "None" it will be all
-            flagMacros: if "True" then it searches for macros in the values of the filter rules.
+            attribute (str | list): attribute name or list of names, the dot notation can be used for attributes of subdocuments.
+            flagSorted: if "True" creates a sorted index (range searches) instead of a hash index.
 
         Returns:
-            jDocument: jDocument with Json document containing the list of found documents or None if not found any
+            self: the json document itself.
         """
         if self._type != CONST_TYPE_ARRAY:
             raise Exception(CONST_ERR_ARRAY)
 
-        self._findDocs_flagMacros = flagMacros
+        for at in ([attribute] if isinstance(attribute, str) else attribute):
+            if at == CONST_INDEX_TEXT:
+                index = self._textIndex = TextIndex()
+            elif flagSorted:
+                index = self._sortedIndexes[at] = SortedIndex(at)
+            else:
+                index = self._indexes[at] = HashIndex(at)
+
+            index.build(self._jdata)
 
-        # se foi passado um dicionário de condições monta uma lista com apenas essa condição senão considera esta lista de condições
-        self._findDocs_lstFilters = [filters] if isinstance(filters, dict) else filters
+        return self
 
-        # percorre a lista de objetos
-        self._findDocs_qty = qty if qty else -1
+    def dropIndex(self, attribute: str | list = None) -> int:
+        """
+        Removes the indexes (hash, sorted and text) of an attribute, when no attribute is informed then all indexes are removed.
 
-        findList = list(filter(self._findDocs_TestDoc, self._jdata))
+        Examples:
+            jProducts.dropIndex('id')
 
-        self._findDocs_lstFilters = None
-        self._findDocs_qty = None
+        Args:
+            attribute (str | list): attribute name or list of names.
 
-        if not findList:
+        Returns:
+            int: the number of indexes removed.
+        """
+        if attribute is None:
+            q = len(self._indexes) + len(self._sortedIndexes) + (self._textIndex is not None)
+            self._indexes.clear()
+            self._sortedIndexes.clear()
+            self._textIndex = None
+            return q
+
+        q = 0
+        for at in ([attribute] if isinstance(attribute, str) else attribute):
+            if self._indexes.pop(at, None):
+                q += 1
+            if self._sortedIndexes.pop(at, None):
+                q += 1
+            if at == CONST_INDEX_TEXT and self._textIndex is not None:
+                self._textIndex = None
+                q += 1
+
+        return q
+
+    def _getIndex(self, attribute: str) -> HashIndex:
+        # retorna o índice do atributo, reconstruindo-o se houve alguma alteração na lista
+        index = self._indexes[attribute]
+        if index.stale:
+            index.build(self._jdata)
+
+        return index
+
+    def _getSortedIndex(self, attribute: str) -> SortedIndex:
+        # retorna o índice ordenado do atributo, reconstruindo-o se houve alguma alteração na lista
+        index = self._sortedIndexes[attribute]
+        if index.stale:
+            index.build(self._jdata)
+
+        return index
+
+    def _getTextIndex(self) -> TextIndex:
+        # retorna o índice de texto, reconstruindo-o se houve alguma alteração na lista
+        if self._textIndex.stale:
+            self._textIndex.build(self._jdata)
+
+        return self._textIndex
+
+    def _iterIndexes(self):
+        yield from self._indexes.values()
+        yield from self._sortedIndexes.values()
+        if self._textIndex is not None:
+            yield self._textIndex
+
+    def _invalidateIndexes(self, flagKeepText: bool = False, flagKeepViews: bool = False, flagKeepColumns: bool = False):
+        # a lista foi alterada, os índices (e as visões) serão reconstruídos no próximo uso
+        for index in self._iterIndexes():
+            if not (flagKeepText and index is self._textIndex):
+                index.stale = True
+
+        if not flagKeepViews:
+            for view in self._views.values():
+                view.stale = True
+
+        self._statistics.clear()
+        if self._columns is not None and not flagKeepColumns:
+            self._columns.invalidate()
+
+    def _getColumn(self, attribute: str, flagBuild: bool = True) -> Column | None:
+        # retorna a coluna do atributo, extraindo-a se necessário; com flagBuild=False apenas se já estiver no cache
+        # None se o cache de colunas não foi criado, veja createColumnCache()
+        if self._columns is None:
             return None
 
-        return jDocument(findList)
+        return self._columns.get(attribute, self._jdata) if flagBuild else self._columns.peek(attribute, self._jdata)
 
-    def findOneDoc(self, filters: dict | list, flagMacros: bool = False) -> jDocument | None:
+    def createColumnCache(self, maxSize: int = CONST_COLUMN_CACHE_SIZE) -> jDocument:
         """
-        Returns the first document that correspond to the informed filter, the json needs to be a 'list' otherwise it generates an error.
-        The filter is a dictionary with attributes and values, the search is 'Case Insensitive'.
-        When "flagMacros" is "True" the routine will test macros provided through the filters. The recognized macros are:
-            IN:<value> --> tests whether the attribute's value is contained in <value>.
-            NIN:<value> --> tests if attribute value is not contained in <value>.
-            CT:<value> --> tests whether <value> is contained in the attribute value.
-            NCT:<value> --> tests if <value> is not contained in the attribute value.
-            RE:<RegExp> --> tests the attribute value matches the regular expression <RegExp>.
+        Creates the cache of columns of the list, the json needs to be a 'list' otherwise it generates an error.
+        With the cache, the first aggregate function without filters over an attribute (count(), sum(), ..., aggregate()) extracts the
+        values of the attribute of all documents into a column (a compact array for int or float values), which is reused by the next
+        aggregate functions (with or without filters), by the range filters of searchDocs() (eq, lt, lteq, gt and gteq with a number)
+        and by sortDocs() and topDocs().
+        The columns are discarded by the changes of the list made by this jDocument (set(), addDoc(), removeDocs(), the bracket
+        operators, ...) and reordered by sortDocs(); if the documents are changed through another reference (including the jDocuments
+        returned by item(), by the bracket operators, by the iteration and by findDocs()), call createColumnCache() again to discard them.
+        At most "maxSize" columns are kept, the least recently used column is discarded.
 
         Examples:
-            jPerson = jTeam.findOneDoc(filters={'name': 'Maria'})
-            jPerson = jTeam.findOneDoc(filters={'name': 'CT:ria'}, flagMacros=True) 	# first person whose name contains 'ria'
-            jPerson = jTeam.findOneDoc(filters={'name': 'NCT:ria'}, flagMacros=True) 	# first person whose name does not contain 'ria'
-            jPerson = jTeam.findOneDoc(filters={'name': "RE:(g\w+)\W(g\w+)"}, flagMacros=True) 	# first person whose name matches the regular expression
+            jProducts.createColumnCache()
+            jProducts.mean('features.price')
+            jProducts.max('features.price')
+            jProducts.columnStats()
+            # {'columns': 1, 'maxSize': 16, 'version': 0, 'hits': 1, 'misses': 1, 'evictions': 0}
 
         Args:
-            filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
-            flagMacros: if "True" then it searches for macros in the values ​​of the filter rules.
+            maxSize: maximum number of columns.
 
         Returns:
-            jDocument: json document containing the first documents located or None if not found any
+            self: the json document itself.
         """
-        jObj = self.findDocs(filters, qty=1, flagMacros=flagMacros)
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
 
-        if jObj:
-            return jObj.item(0)
+        self._columns = ColumnCache(maxSize)
+        return self
 
-        return None
+    def dropColumnCache(self) -> int:
+        """
+        Removes the cache of columns of the list (see createColumnCache()).
 
-    def findAnyDocs(self, lstFilters: list, qty: int = None) -> jDocument:
+        Returns:
+            int: the number of columns discarded.
         """
-        Searches for text within each document in the list and returns those that match the specified criteria.
-        This criterion is made up of a list of values and/or regular expressions.
-        The search is 'Case Insensitive' and treats accented characters as non-accented.
+        if self._columns is None:
+            return 0
+
+        q = self._columns.stats()['columns']
+        self._columns = None
+        return q
+
+    def columnStats(self) -> dict:
+        """
+        Returns the statistics of the cache of columns of the list (see createColumnCache()), the json needs to be a 'list' otherwise
+        it generates an error.
 
         Examples:
-            jPeople = jTeam.findOneDoc(filters=["(g\w+)\W(g\w+)"])		# tests if the json document matches regular expression
-            jPeople = jTeam.findOneDoc(filters=["Maria", "Paulista"])	# tests whether the two texts are contained in the json document
+            jProducts.columnStats()
+            # {'columns': 1, 'maxSize': 16, 'version': 0, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+        Returns:
+            dict: number of columns (up to date), maximum number of columns, version (number of changes of the list),
+                  hits, misses (columns extracted) and evictions; all 0 when the cache was not created.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        return (self._columns if self._columns is not None else ColumnCache(0)).stats()
+
+    def createView(self, name: str, keys: str | dict | list, aggregations: dict = None) -> jDocument:
+        """
+        Creates a view of the list, the json needs to be a 'list' otherwise it generates an error.
+        A view is a grouping of the documents, with the same keys and aggregations of groupBy(), whose groups are kept up to date
+        by addDoc(), removeDocs(), set() and by the bracket operators of this jDocument: each inserted, removed or replaced document
+        updates only its group, in constant time, so getView() returns the groups without scanning the list.
+        Only the functions count, sum, mean, ocorrences and countDistinct can be used (see jview); the sums of floats are updated by
+        additions and subtractions and can differ in the last digits from the sums computed again.
+        The other changes of the list (removeAttrib(), clear(), ...) rebuild the view on the next use; if the documents are changed
+        through another reference, call createView() again to rebuild it.
+
+        Examples:
+            jProducts.createView('priceByType', 'type', {'features.price': ['sum', 'mean']})
+            jProducts.addDoc({'title': 'Kiwi', 'type': 'fruit', 'features': {'price': 12.5}})
+            jProducts.getView('priceByType')
+            # [{'type': 'dairy', 'count': 8, 'features': {'price': {'sum': 186.33, 'mean': 23.29}}}, ...]
 
         Args:
-            lstFilters: list of search criteria that can be text or regular expressions.
-            qty: maximum number of documents to be searched, when "None" it will be all.
+            name: name of the view.
+            keys (str | dict | list): keys of the groups, see groupBy().
+            aggregations: dictionary with the name of the attribute and the aggregate function or list of functions (count, sum, mean,
+                          ocorrences, countDistinct), when "None" only the number of documents of each group is computed.
 
         Returns:
-            jDocument: json document containing the list of documents located.
+            self: the json document itself.
         """
         if self._type != CONST_TYPE_ARRAY:
             raise Exception(CONST_ERR_ARRAY)
 
-        findList = []
-        q = 0
+        view = View(name, keys, aggregations)
+        view.build(self._jdata)
+        self._views[name] = view
 
-        # pesquisa cada objeto do documento
-        for obj in self._jdata:
-            jObj = jDocument(obj)
+        return self
 
-            # testa cada regexp contra a documento
-            for ft in lstFilters:
-                # se deu match, separa este documento e vai para o próximo
-                s = jObj.getJson(flagPretty=False)
+    def getView(self, name: str) -> jDocument:
+        """
+        Returns the groups of a view (see createView()), in the same format of groupBy(), in the order in which they were created.
 
-                if re.search(ft, s, flags=re.IGNORECASE):
-                    findList.append(obj)
-                    break
+        Examples:
+            jProducts.getView('priceByType')
 
-            q += 1
+        Args:
+            name: name of the view.
 
-            if qty and q > qty:
-                break
+        Returns:
+            jDocument: list of groups.
+        """
+        view = self._views.get(name)
+        if view is None:
+            raise Exception(f"Err: the view '{name}' does not exist!")
 
-        return jDocument(findList)
+        if view.stale:
+            view.build(self._jdata)
 
-    @staticmethod
-    def _findDocs_TestAttrib(rule, val) -> bool:
-        if isinstance(rule, str):
-            if len(rule) <= 4:
-                return rule == val
-            # endif --
+        return jDocument(view.rows())
 
-            if rule[2] != ':' and rule[3] != ':':
-                # comparação simples de valores
-                return rule == val
-            # endif --
+    def dropView(self, name: str | list = None) -> int:
+        """
+        Removes a view, when no name is informed then all views are removed.
 
-            if rule.startswith('IN:'):
-                # se for um IN, valida como tal
-                return val in rule[3:]
+        Examples:
+            jProducts.dropView('priceByType')
 
-            elif rule.startswith('NIN:'):
-                # se for um NIN (not in), valida como tal
-                return val not in rule[4:]
+        Args:
+            name (str | list): name of the view or list of names.
 
-            elif rule.startswith('CT:'):
-                # se for um CT (contains), valida como tal
-                return rule[3:] in val
+        Returns:
+            int: the number of views removed.
+        """
+        if name is None:
+            q = len(self._views)
+            self._views.clear()
+            return q
 
-            elif rule.startswith('NCT:'):
-                # se for um NCT (not contains), valida como tal
-                return rule[4:] not in val
+        return sum(1 for nm in ([name] if isinstance(name, str) else name) if self._views.pop(nm, None))
 
-            elif rule.startswith('RE:'):
-                return True if re.search(rule[3:], val, flags=re.IGNORECASE) else False
-            # endif --
-        # endif --
+    def _deletePositions(self, lstPositions: list):
+        # exclui os elementos listados (em ordem crescente), do último para o primeiro
+        # o índice de texto e as visões são atualizados, os demais índices serão reconstruídos no próximo uso
+        flagText = self._textIndex is not None and not self._textIndex.stale
+        lstViews = [view for view in self._views.values() if not view.stale]
+        for i in reversed(lstPositions):
+            for view in lstViews:
+                view.remove(self._jdata[i])
 
-        return rule == val
+            del self._jdata[i]
+            if flagText:
+                self._textIndex.remove(i)
+        # endfor --
 
-    def _findDocs_TestDoc(self, docDic: dict) -> bool:
-        if not self._findDocs_qty:
-            # está buscando uma quantidade específica de elementos
-            # já localizou a quantidade necessária, ignora os demais
-            return False
-        # endif
+        self._invalidateIndexes(flagKeepText=flagText, flagKeepViews=True)
+
+    def _textCandidates(self, lstTexts: list) -> list | None:
+        # retorna as posições (em ordem) dos documentos que podem conter algum dos textos, ou None se o índice de texto não puder responder
+        if self._textIndex is None:
+            return None
+
+        candidates = set()
+        for txt in lstTexts:
+            positions = self._getTextIndex().lookup(txt)
+            if positions is None:
+                return None
 
-        for conds in self._findDocs_lstFilters:
+            candidates.update(positions)
+        # endfor --
+
+        return sorted(candidates)
+
+    def _indexCandidates(self, lstFilters: list) -> list | None:
+        # retorna as posições candidatas do atributo indexado mais seletivo do filtro, ou None se não houver índice
+        candidates = None
+        for conds in lstFilters:
             for at, ruleExpr in conds.items():
-                if '.' in at:
-                    # a regra se aplica a um atributo de um subdocumento
-                    jDoc = jDocument(docDic)
-                    valAttr = jDoc.get(at, None)
-                else:
-                    # trata-se de um atributo do documento raiz
-                    # valAttr = docDic[at] if at in docDic else None
-                    valAttr = docDic.get(at, None)
+                if at in self._indexes:
+                    positions = self._getIndex(at).lookup(ruleExpr)
+                    if candidates is None or len(positions) < len(candidates):
+                        candidates = positions
                 # endif --
+            # endfor --
+        # endfor --
 
-                # se o atributo for uma lista ou um dicionário (objeto) então transforma em string
-                if isinstance(valAttr, dict) or isinstance(valAttr, list):
-                    valAttr = str(valAttr)
-                # endif --
+        return candidates
 
-                if not self._findDocs_flagMacros:
-                    if ruleExpr != str(valAttr):
-                        return False
-                    # endif --
+    def _estimateSelectivity(self, key: tuple, lookup, predicate) -> tuple:
+        # retorna a fração estimada de documentos que passam na condição e a origem da estimativa (index, sample ou default)
+        if lookup is not None:
+            positions = lookup()
+            if positions is not None:
+                return len(positions) / max(len(self._jdata), 1), 'index'
+        # endif --
 
-                elif not jDocument._findDocs_TestAttrib(ruleExpr, valAttr):
-                    return False
-                # endif --
+        if len(self._jdata) < CONST_PLAN_MIN_DOCS:
+            return None, 'default'
+
+        selectivity = self._statistics.get(key)
+        if selectivity is None:
+            # amostra aleatória (reproduzível) de documentos da lista
+            sample = [self._jdata[i] for i in random.Random(len(self._jdata)).sample(range(len(self._jdata)), CONST_PLAN_SAMPLE)]
+            try:
+                hits = sum(1 for obj in sample if predicate(obj))
+                selectivity = (hits + 1) / (len(sample) + 2)
+            except Exception:
+                # a condição gera erro em alguns documentos, fica por último no AND
+                selectivity = 1.0
+
+            if len(self._statistics) >= CONST_PLAN_STATISTICS_SIZE:
+                self._statistics.clear()
+
+            self._statistics[key] = selectivity
+        # endif --
+
+        return selectivity, 'sample'
+
+    def _findPlan(self, lstFilters: list, flagMacros: bool, sources: dict = None) -> tuple:
+        # ordena as regras dos filtros de findDocs() pelo custo e seletividade estimados, veja planAnd()
+        conditions = []
+        for conds in lstFilters:
+            for at, ruleExpr in conds.items():
+                oper, value = findCondition(at, ruleExpr, flagMacros)
+                lookup = (lambda: self._getIndex(at).lookup(ruleExpr)) if oper == 'eq' and at in self._indexes else None
+                selectivity, source = self._estimateSelectivity(
+                    ('find', flagMacros, at, repr(ruleExpr)), lookup,
+                    lambda obj: jDocument._findDocs_TestDoc(obj, [{at: ruleExpr}], flagMacros),
+                )
+
+                cond = {at: ruleExpr}
+                if sources is not None:
+                    sources[id(cond)] = source
+
+                conditions.append((conditionCost(at, oper, value), defaultSelectivity(oper, value) if selectivity is None else selectivity, cond))
             # endfor --
         # endfor --
 
-        if self._findDocs_qty > 0:
-            self._findDocs_qty -= 1
-        # endif
+        return planAnd(conditions)
 
-        return True
+    def _planFindFilters(self, lstFilters: list, flagMacros: bool) -> list:
+        # retorna os filtros de findDocs() na ordem em que as regras devem ser testadas
+        if len(lstFilters) == 1 and len(lstFilters[0]) <= 1:
+            return lstFilters
 
-    def findAttribDocs(self, lstAttributes: list, qty: int = None) -> jDocument:
-        """
-        Returns a list of documents that contain a certain set of attributes, whose names are passed in 'lstAttrib'.
+        return [cond for _, _, cond in self._findPlan(lstFilters, flagMacros)[2]]
 
-        Examples:
-            jPerson = jTeam.findAttribDocs(lstAttrib=['name', 'address.street'])
+    def _planFilter(self, jOrFilters: jFilter, sources: dict = None) -> jFilter:
+        # ordena as condições do filtro de searchDocs() com as seletividades dos índices ordenados ou de uma amostra da lista
+        if jOrFilters is None or (len(self._jdata) < CONST_PLAN_MIN_DOCS and not (self._sortedIndexes or self._textIndex) and sources is None):
+            return jOrFilters
 
-        Args:
-            lstAttributes: list with the names of the attributes to be checked.
-            qty: maximum number of documents to be searched, when "None" it will be all.
+        selectivity = {}
+        for g, group in enumerate(jOrFilters.conditions):
+            for c, (attribute, oper, value, predicate) in enumerate(group):
+                if attribute in self._sortedIndexes:
+                    lookup = lambda: self._getSortedIndex(attribute).lookup(oper, value, self._jdata)
+                elif attribute == CONST_INDEX_TEXT and oper == 'ct' and self._textIndex is not None:
+                    lookup = lambda: self._getTextIndex().lookup(value)
+                else:
+                    lookup = None
+                # endif --
+                estimate, source = self._estimateSelectivity(('search', attribute, oper, repr(value)), lookup, predicate)
+                if estimate is not None:
+                    selectivity[(g, c)] = estimate
 
-        Returns:
-            jDocument: jDocument with a json document containing the list of documents located.
-        """
-        filters = {at: '.*' for at in lstAttributes}
+                if sources is not None:
+                    sources[(g, c)] = source
+            # endfor --
+        # endfor --
 
-        return self.findDocs(filters, qty)
+        return jOrFilters.planned(selectivity)
 
-    def sortDocs(self, attribute: str | dict | list) -> jDocument:
+    def explain(self, filters: dict | list = None, jOrFilters: jDocument | jFilter = None, exprFilter: str | jExpression = None,
+                flagMacros: bool = False) -> dict:
         """
-        Sort the list of documents, the json needs to be a 'list' otherwise it generates an error.
+        Returns the plan of a query of findDocs() (filters) or searchDocs() (jOrFilters/exprFilter), the json needs to be a 'list' otherwise it generates an error.
+        The conditions of each AND group are tested in order of estimated cost and selectivity (fraction of the documents that pass),
+        so that cheap and selective conditions discard the documents before the expensive ones (regular expressions, text search);
+        the OR groups are tested from the cheapest and most likely to match. The selectivity is taken from the indexes, from a sample
+        of the list (lists with at least CONST_PLAN_MIN_DOCS documents) or from the default of the operator.
 
         Examples:
-            jTeam.sortDocs('Name')						# sort by name in ascending order
-            jTeam.sortDocs(['Name', 'Address.Street'])	# Sort by name and street in ascending order
-            jTeam.sortDocs({'Name', -1})				# sort by name in descending order
-            jTeam.sortDocs({'Name', 1})					# sort by name in ascending order
+            jProducts.explain(filters={'type': 'fruit', 'title': 'RE:^s'}, flagMacros=True)
+            jProducts.explain(jOrFilters=[{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'vegan'},
+                                                   {'Attribute': 'type', 'Operator': 'eq', 'Value': 'fruit'}]}])
 
         Args:
-            attribute (str|dict|list): attributes to be considered in the ordering.
-                                       You can enter a string with the name of the attribute or a list of names;
-                                       or you can enter a dictionary with the name of the attribute plus the ordering sequence or a list of dictionaries.
+            filters: dictionary or dictionary list with the rules of findDocs().
+            jOrFilters: json with the search criteria of searchDocs(), or a jFilter already compiled.
+            exprFilter: Python expression of searchDocs(), it is tested only on the documents that do not match "jOrFilters".
+            flagMacros: if "True" the rules of "filters" may contain macros (see findDocs()).
 
-        Return:
-            self: json document itself already sorted.
+        Returns:
+            dict: documents (size of the list), access ('index' or 'scan'), candidates (number of documents to be tested),
+                  groups (the AND groups in the order they are tested, with their conditions in the order they are tested,
+                  the cost, the selectivity and the origin of each estimate) and expression.
         """
         if self._type != CONST_TYPE_ARRAY:
             raise Exception(CONST_ERR_ARRAY)
 
-        if isinstance(attribute, list):
-            # se foi informado uma lista de atributos
-            list(map(lambda at: self.sortDocs(at), reversed(attribute)))
-            return self
+        groups = []
+        if filters is not None:
+            lstFilters = [filters] if isinstance(filters, dict) else filters
+            candidates = None if flagMacros else self._indexCandidates(lstFilters)
+
+            sources = {}
+            cost, selectivity, conds = self._findPlan(lstFilters, flagMacros, sources)
+            lstConds = []
+            for condCost, condSelectivity, cond in conds:
+                (at, ruleExpr), = cond.items()
+                lstConds.append({'attribute': at, 'operator': findCondition(at, ruleExpr, flagMacros)[0], 'value': ruleExpr,
+                                 'cost': round(condCost, 3), 'selectivity': round(condSelectivity, 3), 'estimate': sources[id(cond)]})
+            # endfor --
 
-        if isinstance(attribute, str):
-            # foi informado apenas o nome do atributo
-            list(self._jdata).sort(key=lambda e: (not e[attribute], e[attribute]))
+            groups.append({'cost': round(cost, 3), 'selectivity': round(selectivity, 3), 'conditions': lstConds})
 
         else:
-            # foi informado um dicionário com o nome do atributo e a sequência (0 ou 1)
-            for sortAttrib, order in attribute.items():
-                list(self._jdata).sort(reverse=(True if order != 1 else False), key=lambda e: (not e[sortAttrib], e[sortAttrib]))
+            compiled = compileFilter(jOrFilters) if jOrFilters else None
+            candidates = None if exprFilter or not (self._sortedIndexes or self._textIndex or self._columns) else self._searchCandidates(compiled)
+
+            if compiled:
+                sources = {}
+                compiled = self._planFilter(compiled, sources)
+                groups = compiled.explain()
+                for group, (_, _, conds) in zip(groups, compiled.plan):
+                    for cond, (_, _, position) in zip(group['conditions'], conds):
+                        cond['estimate'] = sources[position]
+                # endfor --
+            # endif --
+        # endif --
 
-        return self
+        return {
+            'documents': len(self._jdata),
+            'access': 'scan' if candidates is None else 'index',
+            'candidates': len(self._jdata) if candidates is None else len(candidates),
+            'groups': groups,
+            'expression': compileExpression(exprFilter).source if exprFilter else None,
+        }
 
-    def searchDocs(self, jOrFilters: jDocument = None, exprFilter: str = None, qty: int = None) -> jDocument:
+    def findDocs(self, filters: dict | list, qty: int = None, flagMacros: bool = False, parallel: int | Executor = None) -> jDocument | None:
+        """
+        It generates a list with the first N documents that correspond to the informed filter, the json needs to be a 'list' otherwise it generates an error.
+        If N is not informed then all documents will be returned.
+        The filter is a dictionary with attributes and values, the search is 'Case Insensitive'.
+        When "flagMacros" is "True" the routine will test macros provided through the filters. The recognized macros are:
+            IN:<value> --> tests whether the attribute's value is contained in <value>.
+            NIN:<value> --> tests if attribute value is not contained in <value>.
+            CT:<value> --> tests whether <value> is contained in the attribute value.
+            NCT:<value> --> tests if <value> is not contained in the attribute value.
+            RE:<RegExp> --> tests the attribute value matches the regular expression <RegExp>.
+
+        Examples:
+            jPerson = jTeam.findDocs(filters={'name': 'Maria'})
+            jPerson = jTeam.findDocs(filters={'name': 'CT:ria'}, flagMacros=True) 	# people whose name contains 'ria'
+            jPerson = jTeam.findDocs(filters={'name': 'NCT:ria'}, flagMacros=True) 	# people whose name does not contain 'ria'
+            jPerson = jTeam.findDocs(filters={'name': "RE:(g\w+)\W(g\w+)"}, flagMacros=True) 	# people whose name matches the regular expression
+            jPerson = jTeam.findDocs(filters={'city': 'Sao Paulo'}, parallel=4) 	# scans the list with 4 processes
+
+        When "parallel" is informed, the list is split in chunks that are tested by the shared pool of processes with this number
+        of workers (see jparallel.getPool(), reused by the next scans) or by the informed Executor, and the results are merged
+        in the order of the list. It only pays off for large lists
+        (see the benchmark "parallel" in tests/benchmark.py), and it is ignored when an index answers the filter.
+
+        Args:
+            filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
+            qty: maximum amount of documents to be removed, when "None" it will be all
+            flagMacros: if "True" then it searches for macros in the values of the filter rules.
+            parallel: number of worker processes (or a concurrent.futures.Executor) to scan the list in parallel.
+
+        Returns:
+            jDocument: jDocument with Json document containing the list of found documents or None if not found any
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        lstFilters = [filters] if isinstance(filters, dict) else filters
+        if parallel and (flagMacros or self._indexCandidates(lstFilters) is None):
+            positions = parallelScan(self._jdata, jDocument._findDocs_TestDoc, (self._planFindFilters(lstFilters, flagMacros), flagMacros), parallel, qty)
+        else:
+            positions = self._findPositions(filters, qty, flagMacros)
+        # endif --
+
+        findList = [self._jdata[i] for i in positions]
+
+        if not findList:
+            return None
+
+        return jDocument(findList)
+
+    def iterFindDocs(self, filters: dict | list, qty: int = None, flagMacros: bool = False, flagRawDocs: bool = False):
+        """
+        Generator version of findDocs(): yields the documents that correspond to the informed filter as they are found,
+        the scan stops as soon as the consumer stops iterating or "qty" documents were yielded.
+
+        Examples:
+            for jPerson in jTeam.iterFindDocs(filters={'city': 'Sao Paulo'}):
+                print(jPerson['name'])
+
+        Args:
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            qty: maximum amount of documents to be yielded, when "None" it will be all
+            flagMacros: if "True" then it searches for macros in the values of the filter rules (see findDocs()).
+            flagRawDocs: if "True" yields the raw documents (dict), otherwise yields a jDocument for each document.
+
+        Returns:
+            Iterator: documents found.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        for i in self._iterFindPositions(filters, qty, flagMacros):
+            yield self._jdata[i] if flagRawDocs else jDocument(self._jdata[i])
+
+    @staticmethod
+    def iterFile(file, prefix: str = None, flagRawDocs: bool = False):
+        """
+        Reads a Json file whose document is an array (or has an array at the path "prefix", e.g. 'data') yielding the elements one at a time:
+        the file is read in chunks and each element is decoded as soon as it is complete (see jstream), so the memory depends on the size
+        of an element and not on the size of the file. The dates are decoded as in jDocument(json string).
+
+        Examples:
+            for jOrder in jDocument.iterFile('orders.json'):
+                print(jOrder['customer.id'])
+
+            # filtering: the compiled filters and expressions test the raw documents
+            jFilterPaid = compileFilter([{'And': [{'Attribute': 'status', 'Operator': 'eq', 'Value': 'paid'}]}])
+            jPaid = jDocument([obj for obj in jDocument.iterFile('orders.json', flagRawDocs=True) if jFilterPaid(obj)])
+
+            # aggregation with bounded memory (see jsketch)
+            hll = HyperLogLog()
+            hll.update(attributeValues(jDocument.iterFile('orders.json', flagRawDocs=True), 'customer.id'))
+
+            # export of the array 'data' of a page to JSON Lines, one document at a time
+            with open('users.jsonl', 'w', encoding='utf-8') as f:
+                for obj in jDocument.iterFile('page.json', prefix='data', flagRawDocs=True):
+                    f.write(dumps(obj) + '\n')
+
+        Args:
+            file: name of the file or a file (text) already opened.
+            prefix: path (dot notation) of the array in the document, when "None" the document itself must be an array.
+            flagRawDocs: if "True" yields the raw elements (dict), otherwise yields a jDocument for each object or list.
+
+        Returns:
+            Iterator: elements of the array.
+        """
+        for obj in iterJsonArray(file, prefix):
+            yield obj if flagRawDocs or not isinstance(obj, (dict, list)) else jDocument(obj)
+
+    @staticmethod
+    def fromJsonl(file, flagLazy: bool = True, parallel: int | Executor = None, flagRawDocs: bool = False):
+        """
+        Reads a JSON Lines file (NDJSON, one document per line) line by line, through a buffered file (see jstream).
+        With flagLazy=True (default) the documents are yielded one at a time, so the memory does not depend on the size of the file;
+        otherwise an array jDocument with all the documents is returned. The dates are decoded as in jDocument(json string).
+        When "parallel" is informed the lines are decoded in batches by a pool of processes, in the order of the file.
+
+        Examples:
+            for jOrder in jDocument.fromJsonl('orders.jsonl'):
+                print(jOrder['customer.id'])
+
+            jOrders = jDocument.fromJsonl('orders.jsonl', flagLazy=False, parallel=4)
+
+        Args:
+            file: name of the file or a file (text or binary) already opened.
+            flagLazy: if "True" returns an iterator of the documents, otherwise an array jDocument.
+            parallel: number of worker processes (or an Executor) that decode batches of lines.
+            flagRawDocs: if "True" the iterator yields the raw documents (dict), otherwise yields a jDocument for each object or list.
+
+        Returns:
+            Iterator | jDocument: the documents of the file.
+        """
+        if not flagLazy:
+            return jDocument(list(iterJsonl(file, parallel)))
+
+        return (obj if flagRawDocs or not isinstance(obj, (dict, list)) else jDocument(obj) for obj in iterJsonl(file, parallel))
+
+    @staticmethod
+    def mapFile(file: str, cacheSize: int = CONST_MMAP_CACHE_SIZE, indexFile: str = None, flagJsonl: bool = None) -> jDocument:
+        """
+        Opens a JSON Lines file (one document per line) or a Json array file as a read-only array jDocument backed by a memory map
+        (see jmmap): only the byte offsets of the elements are kept in memory and each element is decoded when it is read, with a
+        LRU cache of the decoded elements. The pages of the file are shared by the processes that map it, so a large catalogue can
+        be served by many worker processes with a resident memory that depends on the documents read.
+        len(), item(), [], the iteration, the queries (findDocs, searchDocs, ...), the aggregate functions, the indexes and the
+        views work as in a list; the methods that change the documents (addDoc, set, removeDocs, sortDocs, ...) raise an exception.
+        The documents returned (item(), findDocs(), ...) are shared by the cache and must not be changed.
+
+        Examples:
+            jCatalog = jDocument.mapFile('catalog.jsonl', indexFile='catalog.jsonl.idx')
+            jCatalog.createIndex('sku')
+            jProduct = jCatalog.findOneDoc({'sku': 'A-1000'})
+            jCatalog.mean('price', filters={'type': 'fruit'})
+
+        Args:
+            file: name of the file (JSON Lines or a Json array).
+            cacheSize: number of decoded documents kept in the LRU cache.
+            indexFile: name of the file where the offsets are saved and reused while the file does not change, when "None" the file
+                       is indexed every time it is mapped.
+            flagJsonl: "True" for JSON Lines, "False" for a Json array, when "None" it is detected by the extension or by the first character.
+
+        Returns:
+            jDocument: the read-only documents of the file.
+        """
+        return jDocument(MappedArray(file, cacheSize, indexFile, flagJsonl))
+
+    def toJsonl(self, file) -> int:
+        """
+        Writes the documents of the list in a JSON Lines file (NDJSON, one document per line), the json needs to be a 'list' otherwise it
+        generates an error. The lines are written in blocks through a buffered file (see jstream), the whole output is never built in memory.
+
+        Examples:
+            jOrders.toJsonl('orders.jsonl')
+
+            with gzip.open('orders.jsonl.gz', 'wt', encoding='utf-8') as f:
+                jOrders.toJsonl(f)
+
+        Args:
+            file: name of the file or a file (text or binary) already opened.
+
+        Returns:
+            int: the number of documents written.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        return writeJsonl(self._jdata, file)
+
+    def _findPositions(self, filters: dict | list, qty: int = None, flagMacros: bool = False) -> list:
+        """
+        Returns the positions of the first N documents that correspond to the informed filter (see findDocs()).
+        """
+        return list(self._iterFindPositions(filters, qty, flagMacros))
+
+    def _iterFindPositions(self, filters: dict | list, qty: int = None, flagMacros: bool = False):
+        """
+        Yields the positions of the first N documents that correspond to the informed filter (see findDocs()).
+        When one of the attributes of the filter is indexed, only the documents of the index are tested.
+        """
+        # se foi passado um dicionário de condições monta uma lista com apenas essa condição senão considera esta lista de condições
+        lstFilters = [filters] if isinstance(filters, dict) else filters
+
+        candidates = None if flagMacros else self._indexCandidates(lstFilters)
+        if candidates is None:
+            # percorre toda a lista de objetos
+            candidates = range(len(self._jdata))
+        # endif --
+
+        # as regras são testadas na ordem do plano, veja explain()
+        lstFilters = self._planFindFilters(lstFilters, flagMacros)
+
+        q = 0
+        for i in candidates:
+            if jDocument._findDocs_TestDoc(self._jdata[i], lstFilters, flagMacros):
+                yield i
+
+                q += 1
+                if qty and q >= qty:
+                    # já localizou a quantidade necessária, ignora os demais
+                    break
+            # endif --
+        # endfor --
+
+    def findOneDoc(self, filters: dict | list, flagMacros: bool = False) -> jDocument | None:
+        """
+        Returns the first document that correspond to the informed filter, the json needs to be a 'list' otherwise it generates an error.
+        The filter is a dictionary with attributes and values, the search is 'Case Insensitive'.
+        When "flagMacros" is "True" the routine will test macros provided through the filters. The recognized macros are:
+            IN:<value> --> tests whether the attribute's value is contained in <value>.
+            NIN:<value> --> tests if attribute value is not contained in <value>.
+            CT:<value> --> tests whether <value> is contained in the attribute value.
+            NCT:<value> --> tests if <value> is not contained in the attribute value.
+            RE:<RegExp> --> tests the attribute value matches the regular expression <RegExp>.
+
+        Examples:
+            jPerson = jTeam.findOneDoc(filters={'name': 'Maria'})
+            jPerson = jTeam.findOneDoc(filters={'name': 'CT:ria'}, flagMacros=True) 	# first person whose name contains 'ria'
+            jPerson = jTeam.findOneDoc(filters={'name': 'NCT:ria'}, flagMacros=True) 	# first person whose name does not contain 'ria'
+            jPerson = jTeam.findOneDoc(filters={'name': "RE:(g\w+)\W(g\w+)"}, flagMacros=True) 	# first person whose name matches the regular expression
+
+        Args:
+            filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
+            flagMacros: if "True" then it searches for macros in the values ​​of the filter rules.
+
+        Returns:
+            jDocument: json document containing the first documents located or None if not found any
+        """
+        jObj = self.findDocs(filters, qty=1, flagMacros=flagMacros)
+
+        if jObj:
+            return jObj.item(0)
+
+        return None
+
+    def findAnyDocs(self, lstFilters: list, qty: int = None, parallel: int | Executor = None) -> jDocument:
+        """
+        Searches for text within each document in the list and returns those that match the specified criteria.
+        This criterion is made up of a list of values and/or regular expressions.
+        The search is 'Case Insensitive' and treats accented characters as non-accented.
+
+        Examples:
+            jPeople = jTeam.findOneDoc(filters=["(g\w+)\W(g\w+)"])		# tests if the json document matches regular expression
+            jPeople = jTeam.findOneDoc(filters=["Maria", "Paulista"])	# tests whether the two texts are contained in the json document
+
+        Args:
+            lstFilters: list of search criteria that can be text or regular expressions, the plain texts are answered by the
+                        text index when there is one (see createIndex('all')).
+            qty: maximum number of documents to be searched, when "None" it will be all.
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+
+        Returns:
+            jDocument: json document containing the list of documents located.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        if parallel and self._textCandidates(lstFilters) is None:
+            lstDocs = self._jdata[:qty + 1] if qty else self._jdata
+            lstRegex = [re.compile(ft, flags=re.IGNORECASE) for ft in lstFilters]
+            findList = [lstDocs[i] for i in parallelScan(lstDocs, jDocument._findAnyDocs_TestDoc, (lstRegex,), parallel)]
+        else:
+            findList = list(self.iterFindAnyDocs(lstFilters, qty, flagRawDocs=True))
+        # endif --
+
+        return jDocument(findList)
+
+    def iterFindAnyDocs(self, lstFilters: list, qty: int = None, flagRawDocs: bool = False):
+        """
+        Generator version of findAnyDocs(): yields the documents that match the criteria as they are found,
+        the scan stops as soon as the consumer stops iterating.
+
+        Examples:
+            jPerson = next(jTeam.iterFindAnyDocs(["Maria", "Paulista"]), None)
+
+        Args:
+            lstFilters: list of search criteria that can be text or regular expressions.
+            qty: maximum number of documents to be searched, when "None" it will be all.
+            flagRawDocs: if "True" yields the raw documents (dict), otherwise yields a jDocument for each document.
+
+        Returns:
+            Iterator: documents found.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        for i in self._iterFindAnyPositions(lstFilters, qty):
+            yield self._jdata[i] if flagRawDocs else jDocument(self._jdata[i])
+
+    def _iterFindAnyPositions(self, lstFilters: list, qty: int = None):
+        """
+        Yields the positions of the documents that match the criteria of findAnyDocs().
+        When there is a text index (see createIndex('all')) and all the criteria are plain texts, only the documents of the index are tested.
+        """
+        lstRegex = [re.compile(ft, flags=re.IGNORECASE) for ft in lstFilters]
+
+        candidates = self._textCandidates(lstFilters)
+        if candidates is None:
+            # percorre toda a lista de objetos
+            candidates = range(len(self._jdata))
+        # endif --
+
+        # pesquisa cada objeto do documento
+        for i in candidates:
+            if qty and i > qty:
+                # já pesquisou a quantidade de documentos informada
+                break
+
+            if jDocument._findAnyDocs_TestDoc(self._jdata[i], lstRegex):
+                yield i
+        # endfor --
+
+    @staticmethod
+    def _findAnyDocs_TestDoc(docDic: dict, lstRegex: list) -> bool:
+        # o documento é convertido para texto uma única vez
+        s = js.dumps(docDic)
+
+        # testa cada regexp contra a documento
+        for regex in lstRegex:
+            if regex.search(s):
+                return True
+
+        return False
+
+    @staticmethod
+    def _findDocs_TestAttrib(rule, val) -> bool:
+        if isinstance(rule, str):
+            if len(rule) <= 4:
+                return rule == val
+            # endif --
+
+            if rule[2] != ':' and rule[3] != ':':
+                # comparação simples de valores
+                return rule == val
+            # endif --
+
+            if rule.startswith('IN:'):
+                # se for um IN, valida como tal
+                return val in rule[3:]
+
+            elif rule.startswith('NIN:'):
+                # se for um NIN (not in), valida como tal
+                return val not in rule[4:]
+
+            elif rule.startswith('CT:'):
+                # se for um CT (contains), valida como tal
+                return rule[3:] in val
+
+            elif rule.startswith('NCT:'):
+                # se for um NCT (not contains), valida como tal
+                return rule[4:] not in val
+
+            elif rule.startswith('RE:'):
+                return True if re.search(rule[3:], val, flags=re.IGNORECASE) else False
+            # endif --
+        # endif --
+
+        return rule == val
+
+    @staticmethod
+    def _findDocs_TestDoc(docDic: dict, lstFilters: list, flagMacros: bool) -> bool:
+        for conds in lstFilters:
+            for at, ruleExpr in conds.items():
+                if '.' in at:
+                    # a regra se aplica a um atributo de um subdocumento
+                    valAttr = getPathDefault(docDic, compilePath(at))
+                else:
+                    # trata-se de um atributo do documento raiz
+                    # valAttr = docDic[at] if at in docDic else None
+                    valAttr = docDic.get(at, None)
+                # endif --
+
+                # se o atributo for uma lista ou um dicionário (objeto) então transforma em string
+                if isinstance(valAttr, dict) or isinstance(valAttr, list):
+                    valAttr = str(valAttr)
+                # endif --
+
+                if not flagMacros:
+                    if ruleExpr != str(valAttr):
+                        return False
+                    # endif --
+
+                else:
+                    try:
+                        flagMatch = jDocument._findDocs_TestAttrib(ruleExpr, valAttr)
+                    except TypeError:
+                        # as regras são testadas na ordem do plano (veja explain()), um valor que não pode ser comparado com a
+                        # macro (ex.: RE: com o atributo vazio) não satisfaz a regra, em vez de interromper a pesquisa com erro
+                        flagMatch = False
+
+                    if not flagMatch:
+                        return False
+                # endif --
+            # endfor --
+        # endfor --
+
+        return True
+
+    def findAttribDocs(self, lstAttributes: list, qty: int = None) -> jDocument:
+        """
+        Returns a list of documents that contain a certain set of attributes, whose names are passed in 'lstAttrib'.
+
+        Examples:
+            jPerson = jTeam.findAttribDocs(lstAttrib=['name', 'address.street'])
+
+        Args:
+            lstAttributes: list with the names of the attributes to be checked.
+            qty: maximum number of documents to be searched, when "None" it will be all.
+
+        Returns:
+            jDocument: jDocument with a json document containing the list of documents located.
+        """
+        filters = {at: '.*' for at in lstAttributes}
+
+        return self.findDocs(filters, qty)
+
+    def sortDocs(self, attribute: str | dict | list) -> jDocument:
+        """
+        Sort the list of documents, the json needs to be a 'list' otherwise it generates an error.
+        The key of each document (a tuple with the values of all the attributes) is built once and the list is sorted in place with a
+        single stable sort. Values of different types are ordered by type (numbers, strings, dates, others) and then by value; the
+        documents without the attribute (or with None) are placed at the end, both in ascending and in descending order (see jsort).
+
+        Examples:
+            jTeam.sortDocs('Name')						# sort by name in ascending order
+            jTeam.sortDocs(['Name', 'Address.Street'])	# Sort by name and street in ascending order
+            jTeam.sortDocs({'Name': -1})				# sort by name in descending order
+            jTeam.sortDocs({'Name': 1})					# sort by name in ascending order
+            jTeam.sortDocs(['Address.City', {'Age': -1}])	# sort by city in ascending order and by age in descending order
+
+        Args:
+            attribute (str|dict|list): attributes to be considered in the ordering.
+                                       You can enter a string with the name of the attribute or a list of names;
+                                       or you can enter a dictionary with the name of the attribute plus the ordering sequence or a list of dictionaries.
+
+        Return:
+            self: json document itself already sorted.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        lstSortKeys = parseSortKeys(attribute)
+        readers = self._columnReaders(lstSortKeys)
+        if readers is None:
+            self._jdata.sort(key=sortKey(lstSortKeys), reverse=isDescending(lstSortKeys))
+
+            # as posições dos documentos mudaram, as visões não dependem da ordem da lista
+            self._invalidateIndexes(flagKeepViews=True)
+            return self
+        # endif --
+
+        # os valores são lidos das colunas: ordena as posições e as colunas são reordenadas com a lista
+        lstDocs = self._jdata
+        order = sorted(range(len(lstDocs)), key=positionKey(lstSortKeys, readers), reverse=isDescending(lstSortKeys))
+        lstDocs[:] = [lstDocs[i] for i in order]
+
+        self._invalidateIndexes(flagKeepViews=True, flagKeepColumns=True)
+        self._columns.reorder(order)
+
+        return self
+
+    def _columnReaders(self, lstSortKeys: list) -> list | None:
+        # funções que leem o valor de cada atributo da ordenação numa posição da lista, das colunas que já existem (veja
+        # createColumnCache()) ou dos documentos; None se nenhum atributo tem coluna
+        lstColumns = [self._getColumn(at, flagBuild=False) for at, _, _ in lstSortKeys]
+        if all(column is None for column in lstColumns):
+            return None
+
+        lstDocs = self._jdata
+        return [column.reader(lstDocs) if column is not None else (lambda i, steps=steps: getPathDefault(lstDocs[i], steps))
+                for column, (_, steps, _) in zip(lstColumns, lstSortKeys)]
+
+    def topDocs(self, attribute: str | dict | list, n: int = 10, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> jDocument:
+        """
+        Returns the first "n" documents of the list in the order of sortDocs(attribute), without sorting the list: the "n" documents
+        are selected with a heap (heapq), in time proportional to the size of the list and memory proportional to "n".
+        The list is not changed. Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            # the 100 most expensive products
+            jProducts.topDocs({'features.price': -1}, 100)
+
+            # the 3 cheapest fruits
+            jProducts.topDocs('features.price', 3, filters={'type': 'fruit'})
+
+        Args:
+            attribute (str|dict|list): attributes of the ordering, see sortDocs().
+            n: number of documents.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+
+        Returns:
+            jDocument: list with the documents, in the order of sortDocs().
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        lstSortKeys = parseSortKeys(attribute)
+        lstDocs = self._jdata
+        flagFilter = bool(filters or jOrFilters or exprFilter)
+
+        # nsmallest() e nlargest() são estáveis, como sorted(...)[:n]
+        select = nlargest if isDescending(lstSortKeys) else nsmallest
+
+        readers = self._columnReaders(lstSortKeys)
+        if readers is not None:
+            # os valores são lidos das colunas, seleciona as posições
+            positions = self._filterPositions(filters, jOrFilters, exprFilter) if flagFilter else range(len(lstDocs))
+            return jDocument([lstDocs[i] for i in select(n, positions, key=positionKey(lstSortKeys, readers))])
+        # endif --
+
+        candidates = (lstDocs[i] for i in self._filterPositions(filters, jOrFilters, exprFilter)) if flagFilter else lstDocs
+        return jDocument(select(n, candidates, key=sortKey(lstSortKeys)))
+
+    def searchDocs(self, jOrFilters: jDocument = None, exprFilter: str = None, qty: int = None, parallel: int | Executor = None) -> jDocument:
         """
         Searches the list of documents and returns those that match a set of conditions.
         These conditions can be exposed through a "jDocument" or a Python expression.
         In the case of the Python expression, the attributes of the documents in the list are referenced through the "jDoc" variable.
-        Search using Python expression is only recommended for small lists as it is slower by using eval().
+        The Python expression is compiled once (and cached), only a safe subset of Python is accepted, see compileExpression().
 
         Examples:
             # search for documents with 'Name' equal to 'Maria' and 'Age' greater than 30, or 'Name' equal to 'Marta' and age less than 20
@@ -1097,10 +1932,13 @@ class jDocument(Sequence):
             If the field name is "all" then a text search will be performed within the JSON document
             ** In this case, only the "contain" and "not contain" operators are accepted
 
+        The criteria are compiled once per search (and cached), use compileFilter() to compile them in advance and reuse them.
+
         Args:
-            jOrFilters: json with the search criteria.
-            exprFilter: Python expression with search criteria
+            jOrFilters: json with the search criteria, or a jFilter already compiled (see compileFilter()).
+            exprFilter: Python expression with search criteria, or a jExpression already compiled (see compileExpression()).
             qty: maximum number of documents to be searched, when "None" it will be all.
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
             jDocument: list of documents found
@@ -1111,24 +1949,120 @@ class jDocument(Sequence):
             else:
                 return jDocument([])
 
-        self._searhDocs_jOrFilters = jOrFilters
-        self._searhDocs_exprFilter = exprFilter
-        self._searhDocs_qty = qty if qty else -1
+        if parallel:
+            jOrFilters = compileFilter(jOrFilters) if jOrFilters else None
+            exprFilter = compileExpression(exprFilter) if exprFilter else None
+        # endif --
 
-        findList = list(filter(self._searchDocs_TestDoc, self._jdata))
+        if parallel and (exprFilter or not (self._sortedIndexes or self._textIndex or self._columns) or self._searchCandidates(jOrFilters) is None):
+            positions = parallelScan(self._jdata, jDocument._searchDocs_TestDoc, (self._planFilter(jOrFilters), exprFilter), parallel, qty)
+        else:
+            positions = self._searchPositions(jOrFilters, exprFilter, qty)
+        # endif --
 
-        self._searhDocs_jOrFilters = None
-        self._searhDocs_exprFilter = None
-        self._searhDocs_qty = None
+        findList = [self._jdata[i] for i in positions]
 
         return jDocument(findList)
 
+    def iterSearchDocs(self, jOrFilters: jDocument | jFilter = None, exprFilter: str | jExpression = None, qty: int = None, flagRawDocs: bool = False):
+        """
+        Generator version of searchDocs(): yields the documents that match the conditions as they are found,
+        the scan stops as soon as the consumer stops iterating or "qty" documents were yielded.
+
+        Examples:
+            with open('expensive.jsonl', 'w') as f:
+                for product in jProducts.iterSearchDocs(exprFilter="jDoc['features.price'] > 28", flagRawDocs=True):
+                    f.write(js.dumps(product) + '\n')
+
+        Args:
+            jOrFilters: json with the search criteria, or a jFilter already compiled (see compileFilter()).
+            exprFilter: Python expression with search criteria, or a jExpression already compiled (see compileExpression()).
+            qty: maximum number of documents to be yielded, when "None" it will be all.
+            flagRawDocs: if "True" yields the raw documents (dict), otherwise yields a jDocument for each document.
+
+        Returns:
+            Iterator: documents found.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        for i in self._iterSearchPositions(jOrFilters, exprFilter, qty):
+            yield self._jdata[i] if flagRawDocs else jDocument(self._jdata[i])
+
+    def _searchPositions(self, jOrFilters: jDocument = None, exprFilter: str = None, qty: int = None) -> list:
+        """
+        Returns the positions of the first N documents that match the conditions (see searchDocs()).
+        """
+        return list(self._iterSearchPositions(jOrFilters, exprFilter, qty))
+
+    def _iterSearchPositions(self, jOrFilters: jDocument = None, exprFilter: str = None, qty: int = None):
+        """
+        Yields the positions of the first N documents that match the conditions (see searchDocs()).
+        When each AND group of "jOrFilters" has a condition on an attribute with a sorted index, only the documents of the index are tested.
+        """
+        # o filtro e a expressão são compilados uma única vez para toda a pesquisa
+        jOrFilters = compileFilter(jOrFilters) if jOrFilters else None
+        exprFilter = compileExpression(exprFilter) if exprFilter else None
+
+        candidates = None if exprFilter or not (self._sortedIndexes or self._textIndex or self._columns) else self._searchCandidates(jOrFilters)
+        if candidates is None:
+            # percorre toda a lista de objetos
+            candidates = range(len(self._jdata))
+        # endif --
+
+        # as condições são testadas na ordem do plano, veja explain()
+        jOrFilters = self._planFilter(jOrFilters)
+
+        q = 0
+        for i in candidates:
+            if self._searchDocs_TestDoc(self._jdata[i], jOrFilters, exprFilter):
+                yield i
+
+                q += 1
+                if qty and q >= qty:
+                    # já localizou a quantidade necessária, ignora os demais
+                    break
+            # endif --
+        # endfor --
+
+    def _searchCandidates(self, jOrFilters: jFilter) -> list | None:
+        # retorna as posições candidatas, a união dos índices mais seletivos de cada grupo AND, ou None se algum grupo não tiver índice
+        if not jOrFilters:
+            return None
+
+        candidates = set()
+        for group in jOrFilters.conditions:
+            groupCandidates = None
+            for filterAttrib, oper, value, _ in group:
+                if filterAttrib in self._sortedIndexes:
+                    positions = self._getSortedIndex(filterAttrib).lookup(oper, value, self._jdata)
+                elif filterAttrib == CONST_INDEX_TEXT and oper == 'ct' and self._textIndex is not None:
+                    # pesquisa de texto dentro do documento
+                    positions = self._getTextIndex().lookup(value)
+                else:
+                    # a coluna do atributo, se já foi extraída, responde as condições com números
+                    column = self._getColumn(filterAttrib, flagBuild=False)
+                    positions = None if column is None else column.select(oper, value)
+                # endif --
+
+                if positions is not None and (groupCandidates is None or len(positions) < len(groupCandidates)):
+                    groupCandidates = positions
+            # endfor --
+
+            if groupCandidates is None:
+                return None
+
+            candidates.update(groupCandidates)
+        # endfor --
+
+        return sorted(candidates)
+
     def searchOneDoc(self, jOrFilters: jDocument = None, exprFilter: str = None) -> jDocument:
         """
         Searches for the firts document that match a set of conditions.
         These conditions can be exposed through a "jDocument" or a Python expression.
         In the case of the Python expression, the attributes of the documents in the list are referenced through the "jDoc" variable.
-        Search using Python expression is only recommended for small lists as it is slower by using eval().
+        The Python expression is compiled once (and cached), only a safe subset of Python is accepted, see compileExpression().
 
         Examples:
             # search for documents with 'Name' equal to 'Maria' and 'Age' greater than 30, or 'Name' equal to 'Marta' and age less than 20
@@ -1170,9 +2104,11 @@ class jDocument(Sequence):
             If the field name is "all" then a text search will be performed within the JSON document
             ** In this case, only the "contain" and "not contain" operators are accepted
 
+        The criteria are compiled once per search (and cached), use compileFilter() to compile them in advance and reuse them.
+
         Args:
-            jOrFilters: json with the search criteria.
-            exprFilter: Python expression with search criteria
+            jOrFilters: json with the search criteria, or a jFilter already compiled (see compileFilter()).
+            exprFilter: Python expression with search criteria, or a jExpression already compiled (see compileExpression()).
 
         Returns:
             jDocument: document found
@@ -1180,167 +2116,120 @@ class jDocument(Sequence):
         jDoc = self.searchDocs(jOrFilters=jOrFilters, exprFilter=exprFilter, qty=1)
         return jDoc[0] if jDoc else None
 
-    def _searchDocs_TestDoc(self, docdic) -> bool:
-        if not self._searhDocs_qty:
-            return False
-        # endif --
-
-        if self._searhDocs_jOrFilters and self._testDoc(jDocument(docdic), self._searhDocs_jOrFilters):
+    @staticmethod
+    def _searchDocs_TestDoc(docdic, jOrFilters: jFilter, exprFilter: jExpression) -> bool:
+        if jOrFilters and jOrFilters(docdic):
             return True
         # endif --
 
-        if self._searhDocs_exprFilter:
-            # 'jDoc' é uma variável para expressão de validação
-            jDoc = jDocument(docdic)
-            if eval(self._searhDocs_exprFilter):
-                return True
-            # endif --
-            if jDoc:
-                pass
-            # endif --
+        if exprFilter and exprFilter(docdic):
+            return True
         # endif --
 
         return False
 
-    def _testDoc(self, jDoc: jDocument, jOrFilters: jDocument) -> bool:
+    @staticmethod
+    def _testDoc(jDoc: jDocument, jOrFilters: jDocument | jFilter) -> bool:
         """
         Testa um documento contra um filtro de pesquisa e informa se correspomde ou não.
 
         Args:
             jDoc: documento a ser testado.
-            jOrFilters: filtro.
+            jOrFilters: filtro (ou filtro compilado, veja compileFilter()).
 
         Returns:
             bool: TRUE se corresponder ou FALSE caso contrário
         """
-        flagFind = True
-
-        # testa alternativas de condições (OR) - basta uma ser positiva que o filtro dá match
-        for jAndFilters in jOrFilters:
-            # testa um grupo de condições (AND) - basta uma ser negativa que invalida o filtro
-            for jFilter in jAndFilters.get('And'):
-                filterAttrib = jFilter.get('Attribute')
-
-                value = jFilter['Value']
-                attribVal = jDoc.get(filterAttrib)
-                oper = jFilter.get('Operator')
-
-                if filterAttrib == 'all':
-                    # pesquisa o texto informado dentro do documento JSON
-                    txt = jDoc.getJson(flagPretty=False)
-                    if oper == "ct":
-                        flagFind = value.lower() in txt.lower()
-                    elif oper == "nct":
-                        flagFind = value.lower() not in txt.lower()
-                    else:
-                        raise Exception(f"Err: the perator {oper} may not be used to search this type of document!")
-
-                else:
-                    # pesquisa o valor num campo do documento
-                    if isinstance(value, dt.datetime) and not isinstance(attribVal, dt.datetime):
-                        # valor do filtro é 'datetime' mas valor do atributo é 'string'
-                        attribVal = str2datetime(attribVal)
-
-                    if isinstance(value, str):
-                        value = value.lower()
+        return compileFilter(jOrFilters)(jDoc.value())
 
-                        if isinstance(attribVal, str):
-                            attribVal = attribVal.lower()
-                        # endif --
-                    # endif --
-
-                    if oper == "eq":  # igual a
-                        if not value:
-                            flagFind = (attribVal is None)
-                        else:
-                            flagFind = (attribVal == value)
-                        # endif --
-
-                    elif oper == "dif":  # diferente
-                        if not value:
-                            flagFind = (attribVal is not None)
-                        else:
-                            flagFind = (attribVal != value)
-                        # endif --
-
-                    elif not value or not attribVal:
-                        flagFind = False
-
-                    else:
-                        match oper:
-                            case "lteq":  # menor que ou igual a
-                                flagFind = (attribVal <= value)
-
-                            case "gteq":  # maior que ou igual a
-                                flagFind = (attribVal >= value)
+    def _getListOfValues(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> list:
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
 
-                            case "lt":  # menor que
-                                flagFind = (attribVal < value)
+        if parallel:
+            # os workers retornam os valores preenchidos do atributo
+            lstValues = parallelScan(self._jdata, *self._filterPredicate(filters, jOrFilters, exprFilter), parallel, attribute=attribute)
+        else:
+            # com o cache de colunas (veja createColumnCache()), sem filtros a coluna do atributo é extraída uma vez e reutilizada até a
+            # lista ser alterada; com filtros, apenas a coluna que já existe
+            flagFilter = bool(filters or jOrFilters or exprFilter)
+            column = self._getColumn(attribute, flagBuild=not flagFilter)
+            if column is not None:
+                lstValues = column.filled(self._filterPositions(filters, jOrFilters, exprFilter) if flagFilter else None)
+            else:
+                # lê o atributo direto dos documentos, sem criar um jDocument para cada um
+                steps = compilePath(attribute)
+                lstDocs = self._jdata
+                lstValues = [val for val in (getPathDefault(lstDocs[i], steps) for i in self._filterPositions(filters, jOrFilters, exprFilter)) if val]
+            # endif --
+        # endif --
 
-                            case "gt":  # maior que
-                                flagFind = (attribVal > value)
+        if not isinstance(lstValues, list):
+            # coluna numérica (array)
+            return lstValues
 
-                            case "ct":  # contém
-                                flagFind = (str(value) in str(attribVal))
+        return [jDocument._wrapValue(val) for val in lstValues]
 
-                            case "nct":  # NÃO contém
-                                flagFind = (str(value) not in str(attribVal))
+    def _iterValues(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None):
+        # gera os valores preenchidos do atributo um a um, sem montar a lista (exceto na pesquisa paralela ou se a coluna já existe)
+        if parallel or self._getColumn(attribute, flagBuild=False) is not None:
+            yield from self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+            return
+        # endif --
 
-                            case "in":  # contido numa lista
-                                flagFind = attribVal in value
+        steps = compilePath(attribute)
+        for i in self._filterPositions(filters, jOrFilters, exprFilter):
+            val = getPathDefault(self._jdata[i], steps)
+            if val:
+                yield jDocument._wrapValue(val)
+        # endfor --
 
-                            case "nin":  # NÃO contido numa lista
-                                flagFind = attribVal not in value
+    def _sketchValues(self, sketch, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                      parallel: int | Executor = None):
+        # adiciona ao sketch os valores preenchidos do atributo, sem montar a lista; na pesquisa paralela cada worker retorna o sketch
+        # do seu trecho da lista, e os sketches são combinados
+        if parallel:
+            for partial in parallelScan(self._jdata, *self._filterPredicate(filters, jOrFilters, exprFilter), parallel, attribute=attribute, sketch=sketch):
+                sketch.merge(partial)
+        else:
+            sketch.update(self._iterValues(attribute, filters, jOrFilters, exprFilter))
+        # endif --
 
-                            case "RegExp":  # expressão regular
-                                flagFind = (re.search(value, attribVal, flags=re.IGNORECASE) is None) if isinstance(attribVal, str) else False
+        return sketch
 
-                            case _:
-                                raise Exception(f"Invalid operator '{oper}'")
-                        # endmatch --
-                    # endif --
-                # endif --
+    @staticmethod
+    def _wrapValue(val: any) -> any:
+        # como em get(), os objetos e as listas de objetos são retornados como jDocument
+        return jDocument(val) if isinstance(val, dict) or (isinstance(val, list) and isinstance(val[0], dict)) else val
 
-                if not flagFind:
-                    # basta uma condição ser negativa que invalida o AND filtro
-                    break
-                # endif --
-            # endfor --
+    def _filterPredicate(self, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> tuple:
+        # retorna o predicado (picklable) e os seus argumentos que testam os documentos com os filtros das funções de agregação
+        if filters:
+            return jDocument._findDocs_TestDoc, (self._planFindFilters([filters] if isinstance(filters, dict) else filters, False), False)
 
-            if flagFind:
-                # todas as condições são verdadeiras
-                if self._searhDocs_qty > 0:
-                    self._searhDocs_qty -= 1
-                # endif --
-                break
-            # endif --
-        # endfor --
+        if jOrFilters or exprFilter:
+            return jDocument._searchDocs_TestDoc, (self._planFilter(compileFilter(jOrFilters)) if jOrFilters else None,
+                                                   compileExpression(exprFilter) if exprFilter else None)
 
-        return flagFind
+        return None, ()
 
-    def _getListOfValues(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> list:
+    def _filterPositions(self, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None):
+        # retorna as posições dos documentos que passam nos filtros das funções de agregação
         if self._type != CONST_TYPE_ARRAY:
             raise Exception(CONST_ERR_ARRAY)
 
-        if filters:
-            jList = self.findDocs(filters)
-
-        elif jOrFilters or exprFilter:
-            jList = self.searchDocs(jOrFilters=jOrFilters, exprFilter=exprFilter)
-
-        else:
-            jList = jDocument(self._jdata)
-        # endif --
+        if parallel:
+            return parallelScan(self._jdata, *self._filterPredicate(filters, jOrFilters, exprFilter), parallel)
 
-        if not jList:
-            return []
-        # endif --
+        if filters:
+            return self._iterFindPositions(filters)
 
-        lstValues = [jDoc.get(attribute) for jDoc in jList if jDoc[attribute]]
+        if jOrFilters or exprFilter:
+            return self._iterSearchPositions(jOrFilters, exprFilter)
 
-        return lstValues
+        return range(len(self._jdata))
 
-    def count(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def count(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the number of documents in the list whose 'attrib' attribute is filled.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1358,14 +2247,19 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the number of documents in the list whose 'attrib' attribute is filled.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
+        if attribute in self._sortedIndexes and not (filters or jOrFilters or exprFilter):
+            # o índice contém apenas os valores preenchidos
+            return self._getSortedIndex(attribute).count()
+
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
         return len(lstValues)
 
-    def sum(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def sum(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the sum of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1383,14 +2277,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the sum of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return sum(lstValues) if lstValues else None
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('sum',))['sum']
 
-    def min(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def min(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the minimum of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1408,14 +2303,21 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the minimum of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return min(lstValues) if lstValues else None
+        if attribute in self._sortedIndexes and not (filters or jOrFilters or exprFilter):
+            # o mínimo é o primeiro valor do índice
+            bounds = self._getSortedIndex(attribute).bounds()
+            if bounds:
+                return bounds[0]
 
-    def max(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('min',))['min']
+
+    def max(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the maximum of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1433,14 +2335,21 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the maximum of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return max(lstValues) if lstValues else None
+        if attribute in self._sortedIndexes and not (filters or jOrFilters or exprFilter):
+            # o máximo é o último valor do índice
+            bounds = self._getSortedIndex(attribute).bounds()
+            if bounds:
+                return bounds[1]
+
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('max',))['max']
 
-    def mean(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def mean(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the mean of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1458,14 +2367,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the mean of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return statistics.mean(lstValues) if lstValues else None
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('mean',))['mean']
 
-    def mode(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def mode(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the mode of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1483,14 +2393,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the mode of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
         return statistics.mode(lstValues) if lstValues else None
 
-    def median(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def median(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the median of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1508,14 +2419,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the median of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return statistics.median(lstValues) if lstValues else None
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('median',))['median']
 
-    def median_low(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def median_low(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the median low of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1533,14 +2445,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the median low of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
         return statistics.median_low(lstValues) if lstValues else None
 
-    def median_high(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def median_high(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the median high of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1558,14 +2471,15 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the median high of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
         return statistics.median_high(lstValues) if lstValues else None
 
-    def median_grouped(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> float | None:
+    def median_grouped(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
         """
         Returns the grouped median of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1583,18 +2497,108 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the grouped median of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
         return statistics.median_grouped(lstValues) if lstValues else None
 
-    # def quantile(self, attrib: str, quantile: float, method: str = 'linear', lstFilter: list = None, jFilter: jDocument = None, exprFilter: str = None) -> float | None:
-    #     lstValues = self._getListOfValues(attrib, lstFilter, jFilter, exprFilter)
-    #     return numpy.quantile(lstValues, quantile, method=method) if lstValues else None
+    def std(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> float | None:
+        """
+        Returns the sample standard deviation of the values of a specific attribute of the documents in the list.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            # standard deviation of the price of the fruits
+            jProducts.std('features.price', filters={'type': 'fruit'})
+
+        Args:
+            attribute: name of the attribute.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+
+        Returns:
+             float: the standard deviation of the values, "None" if there are less than 2 values.
+        """
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return aggregateValues(lstValues, ('std',))['std']
+
+    def quantile(self, attribute: str, q: float | list, method: str = 'linear', filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                 parallel: int | Executor = None, capacity: int = None) -> float | list | None:
+        """
+        Returns the quantile (between 0 and 1) of the values of a specific attribute of the documents in the list, or the list of
+        quantiles when "q" is a list. The methods are the same of numpy.quantile(), NumPy is used when it is installed.
+        When "capacity" is informed the quantile is approximate (KLL sketch, see jsketch): the values are read one by one and the memory
+        is about 3 * capacity values, whatever the number of values. The rank of the returned value differs from "q" by about
+        2 / capacity at most (1% with capacity 200); the method is not used, the returned value is always one of the values.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            # 90th percentile of the price
+            jProducts.quantile('features.price', 0.9)
+
+            # quartiles of the price of the fruits
+            jProducts.quantile('features.price', [0.25, 0.5, 0.75], filters={'type': 'fruit'})
+
+            # approximate median of millions of orders
+            jOrders.quantile('total', 0.5, capacity=200)
+
+        Args:
+            attribute: name of the attribute.
+            q: quantile or list of quantiles.
+            method: 'linear' (default), 'lower', 'higher', 'nearest' or 'midpoint'.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+            capacity: size of the compactors of the approximate quantile, when "None" the quantile is exact.
+
+        Returns:
+             float | list: the quantile or the list of quantiles of the values.
+        """
+        if capacity is not None:
+            if self._type != CONST_TYPE_ARRAY:
+                raise Exception(CONST_ERR_ARRAY)
+
+            return self._sketchValues(KLLSketch(capacity), attribute, filters, jOrFilters, exprFilter, parallel).quantile(q)
+        # endif --
+
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return jnumeric.quantile(lstValues, q, method) if lstValues else None
+
+    def histogram(self, attribute: str, bins: int = 10, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                  parallel: int | Executor = None) -> dict | None:
+        """
+        Returns the histogram of the values of a specific attribute of the documents in the list: the values are counted in "bins" intervals
+        of the same width between the minimum and the maximum, as numpy.histogram(). NumPy is used when it is installed.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            jProducts.histogram('features.rating', bins=5)
+            # {'counts': [7, 9, 6, 15, 9], 'edges': [1.0, 1.8, 2.6, 3.4, 4.2, 5.0]}
+
+        Args:
+            attribute: name of the attribute.
+            bins: number of intervals.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+
+        Returns:
+             dict: 'counts' (number of values of each interval) and 'edges' (limits of the intervals).
+        """
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return jnumeric.histogram(lstValues, bins) if lstValues else None
 
-    def ocorrences(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None) -> dict | None:
+    def ocorrences(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None, parallel: int | Executor = None) -> dict | None:
         """
         Returns the number of ocurrencies of the values of a specific attribute of the documents in the list.
         Only documents that match the rules entered in one of the filters will be considered.
@@ -1612,12 +2616,230 @@ class jDocument(Sequence):
             filters: dictionary or dictionary list with attribute and value to filter the documents to be removed from the list.
             jOrFilters: json with the search criteria.
             exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
 
         Returns:
              float: the number of ocurrencies of the values of a specific attribute of the documents in the list.
         """
-        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter)
-        return dict((item, lstValues.count(item)) for item in set(lstValues)) if lstValues else None
+        lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+        return AGGREGATE_FUNCTIONS['ocorrences'](lstValues) if lstValues else None
+
+    def topOccurrences(self, attribute: str, k: int = 10, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                       parallel: int | Executor = None, capacity: int = None) -> dict | None:
+        """
+        Returns the "k" most frequent values of a specific attribute of the documents in the list, with their number of occurrences,
+        in descending order of occurrences (the ties in the order of the list).
+        By default the values are counted exactly, in linear time, and the k largest counts are selected with a heap.
+        When "capacity" is informed the counts are approximate (Space-Saving, see jsketch): the values are read one by one and at most
+        "capacity" values are counted, so the memory does not depend on the number of distinct values. Every value with more than
+        N / capacity occurrences (N = number of values) is returned, and a count exceeds the true number of occurrences by at most N / capacity.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            jProducts.topOccurrences('type', 3)
+            # {'fruit': 21, 'vegetable': 13, 'dairy': 8}
+
+            # approximate counts of an attribute with millions of distinct values
+            jOrders.topOccurrences('customer.id', 20, capacity=2000)
+
+        Args:
+            attribute: name of the attribute.
+            k: number of values.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+            capacity: number of counters of the approximate counting (at least "k"), when "None" the counts are exact.
+
+        Returns:
+             dict: the values and their number of occurrences, "None" if there are no values.
+        """
+        if capacity is None:
+            lstValues = self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)
+            return dict(nlargest(k, Counter(lstValues).items(), key=itemgetter(1))) if lstValues else None
+        # endif --
+
+        if capacity < k:
+            raise Exception(f"Invalid capacity {capacity}, it must be at least k ({k})")
+
+        summary = SpaceSaving(capacity)
+        summary.update(self._iterValues(attribute, filters, jOrFilters, exprFilter, parallel))
+
+        return {val: count for val, count, _ in summary.top(k)} or None
+
+    def countDistinct(self, attribute: str, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                      parallel: int | Executor = None, precision: int = None) -> int:
+        """
+        Returns the number of distinct values of a specific attribute of the documents in the list (only the filled values).
+        By default the values are counted exactly, with a set of the values.
+        When "precision" is informed the count is approximate (HyperLogLog, see jsketch): the values are read one by one and the memory
+        is 2 ** precision bytes, whatever the number of distinct values. The standard error is 1.04 / sqrt(2 ** precision)
+        (0.81% with precision 14), the error of most counts is less than twice that.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            jProducts.countDistinct('type')
+            # 5
+
+            # approximate number of customers of millions of orders
+            jOrders.countDistinct('customer.id', precision=14)
+
+        Args:
+            attribute: name of the attribute.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to scan the list in parallel, see findDocs().
+            precision: number of bits of the approximate count (4 to 18), when "None" the count is exact.
+
+        Returns:
+             int: the number of distinct values.
+        """
+        if precision is None:
+            return len(set(self._getListOfValues(attribute, filters, jOrFilters, exprFilter, parallel)))
+
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        return self._sketchValues(HyperLogLog(precision), attribute, filters, jOrFilters, exprFilter, parallel).count()
+
+    def aggregate(self, attribute: str | list, functions: list = None, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                  parallel: int | Executor = None) -> dict:
+        """
+        Computes several aggregate functions of one or more attributes of the documents in the list with a single pass over the list:
+        the documents are filtered once and the value of each attribute is read once per document.
+        The results are the same of the individual functions (count(), sum(), min(), max(), mean(), mode(), median(), median_low(),
+        median_high(), median_grouped() and ocorrences()): only the filled values are considered and, except for 'count', an attribute
+        without values returns None.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            jProducts.aggregate('features.price', ['count', 'sum', 'min', 'max', 'mean', 'median'], filters={'type': 'fruit'})
+            # {'count': 21, 'sum': 444.02, 'min': 13.02, 'max': 29.45, 'mean': 21.14, 'median': 21.01}
+
+            jProducts.aggregate(['features.price', 'features.rating'], ['mean', 'max'])
+            # {'features.price': {'mean': 20.80, 'max': 29.97}, 'features.rating': {'mean': 3.22, 'max': 5}}
+
+        Args:
+            attribute (str | list): name of the attribute or list of names.
+            functions: names of the aggregate functions (see AGGREGATE_FUNCTIONS), when "None" they are count, sum, min, max, mean and median.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to filter the list in parallel, see findDocs().
+
+        Returns:
+            dict: the result of each function, or a dict of results by attribute when a list of attributes is informed.
+        """
+        functions = CONST_AGGREGATE_DEFAULT if functions is None else functions
+        checkFunctions(functions)
+
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        lstAttributes = [attribute] if isinstance(attribute, str) else attribute
+        flagFilter = bool(filters or jOrFilters or exprFilter)
+
+        # com o cache de colunas (veja createColumnCache()), sem filtros as colunas dos atributos são extraídas uma vez e reutilizadas;
+        # com filtros, apenas as que já existem
+        lstColumns = [self._getColumn(at, flagBuild=not flagFilter) for at in lstAttributes]
+        positions = list(self._filterPositions(filters, jOrFilters, exprFilter, parallel)) if flagFilter else None
+        # como em _getListOfValues(), os objetos e as listas de objetos são convertidos em jDocument (a coluna numérica é um array)
+        wrap = jDocument._wrapValue
+        lstValues = [[] if column is None else column.filled(positions) for column in lstColumns]
+        lstValues = [[wrap(val) for val in values] if isinstance(values, list) else values for values in lstValues]
+
+        # uma única passada pela lista: cada atributo sem coluna é lido uma vez por documento
+        lstRead = [(compilePath(at), values) for at, column, values in zip(lstAttributes, lstColumns, lstValues) if column is None]
+        for i in ((range(len(self._jdata)) if positions is None else positions) if lstRead else ()):
+            obj = self._jdata[i]
+            for steps, values in lstRead:
+                val = getPathDefault(obj, steps)
+                if val:
+                    values.append(wrap(val))
+            # endfor --
+        # endfor --
+
+        result = {
+            at: aggregateValues(values, functions)
+            for at, values in zip(lstAttributes, lstValues)
+        }
+
+        return result[attribute] if isinstance(attribute, str) else result
+
+    def groupBy(self, keys: str | dict | list, aggregations: dict = None, filters: list = None, jOrFilters: jDocument = None, exprFilter: str = None,
+                parallel: int | Executor = None) -> jDocument:
+        """
+        Groups the documents in the list by the values of one or more attributes (keys) and computes aggregate functions of each group,
+        with a single pass over the list. The dot notation can be used in the keys and in the aggregated attributes.
+        A date key can be grouped by period (day, week, month or year, see helpers.getDateGroup()), its value can be a datetime, a date or a string.
+        Each group is a document with the keys, the number of documents of the group ('count') and, for each aggregated attribute,
+        the result of its functions. count, sum, min, max and mean (sum / count) are computed value by value, so the memory depends on the
+        number of groups and not on the number of documents; the other functions (median, mode, ...) keep the values of the group.
+        Only documents that match the rules entered in one of the filters will be considered.
+        If no filter is specified then all documents will be considered.
+
+        Examples:
+            jProducts.groupBy('type', {'features.price': ['sum', 'mean'], 'features.rating': 'max'})
+            # [{'type': 'dairy', 'count': 8, 'features': {'price': {'sum': 186.33, 'mean': 23.29}, 'rating': {'max': 5}}}, ...]
+
+            jSales.groupBy(['store.city', {'date': 'month'}], {'total': 'sum'}, filters={'status': 'paid'})
+            # [{'store': {'city': 'Sao Paulo'}, 'date': '2022-01', 'count': 120, 'total': {'sum': 5320.5}}, ...]
+
+        Args:
+            keys (str | dict | list): name of the attribute, or dictionary with the name of a date attribute and the period (day, week, month, year),
+                                      or a list of names and/or dictionaries.
+            aggregations: dictionary with the name of the attribute and the aggregate function or list of functions (see AGGREGATE_FUNCTIONS),
+                          when "None" only the number of documents of each group is computed.
+            filters: dictionary or dictionary list with attribute and value to filter the documents.
+            jOrFilters: json with the search criteria.
+            exprFilter: Python expression with search criteria
+            parallel: number of worker processes (or an Executor) to filter the list in parallel, see findDocs().
+
+        Returns:
+            jDocument: list of groups, in the order in which they were found in the list.
+        """
+        if self._type != CONST_TYPE_ARRAY:
+            raise Exception(CONST_ERR_ARRAY)
+
+        # chaves: (nome, caminho compilado, período das datas ou None); agregações: (nome, caminho compilado, funções)
+        lstKeys = parseGroupKeys(keys)
+        lstAggregations = parseAggregations(aggregations, lstKeys)
+
+        groups = {}
+        for i in self._filterPositions(filters, jOrFilters, exprFilter, parallel):
+            obj = self._jdata[i]
+
+            hashKey, keyValues = groupKey(obj, lstKeys)
+            group = groups.get(hashKey)
+            if group is None:
+                group = groups[hashKey] = [copyKeyValues(keyValues), 0, [Accumulator(functions) for _, _, functions in lstAggregations]]
+
+            group[1] += 1
+            for (_, steps, _), acc in zip(lstAggregations, group[2]):
+                val = getPathDefault(obj, steps)
+                if val:
+                    acc.add(val)
+            # endfor --
+        # endfor --
+
+        lstRows = []
+        for keyValues, count, accumulators in groups.values():
+            row = {}
+            for (at, steps, _), val in zip(lstKeys, keyValues):
+                setPathValue(row, rowPath(at, steps), val)
+
+            row['count'] = count
+            for (at, steps, _), acc in zip(lstAggregations, accumulators):
+                setPathValue(row, rowPath(at, steps), acc.result())
+
+            lstRows.append(row)
+        # endfor --
+
+        return jDocument(lstRows)
 
 
 class DotDict(dict):
@@ -0,0 +1,601 @@
+"""
+jfilter
+
+Compiles the search criteria of jDocument.searchDocs() (jOrFilters, an OR of AND groups of conditions) into a predicate
+that is applied to the raw documents (dict), without creating a jDocument per document.
+The values of the conditions are prepared only once: strings are lowered, regular expressions are compiled and the
+attributes are compiled into paths (see jpath).
+The conditions are tested in the order chosen by the cost model of jplan: the cheapest and most selective conditions of
+each AND group first, and the groups most likely to match first.
+
+The Python expressions of searchDocs() (exprFilter) are also compiled once: the expression is parsed with "ast", only a safe
+subset of Python is accepted and the references jDoc['a.b'] and jDoc.get('a.b') are replaced by direct lookups of compiled paths.
+
+Classes:
+    jFilter
+    jExpression
+
+Functions:
+    compileFilter(jOrFilters: jDocument | list | jFilter) -> jFilter
+    compileExpression(exprFilter: str | jExpression) -> jExpression
+"""
+from __future__ import annotations
+
+import ast
+import re
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime
+
+from jDocument import jsjson as js
+from functools import lru_cache
+
+from jDocument.helpers import str2datetime
+from jDocument.jpath import compilePath, getPathDefault
+from jDocument.jplan import conditionCost, defaultSelectivity, planAnd, planOr
+
+CONST_FILTER_ALL = 'all'
+CONST_FILTER_CACHE_SIZE = 256
+CONST_FILTER_PLANS_SIZE = 16  # variantes planejadas guardadas por filtro compilado
+CONST_FILTER_PLAN_DIGITS = 2  # casas decimais das seletividades que identificam uma variante planejada
+CONST_EXPR_DOC = 'jDoc'
+CONST_EXPR_GET = '_jget'
+CONST_EXPR_MUL = '_jmul'
+CONST_EXPR_MOD = '_jmod'
+CONST_EXPR_REPLACE = '_jreplace'
+CONST_EXPR_MAX_LENGTH = 10000  # tamanho máximo de um string ou lista criada pelas expressões ('*', str(), replace(), sum())
+
+# funções e atributos que podem ser usados nas expressões de searchDocs()
+EXPR_FUNCTIONS = {
+    'abs': abs, 'bool': bool, 'float': float, 'int': int, 'len': len, 'max': max, 'min': min, 'round': round,
+    'sorted': sorted, 'str': str, 'sum': sum, 'datetime': datetime, 'str2datetime': str2datetime,
+}
+EXPR_ATTRIBUTES = {
+    'lower', 'upper', 'strip', 'lstrip', 'rstrip', 'startswith', 'endswith', 'split', 'replace', 'count', 'find',
+    'isdigit', 'isnumeric', 'isalpha', 'get', 'keys', 'values', 'items', 'year', 'month', 'day', 'hour', 'minute', 'date',
+}
+EXPR_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Is, ast.IsNot,
+    ast.IfExp, ast.Constant, ast.List, ast.Tuple, ast.Set, ast.Dict, ast.Subscript, ast.Slice, ast.Name, ast.Load,
+    ast.Attribute, ast.Call, ast.keyword,
+)
+CONST_FILTER_OPERATORS = ('eq', 'dif', 'lt', 'lteq', 'gt', 'gteq', 'ct', 'nct', 'in', 'nin', 'RegExp')
+
+_cache = OrderedDict()  # cache dos filtros compilados, pela representação do filtro
+_cacheLock = threading.Lock()
+
+
+class jFilter:
+    """
+    Search criteria of searchDocs() compiled into a predicate: jFilter(doc) returns "True" if the raw document matches.
+    A jFilter can be passed to searchDocs()/searchOneDoc() and to the aggregate functions in place of jOrFilters, and
+    reused across many arrays. It is pickled through its source criteria.
+    The conditions are tested in the order of the plan (see jplan and explain()), the selectivities measured on a list
+    (see jDocument.explain()) can be informed to replace the default estimates of the operators. A document whose values can
+    not be compared with the plan's order of the conditions is tested again in the order they were written, so the errors
+    (e.g. a string compared with a number) are the same of a search without the plan.
+    """
+
+    def __init__(self, jOrFilters: list, selectivity: dict = None):
+        """
+        Args:
+            jOrFilters: list of AND groups with the search criteria, see jDocument.searchDocs().
+            selectivity: estimated fraction of documents that pass each condition, by (group, condition) position.
+        """
+        # cópia dos critérios: o filtro compilado (e guardado em cache) não muda se a lista informada for alterada depois
+        self.source = deepcopy(_rawValue(jOrFilters))
+        self.selectivity = selectivity or {}
+        self._plans = {}  # variantes planejadas, pelas seletividades arredondadas (compartilhadas pelas variantes)
+
+        # lista de grupos AND, cada condição é (atributo, operador, valor, predicado)
+        self.conditions = []
+        for jAndFilters in self.source:
+            group = []
+            for cond in jAndFilters.get('And'):
+                attribute, oper, value = cond.get('Attribute'), cond.get('Operator'), cond.get('Value')
+                group.append((attribute, oper, value, _compileTest(attribute, oper, value)))
+            # endfor --
+            self.conditions.append(group)
+        # endfor --
+
+        # plano: grupos e condições na ordem em que serão testados, cada item é (custo, seletividade, posição)
+        self.plan = planOr([
+            planAnd([(conditionCost(attribute, oper, value), self.selectivity.get((g, c), defaultSelectivity(oper, value)), (g, c))
+                     for c, (attribute, oper, value, _) in enumerate(group)])
+            for g, group in enumerate(self.conditions)
+        ])
+
+        self._test = _compileGroups([[self.conditions[g][c][3] for _, _, (g, c) in conds] for _, _, conds in self.plan])
+        # predicado na ordem em que os critérios foram escritos, apenas quando o plano mudou a ordem
+        order = [[(g, c) for _, _, (g, c) in conds] for _, _, conds in self.plan]
+        written = [[(g, c) for c in range(len(group))] for g, group in enumerate(self.conditions)]
+        self._written = None if order == written else _compileGroups([[cond[3] for cond in group] for group in self.conditions])
+
+    def __call__(self, doc: dict) -> bool:
+        try:
+            return self._test(doc)
+        except Exception:
+            if self._written is None:
+                raise
+
+            # o plano testa as condições numa ordem diferente da escrita: o documento é testado de novo na ordem escrita, que dá
+            # o mesmo resultado ou o mesmo erro da pesquisa sem o plano
+            return self._written(doc)
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{len(self.conditions)} OR groups> : {self.source}"
+
+    def __reduce__(self):
+        if self.selectivity:
+            return jFilter, (self.source, self.selectivity)
+
+        return compileFilter, (self.source,)
+
+    def planned(self, selectivity: dict) -> jFilter:
+        """
+        Returns the same filter, with its conditions ordered according to the informed selectivities.
+        The selectivities are rounded to CONST_FILTER_PLAN_DIGITS decimal places and the planned variants are cached by them,
+        so the searches that repeat a filter reuse its compiled variant.
+
+        Args:
+            selectivity: estimated fraction of documents that pass each condition, by (group, condition) position.
+        """
+        selectivity = {position: round(estimate, CONST_FILTER_PLAN_DIGITS) for position, estimate in selectivity.items()}
+        if selectivity == self.selectivity:
+            return self
+
+        key = tuple(sorted(selectivity.items()))
+        compiled = self._plans.get(key)
+        if compiled is None:
+            compiled = jFilter(self.source, selectivity)
+            compiled._plans = self._plans
+            if len(self._plans) >= CONST_FILTER_PLANS_SIZE:
+                self._plans.clear()
+            self._plans[key] = compiled
+        # endif --
+
+        return compiled
+
+    def explain(self) -> list:
+        """
+        Returns the plan of the filter: the AND groups, in the order they are tested, with their conditions in the order they are tested.
+
+        Examples:
+            compileFilter(jOrFilters).explain()
+            # [{'cost': 1.8, 'selectivity': 0.03, 'conditions': [{'attribute': 'type', 'operator': 'eq', ...}, ...]}]
+
+        Returns:
+            list: list of groups, each one a dict with the expected cost, the estimated selectivity and the conditions.
+        """
+        lstGroups = []
+        for cost, selectivity, conds in self.plan:
+            lstConds = []
+            for condCost, condSelectivity, (g, c) in conds:
+                attribute, oper, value, _ = self.conditions[g][c]
+                lstConds.append({'attribute': attribute, 'operator': oper, 'value': value, 'cost': round(condCost, 3),
+                                 'selectivity': round(condSelectivity, 3)})
+            # endfor --
+
+            lstGroups.append({'cost': round(cost, 3), 'selectivity': round(selectivity, 3), 'conditions': lstConds})
+        # endfor --
+
+        return lstGroups
+
+
+def _rawValue(obj: any) -> any:
+    # o filtro pode ser informado como jDocument ou como dict/list
+    return getattr(obj, 'jData', obj)
+
+
+def _compileGroups(groups: list):
+    # monta o predicado do OR de grupos AND
+    if not groups:
+        return lambda doc: True
+
+    if len(groups) == 1:
+        group = groups[0]
+        if len(group) == 1:
+            return group[0]
+
+        def testAnd(doc: dict) -> bool:
+            for cond in group:
+                if not cond(doc):
+                    # basta uma condição ser negativa que invalida o AND filtro
+                    return False
+            return True
+
+        return testAnd
+
+    def testOr(doc: dict) -> bool:
+        # basta um grupo ser positivo que o filtro dá match
+        for conds in groups:
+            for cond in conds:
+                if not cond(doc):
+                    break
+            else:
+                return True
+        return False
+
+    return testOr
+
+
+def _compileAccessor(attribute: str, value: any):
+    # retorna a função que lê o valor do atributo do documento, já convertido para ser comparado ao valor do filtro
+    steps = compilePath(attribute)
+
+    if isinstance(value, datetime):
+        # valor do filtro é 'datetime', o valor do atributo pode ser 'string'
+        def getDatetime(doc: dict) -> any:
+            val = getPathDefault(doc, steps)
+            return val if isinstance(val, datetime) else str2datetime(val)
+
+        return getDatetime
+
+    if isinstance(value, str):
+        def getLower(doc: dict) -> any:
+            val = getPathDefault(doc, steps)
+            return val.lower() if isinstance(val, str) else val
+
+        return getLower
+
+    return lambda doc: getPathDefault(doc, steps)
+
+
+def _compileTest(attribute: str, oper: str, value: any):
+    if attribute == CONST_FILTER_ALL:
+        # pesquisa o texto informado dentro do documento JSON
+        if oper not in ('ct', 'nct'):
+            raise Exception(f"Err: the perator {oper} may not be used to search this type of document!")
+
+        txt = value.lower()
+        if oper == 'ct':
+            return lambda doc: txt in js.dumps(doc).lower()
+
+        return lambda doc: txt not in js.dumps(doc).lower()
+    # endif --
+
+    if oper not in CONST_FILTER_OPERATORS:
+        raise Exception(f"Invalid operator '{oper}'")
+
+    if oper in ('in', 'nin') and value and not isinstance(value, (list, tuple, set, frozenset, dict, str)):
+        raise Exception(f"Invalid value of the operator '{oper}', it must be a list")
+
+    getValue = _compileAccessor(attribute, value)
+    if isinstance(value, str):
+        value = value.lower()
+
+    if oper == 'eq':  # igual a
+        if not value:
+            return lambda doc: getValue(doc) is None
+
+        return lambda doc: getValue(doc) == value
+
+    if oper == 'dif':  # diferente
+        if not value:
+            return lambda doc: getValue(doc) is not None
+
+        return lambda doc: getValue(doc) != value
+
+    if not value:
+        return lambda doc: False
+
+    match oper:
+        case 'lteq':  # menor que ou igual a
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val <= value
+
+        case 'gteq':  # maior que ou igual a
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val >= value
+
+        case 'lt':  # menor que
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val < value
+
+        case 'gt':  # maior que
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val > value
+
+        case 'ct':  # contém
+            strValue = str(value)
+
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and strValue in str(val)
+
+        case 'nct':  # NÃO contém
+            strValue = str(value)
+
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and strValue not in str(val)
+
+        case 'in':  # contido numa lista
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val in value
+
+        case 'nin':  # NÃO contido numa lista
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                return bool(val) and val not in value
+
+        case _:  # expressão regular
+            regex = re.compile(value, flags=re.IGNORECASE) if isinstance(value, str) else None
+
+            def test(doc: dict) -> bool:
+                val = getValue(doc)
+                if not val or not isinstance(val, str):
+                    return False
+
+                return (regex.search(val) if regex else re.search(value, val, flags=re.IGNORECASE)) is None
+    # endmatch --
+
+    return test
+
+
+def compileFilter(jOrFilters: jDocument | list | jFilter) -> jFilter:
+    """
+    Compiles the search criteria of searchDocs() into a jFilter, the compiled filters are cached by the representation of the criteria.
+
+    Examples:
+        jFilterPrice = compileFilter([{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 28}]}])
+        jProducts.searchDocs(jOrFilters=jFilterPrice)
+        jOtherProducts.count('title', jOrFilters=jFilterPrice)
+        jFilterPrice({'features': {'price': 30}})  # True
+
+    Args:
+        jOrFilters: json (jDocument or list) with the search criteria, see jDocument.searchDocs().
+
+    Returns:
+        jFilter: the compiled filter.
+    """
+    if isinstance(jOrFilters, jFilter):
+        return jOrFilters
+
+    jOrFilters = _rawValue(jOrFilters)
+    key = repr(jOrFilters)
+
+    with _cacheLock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+    # endwith --
+
+    compiled = jFilter(jOrFilters)
+
+    with _cacheLock:
+        _cache[key] = compiled
+        if len(_cache) > CONST_FILTER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    # endwith --
+
+    return compiled
+
+
+class jExpression:
+    """
+    Python expression of searchDocs() compiled into a predicate: jExpression(doc) returns "True" if the raw document matches.
+    The expression references the attributes of the document through the "jDoc" variable (jDoc['name'], jDoc['address.street']),
+    these references are replaced by the lookup of compiled paths over the raw document, a missing attribute is None.
+    jDoc.get('a.b') and jDoc.get('a.b', default) are also path lookups, as jDocument.get() (the name of the attribute must be a string).
+    Only a safe subset of Python is accepted: literals, arithmetic (except **), comparisons, boolean operators, the functions
+    in EXPR_FUNCTIONS and the attributes/methods in EXPR_ATTRIBUTES; anything else raises an exception when compiling.
+    The strings and lists created by the expression ('*', str() of a list or dict, replace(), sum() of lists) can have at most
+    CONST_EXPR_MAX_LENGTH items, a larger one raises an exception before it is created; '%' can not format strings.
+    """
+
+    def __init__(self, exprFilter: str):
+        self.source = exprFilter
+
+        tree = ast.parse(exprFilter.strip(), mode='eval')
+        paths = []
+        tree = ast.fix_missing_locations(_ExprTransformer(paths).visit(tree))
+        _validateExpression(tree, {CONST_EXPR_DOC, *_EXPR_OPERATORS, *EXPR_FUNCTIONS, *(f"_p{i}" for i in range(len(paths)))})
+
+        self._code = compile(tree, '<exprFilter>', 'eval')
+        self._globals = {'__builtins__': {}, **EXPR_FUNCTIONS, **_EXPR_BOUNDED, **_EXPR_OPERATORS}
+        self._globals.update({f"_p{i}": steps for i, steps in enumerate(paths)})
+
+    def __call__(self, doc: dict) -> bool:
+        return bool(eval(self._code, self._globals, {CONST_EXPR_DOC: doc}))
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {self.source}"
+
+    def __reduce__(self):
+        return compileExpression, (self.source,)
+
+
+def _checkLength(length: int):
+    if length > CONST_EXPR_MAX_LENGTH:
+        raise Exception(f"Err: the expression creates a sequence beyond {CONST_EXPR_MAX_LENGTH} items!")
+
+
+def _multiply(a: any, b: any) -> any:
+    # '*' das expressões: a repetição de strings e listas é limitada, para que uma expressão não aloque memória sem limite
+    for seq, times in ((a, b), (b, a)):
+        if isinstance(seq, (str, bytes, list, tuple)) and isinstance(times, int):
+            _checkLength(len(seq) * times)
+    # endfor --
+
+    return a * b
+
+
+def _modulo(a: any, b: any) -> any:
+    # '%' das expressões: a formatação de strings ('%9999999s') criaria um string de qualquer tamanho
+    if isinstance(a, (str, bytes)):
+        raise Exception("Err: the expression can not format strings with '%'!")
+
+    return a % b
+
+
+def _textLength(val: any) -> int:
+    # tamanho aproximado do texto de str(val), os contêineres são percorridos até passarem do limite
+    length = 0
+    stack = [val]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, (str, bytes)):
+            length += len(val)
+        elif isinstance(val, (list, tuple, set, frozenset)):
+            length += len(val)
+            _checkLength(length)
+            stack.extend(val)
+        elif isinstance(val, dict):
+            length += 2 * len(val)
+            _checkLength(length)
+            stack.extend(val.keys())
+            stack.extend(val.values())
+        else:
+            length += 1
+        # endif --
+
+        _checkLength(length)
+    # endwhile --
+
+    return length
+
+
+def _str(*args, **kwargs) -> str:
+    # str() das expressões: o texto de uma lista ou dict é limitado, um string (ou número, data) não cresce
+    if args and isinstance(args[0], (list, tuple, set, frozenset, dict)):
+        _textLength(args[0])
+
+    return str(*args, **kwargs)
+
+
+def _sum(values: any, start: any = 0) -> any:
+    # sum() das expressões: a concatenação de listas (sum(listas, [])) é limitada
+    if isinstance(start, (list, tuple)):
+        _checkLength(len(start) + sum(len(val) for val in values if isinstance(val, (list, tuple))))
+
+    return sum(values, start)
+
+
+def _replace(obj: any, *args, **kwargs) -> any:
+    # obj.replace() das expressões: o string resultante não pode crescer além do limite (datas também têm replace())
+    if isinstance(obj, str) and len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        old, new = args[0], args[1]
+        count = obj.count(old) if old else len(obj) + 1
+        if len(args) > 2 and isinstance(args[2], int) and args[2] >= 0:
+            count = min(count, args[2])
+
+        length = len(obj) + count * (len(new) - len(old))
+        if length > len(obj):
+            _checkLength(length)
+    # endif --
+
+    return obj.replace(*args, **kwargs)
+
+
+# funções que trocam as de EXPR_FUNCTIONS e operadores das expressões, com o tamanho do resultado limitado
+_EXPR_BOUNDED = {'str': _str, 'sum': _sum}
+_EXPR_OPERATORS = {CONST_EXPR_GET: getPathDefault, CONST_EXPR_MUL: _multiply, CONST_EXPR_MOD: _modulo, CONST_EXPR_REPLACE: _replace}
+
+
+class _ExprTransformer(ast.NodeTransformer):
+    # troca jDoc['a']['b'], jDoc['a.b'] e jDoc.get('a.b') por _jget(jDoc, _pN), onde _pN é o caminho compilado de 'a.b', a * b por _jmul(a, b),
+    # a % b por _jmod(a, b) e x.replace(...) por _jreplace(x, ...)
+    def __init__(self, paths: list):
+        self.paths = paths
+
+    def _lookup(self, attribute: str, args: list) -> ast.Call:
+        self.paths.append(compilePath(attribute))
+        return ast.Call(
+            func=ast.Name(id=CONST_EXPR_GET, ctx=ast.Load()),
+            args=[ast.Name(id=CONST_EXPR_DOC, ctx=ast.Load()), ast.Name(id=f"_p{len(self.paths) - 1}", ctx=ast.Load()), *args],
+            keywords=[],
+        )
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        node = self.generic_visit(node)
+        if isinstance(node.op, ast.Mult):
+            name = CONST_EXPR_MUL
+        elif isinstance(node.op, ast.Mod):
+            name = CONST_EXPR_MOD
+        else:
+            return node
+
+        return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == 'replace':
+            node = self.generic_visit(node)
+            return ast.Call(func=ast.Name(id=CONST_EXPR_REPLACE, ctx=ast.Load()), args=[node.func.value, *node.args], keywords=node.keywords)
+
+        if not (isinstance(func, ast.Attribute) and func.attr == 'get' and isinstance(func.value, ast.Name) and func.value.id == CONST_EXPR_DOC):
+            return self.generic_visit(node)
+
+        # jDoc.get(atributo[, default]), o atributo precisa ser conhecido ao compilar
+        if node.keywords or not 1 <= len(node.args) <= 2 or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+            raise Exception("Invalid expression: jDoc.get() needs the name of the attribute (a string) and, optionally, the default value")
+
+        return self._lookup(node.args[0].value, [self.visit(arg) for arg in node.args[1:]])
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        keys = []
+        sub = node
+        while isinstance(sub, ast.Subscript) and isinstance(sub.slice, ast.Constant) and isinstance(sub.slice.value, (str, int)) \
+                and not isinstance(sub.slice.value, bool):
+            keys.insert(0, sub.slice.value)
+            sub = sub.value
+        # endwhile --
+
+        if not (isinstance(sub, ast.Name) and sub.id == CONST_EXPR_DOC and keys and isinstance(keys[0], str)):
+            return self.generic_visit(node)
+
+        attribute = keys[0]
+        for key in keys[1:]:
+            attribute += f"[{key}]" if isinstance(key, int) else f".{key}"
+
+        return self._lookup(attribute, [])
+
+
+def _validateExpression(tree: ast.AST, names: set):
+    # recusa os nós que não fazem parte do subconjunto seguro de Python
+    for node in ast.walk(tree):
+        if not isinstance(node, EXPR_NODES):
+            raise Exception(f"Invalid expression: '{type(node).__name__}' is not allowed")
+
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise Exception(f"Invalid expression: the name '{node.id}' is not allowed")
+
+        if isinstance(node, ast.Attribute) and node.attr not in EXPR_ATTRIBUTES:
+            raise Exception(f"Invalid expression: the attribute '{node.attr}' is not allowed")
+    # endfor --
+
+
+@lru_cache(maxsize=CONST_FILTER_CACHE_SIZE)
+def _compileExpression(exprFilter: str) -> jExpression:
+    return jExpression(exprFilter)
+
+
+def compileExpression(exprFilter: str | jExpression) -> jExpression:
+    """
+    Compiles a Python expression of searchDocs() into a jExpression, the compiled expressions are cached by their text.
+
+    Examples:
+        jExprPrice = compileExpression("jDoc['features.price'] > 28 and jDoc['type'] != 'fruit'")
+        jProducts.searchDocs(exprFilter=jExprPrice)
+        jExprPrice({'type': 'dairy', 'features': {'price': 30}})  # True
+
+    Args:
+        exprFilter: Python expression with search criteria, the attributes of the document are referenced through "jDoc".
+
+    Returns:
+        jExpression: the compiled expression.
+    """
+    if isinstance(exprFilter, jExpression):
+        return exprFilter
+
+    return _compileExpression(exprFilter)
@@ -0,0 +1,433 @@
+"""
+jindex
+
+Indexes over the documents of an array jDocument, used to answer the filters of findDocs() and searchDocs() without scanning the list.
+
+Classes:
+    HashIndex
+    SortedIndex
+    TextIndex
+"""
+from __future__ import annotations
+
+from bisect import insort, bisect_left, bisect_right
+from datetime import date, datetime
+from operator import itemgetter
+
+from jDocument import jsjson as js
+from jDocument.helpers import str2datetime, textTokens
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_FAMILY_NUMBER = 'number'
+CONST_FAMILY_STRING = 'string'
+CONST_FAMILY_DATE = 'datetime'
+CONST_FAMILY_OTHER = 'other'
+CONST_INDEX_OPERATORS = ('eq', 'lt', 'lteq', 'gt', 'gteq')
+CONST_INDEX_TEXT = 'all'  # atributo do índice de texto, o mesmo da pesquisa de texto de searchDocs()
+CONST_INDEX_REGEX_CHARS = '.^$*+?{}[]()|\\'
+CONST_INDEX_CACHE_SIZE = 256
+
+
+class HashIndex:
+    """
+    Hash index of an attribute: maps the value of the attribute (converted to string, as compared by findDocs()) to the
+    ascending list of positions of the documents that have this value.
+    Attributes of subdocuments can be indexed using the dot notation ('features.type').
+    """
+    __slots__ = ('attribute', 'steps', 'positions', 'stale')
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self.steps = compilePath(attribute)
+        self.positions = {}
+        self.stale = True
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.attribute}> : {len(self.positions)} keys"
+
+    @staticmethod
+    def key(val: any) -> str:
+        """
+        Returns the key of a value, the same string that findDocs() compares with the filter.
+        """
+        return str(val)
+
+    def build(self, lstDocs: list):
+        """
+        (Re)builds the index from the list of documents.
+        """
+        # monta o índice numa variável local, para que uma leitura concorrente nunca veja o índice pela metade
+        positions = {}
+        steps = self.steps
+        for i, obj in enumerate(lstDocs):
+            positions.setdefault(self.key(getPathDefault(obj, steps)), []).append(i)
+
+        self.positions = positions
+        self.stale = False
+
+    def add(self, position: int, obj: any):
+        """
+        Adds a document, its position must be greater than all the positions already indexed.
+        """
+        self.positions.setdefault(self.key(getPathDefault(obj, self.steps)), []).append(position)
+
+    def replace(self, position: int, oldObj: any, newObj: any):
+        """
+        Updates the index when the document at "position" is replaced by another.
+        """
+        oldKey = self.key(getPathDefault(oldObj, self.steps))
+        lst = self.positions.get(oldKey)
+        if lst:
+            lst.remove(position)
+            if not lst:
+                del self.positions[oldKey]
+        # endif --
+
+        insort(self.positions.setdefault(self.key(getPathDefault(newObj, self.steps)), []), position)
+
+    def lookup(self, value: any) -> list:
+        """
+        Returns the positions of the documents whose attribute is equal to "value".
+        """
+        if not isinstance(value, str):
+            # findDocs() compares the string of the attribute with the filter, a value that is not a string never matches
+            return []
+
+        return self.positions.get(value, [])
+
+
+class SortedIndex:
+    """
+    Sorted index of an attribute, used by searchDocs() to answer the operators eq, lt, lteq, gt and gteq with a binary search
+    and by the aggregate functions (count, min, max).
+    Only the filled values (the ones that searchDocs() can match) are indexed, separated by family (numbers, strings, others),
+    as values of different families cannot be compared. The strings are indexed in lower case, as searchDocs() compares them.
+    When the filter value is a datetime, the values of the attribute are converted with str2datetime() (the same conversion made
+    by searchDocs()), these keys are built on the first search by datetime.
+    """
+    __slots__ = ('attribute', 'steps', 'families', 'dates', 'stale')
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self.steps = compilePath(attribute)
+        self.families = {}
+        self.dates = None
+        self.stale = True
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.attribute}> : {self.count()} values"
+
+    @staticmethod
+    def _familyKey(val: any) -> tuple:
+        # retorna a família e a chave do valor
+        if isinstance(val, (bool, int, float)):
+            return CONST_FAMILY_NUMBER, val
+
+        if isinstance(val, str):
+            return CONST_FAMILY_STRING, val.lower()
+
+        return CONST_FAMILY_OTHER, 0
+
+    @staticmethod
+    def _dateKey(val: any) -> any:
+        # retorna a chave do valor convertido para datetime (None se não for uma data) ou CONST_FAMILY_OTHER se a conversão falharia
+        if isinstance(val, (dict, list)):
+            return CONST_FAMILY_OTHER
+
+        if isinstance(val, (str, date)):
+            return str2datetime(val)
+
+        return CONST_FAMILY_OTHER
+
+    @staticmethod
+    def _insert(entries: tuple, key: any, position: int):
+        keys, positions = entries
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        positions.insert(i, position)
+
+    @staticmethod
+    def _remove(entries: tuple, key: any, position: int):
+        keys, positions = entries
+        i = bisect_left(keys, key) + positions[bisect_left(keys, key):bisect_right(keys, key)].index(position)
+        del keys[i]
+        del positions[i]
+
+    @staticmethod
+    def _sorted(pairs: list) -> tuple:
+        pairs.sort(key=itemgetter(0))
+        return [p[0] for p in pairs], [p[1] for p in pairs]
+
+    def build(self, lstDocs: list):
+        """
+        (Re)builds the index from the list of documents.
+        """
+        families = {}
+        for i, obj in enumerate(lstDocs):
+            val = getPathDefault(obj, self.steps)
+            if val:
+                family, key = self._familyKey(val)
+                families.setdefault(family, []).append((key, i))
+        # endfor --
+
+        self.families = {family: self._sorted(pairs) for family, pairs in families.items()}
+        self.dates = None
+        self.stale = False
+
+    def _buildDates(self, lstDocs: list):
+        pairs = []
+        for i, obj in enumerate(lstDocs):
+            key = self._dateKey(getPathDefault(obj, self.steps))
+            if key:
+                pairs.append((key, i))
+        # endfor --
+
+        # os valores que não podem ser convertidos para datetime ficam numa família à parte
+        self.dates = {
+            CONST_FAMILY_DATE: self._sorted([p for p in pairs if p[0] is not CONST_FAMILY_OTHER]),
+            CONST_FAMILY_OTHER: self._sorted([p for p in pairs if p[0] is CONST_FAMILY_OTHER]),
+        }
+
+    def add(self, position: int, obj: any):
+        """
+        Adds a document to the index.
+        """
+        val = getPathDefault(obj, self.steps)
+        if not val:
+            return
+
+        family, key = self._familyKey(val)
+        self._insert(self.families.setdefault(family, ([], [])), key, position)
+
+        if self.dates is not None:
+            key = self._dateKey(val)
+            if key:
+                self._insert(self.dates[CONST_FAMILY_OTHER if key is CONST_FAMILY_OTHER else CONST_FAMILY_DATE], key, position)
+        # endif --
+
+    def remove(self, position: int, obj: any):
+        """
+        Removes a document from the index.
+        """
+        val = getPathDefault(obj, self.steps)
+        if not val:
+            return
+
+        family, key = self._familyKey(val)
+        self._remove(self.families[family], key, position)
+
+        if self.dates is not None:
+            key = self._dateKey(val)
+            if key:
+                self._remove(self.dates[CONST_FAMILY_OTHER if key is CONST_FAMILY_OTHER else CONST_FAMILY_DATE], key, position)
+        # endif --
+
+    def replace(self, position: int, oldObj: any, newObj: any):
+        """
+        Updates the index when the document at "position" is replaced by another.
+        """
+        self.remove(position, oldObj)
+        self.add(position, newObj)
+
+    def count(self) -> int:
+        """
+        Returns the number of documents whose attribute is filled.
+        """
+        return sum(len(keys) for keys, _ in self.families.values())
+
+    def bounds(self) -> tuple | None:
+        """
+        Returns the minimum and maximum values of the attribute, or None if the values are not all numbers.
+        """
+        keys = self.families.get(CONST_FAMILY_NUMBER, ([], []))[0]
+        if not keys or len(keys) != self.count():
+            return None
+
+        return keys[0], keys[-1]
+
+    def lookup(self, oper: str, value: any, lstDocs: list) -> list | None:
+        """
+        Returns the positions (not in order) of the documents that match the condition "attribute oper value",
+        or None if the index cannot answer it (the search must scan the documents).
+
+        Args:
+            oper: operator of searchDocs(), only eq, lt, lteq, gt and gteq are answered.
+            value: value of the filter.
+            lstDocs: list of documents, used to build the datetime keys on the first search by datetime.
+        """
+        if not value or oper not in CONST_INDEX_OPERATORS or isinstance(value, bool):
+            # "eq" with an empty value searches for the documents without the attribute
+            return None
+
+        if isinstance(value, datetime):
+            if self.dates is None:
+                self._buildDates(lstDocs)
+
+            if self.dates[CONST_FAMILY_OTHER][0] or CONST_FAMILY_NUMBER in self.families:
+                # searchDocs() would fail to convert these values to datetime
+                return None
+
+            keys, positions = self.dates[CONST_FAMILY_DATE]
+
+        else:
+            family, key = self._familyKey(value)
+            if family == CONST_FAMILY_OTHER:
+                return None
+
+            if oper != 'eq' and any(f != family and self.families[f][0] for f in self.families):
+                # values of different families cannot be compared with lt/gt
+                return None
+
+            value = key
+            keys, positions = self.families.get(family, ([], []))
+        # endif --
+
+        match oper:
+            case 'eq':
+                return positions[bisect_left(keys, value):bisect_right(keys, value)]
+            case 'lt':
+                return positions[:bisect_left(keys, value)]
+            case 'lteq':
+                return positions[:bisect_right(keys, value)]
+            case 'gt':
+                return positions[bisect_right(keys, value):]
+            case _:
+                return positions[bisect_left(keys, value):]
+        # endmatch --
+
+
+class TextIndex:
+    """
+    Inverted index of the words of the documents (their json text, accent-folded and case-folded, see helpers.foldText()),
+    used by findAnyDocs() and by the text search of searchDocs() (attribute 'all', operator 'ct').
+    A plain text (without regular expression characters) is answered by the intersection of the posting lists of its words;
+    the result is a superset of the documents that contain the text, they still have to be tested. As the text may be part
+    of a word ('straw' in 'strawberry'), each word of the text is searched within the vocabulary of the index.
+    The documents are identified by an increasing id, so that removing a document does not renumber the posting lists.
+    """
+    __slots__ = ('attribute', 'ids', 'postings', 'tokens', 'nextId', 'cache', 'stale')
+
+    def __init__(self):
+        self.attribute = CONST_INDEX_TEXT
+        self.ids = []  # id do documento em cada posição da lista, em ordem crescente
+        self.postings = {}  # palavra -> ids dos documentos
+        self.tokens = {}  # id -> palavras do documento
+        self.nextId = 0
+        self.cache = {}  # palavra pesquisada -> ids dos documentos
+        self.stale = True
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.attribute}> : {len(self.postings)} words"
+
+    @staticmethod
+    def isPlainText(txt: any) -> bool:
+        """
+        Returns "True" if the text has no regular expression characters, so it can be answered by the index.
+        """
+        return isinstance(txt, str) and not any(c in CONST_INDEX_REGEX_CHARS for c in txt)
+
+    def build(self, lstDocs: list):
+        """
+        (Re)builds the index from the list of documents.
+        """
+        # monta o índice em variáveis locais (mais rápido e uma leitura concorrente nunca vê o índice pela metade)
+        postings = {}
+        tokens = {}
+        for docId, obj in enumerate(lstDocs):
+            docTokens = tokens[docId] = textTokens(js.dumps(obj))
+            for tk in docTokens:
+                ids = postings.get(tk)
+                if ids is None:
+                    postings[tk] = {docId}
+                else:
+                    ids.add(docId)
+            # endfor --
+        # endfor --
+
+        self.ids = list(range(len(lstDocs)))
+        self.postings = postings
+        self.tokens = tokens
+        self.nextId = len(lstDocs)
+        self.cache = {}
+        self.stale = False
+
+    def add(self, position: int, obj: any):
+        """
+        Adds a document, its position must be the end of the list.
+        """
+        docId = self.nextId
+        self.nextId += 1
+        self.ids.append(docId)
+        self._addTokens(docId, obj)
+
+    def _addTokens(self, docId: int, obj: any):
+        tokens = textTokens(js.dumps(obj))
+        self.tokens[docId] = tokens
+        for tk in tokens:
+            self.postings.setdefault(tk, set()).add(docId)
+
+        self.cache.clear()
+
+    def _removeTokens(self, docId: int):
+        for tk in self.tokens.pop(docId):
+            ids = self.postings[tk]
+            ids.discard(docId)
+            if not ids:
+                del self.postings[tk]
+        # endfor --
+
+        self.cache.clear()
+
+    def remove(self, position: int):
+        """
+        Removes the document at "position", the following documents move one position back.
+        """
+        self._removeTokens(self.ids.pop(position))
+
+    def replace(self, position: int, oldObj: any, newObj: any):
+        """
+        Updates the index when the document at "position" is replaced by another.
+        """
+        docId = self.ids[position]
+        self._removeTokens(docId)
+        self._addTokens(docId, newObj)
+
+    def _wordIds(self, word: str) -> set:
+        # ids dos documentos que têm uma palavra que contém "word"
+        ids = self.cache.get(word)
+        if ids is None:
+            ids = set(self.postings.get(word, ()))
+            for tk, tkIds in self.postings.items():
+                if word in tk and tk != word:
+                    ids |= tkIds
+            # endfor --
+
+            if len(self.cache) >= CONST_INDEX_CACHE_SIZE:
+                self.cache.clear()
+
+            self.cache[word] = ids
+        # endif --
+
+        return ids
+
+    def lookup(self, txt: str) -> list | None:
+        """
+        Returns the positions (in order) of the documents that may contain the text (case and accent insensitive),
+        or None if the index cannot answer it (the text is a regular expression or has no words).
+        """
+        if not self.isPlainText(txt):
+            return None
+
+        words = sorted(textTokens(txt), key=len, reverse=True)
+        if not words:
+            return None
+
+        # interseção das listas, começando pelas palavras mais longas (as mais seletivas)
+        ids = self._wordIds(words[0])
+        for word in words[1:]:
+            if not ids:
+                break
+            ids = ids & self._wordIds(word)
+        # endfor --
+
+        return sorted(bisect_left(self.ids, docId) for docId in ids)
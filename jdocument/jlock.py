@@ -0,0 +1,144 @@
+"""
+jlock
+
+Reader/writer lock used by jDocument(flagThreadSafe=True): many threads can read (query) the document at the same time,
+while a mutation waits for the readers and runs alone. Waiting writers have priority over new readers.
+Both locks are reentrant for the thread that holds them, and the thread that holds the write lock can also read.
+
+Classes:
+    RWLock
+
+Functions:
+    readLocked(lock: RWLock, method) -> function
+    writeLocked(lock: RWLock, method) -> function
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+
+class RWLock:
+    """
+    Reader/writer lock, reentrant per thread.
+
+    Examples:
+        lock = RWLock()
+        with lock.read():
+            ...
+        with lock.write():
+            ...
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writeDepth = 0
+        self._writersWaiting = 0
+        self._local = threading.local()
+
+    def acquireRead(self):
+        local = self._local
+        reads = getattr(local, 'reads', 0)
+        if reads or self._writer == threading.get_ident():
+            # já possui o lock (leitura ou escrita)
+            local.reads = reads + 1
+            return
+        # endif --
+
+        with self._cond:
+            while self._writer is not None or self._writersWaiting:
+                self._cond.wait()
+            self._readers += 1
+        # endwith --
+
+        local.reads = 1
+        local.counted = True
+
+    def releaseRead(self):
+        local = self._local
+        local.reads -= 1
+        if local.reads == 0 and getattr(local, 'counted', False):
+            local.counted = False
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+            # endwith --
+        # endif --
+
+    def acquireWrite(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writeDepth += 1
+            return
+        # endif --
+
+        if getattr(self._local, 'reads', 0):
+            raise Exception("Err: a read lock cannot be upgraded to a write lock!")
+
+        with self._cond:
+            self._writersWaiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writersWaiting -= 1
+            self._writer = me
+            self._writeDepth = 1
+        # endwith --
+
+    def releaseWrite(self):
+        self._writeDepth -= 1
+        if not self._writeDepth:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+            # endwith --
+        # endif --
+
+    @contextmanager
+    def read(self):
+        self.acquireRead()
+        try:
+            yield self
+        finally:
+            self.releaseRead()
+
+    @contextmanager
+    def write(self):
+        self.acquireWrite()
+        try:
+            yield self
+        finally:
+            self.releaseWrite()
+
+
+def readLocked(lock: RWLock, method):
+    """
+    Wraps a method so that it runs holding the read lock.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        lock.acquireRead()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            lock.releaseRead()
+
+    return wrapper
+
+
+def writeLocked(lock: RWLock, method):
+    """
+    Wraps a method so that it runs holding the write lock.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        lock.acquireWrite()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            lock.releaseWrite()
+
+    return wrapper
@@ -0,0 +1,235 @@
+"""
+jmmap
+
+Read-only array documents backed by a memory map of a file (JSON Lines, one document per line, or a Json array): the file is
+indexed once, keeping only the byte offsets (start and end) of each element, and the elements are decoded on demand from
+the memory map, with a small LRU cache of the decoded elements. The pages of the file are shared by all the processes that
+map it (and are loaded by the system only when they are read), so the resident memory of each process depends on the
+elements it reads and not on the size of the file.
+The offsets can be saved in an index file, reused while the size and the modification time of the file do not change, so
+that the next processes start without reading the file. The index of a JSON Lines file is built by searching the line breaks;
+the index of a Json array decodes each element once (without converting the dates) to find where it ends.
+The elements are decoded as in jsjson.loads() (dates converted as selected by jsjson.setDateAttributes()); the cached elements
+are shared by the readers, so they must not be changed.
+
+Classes:
+    MappedArray
+
+Functions:
+    readOnly(name: str) -> function
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+
+from jDocument import jsjson as js
+from jDocument.jstream import JsonReader, CONST_STREAM_BUFFER_SIZE
+
+CONST_MMAP_CACHE_SIZE = 1024  # elementos decodificados mantidos em cache
+CONST_MMAP_JSONL_EXTENSIONS = ('.jsonl', '.ndjson', '.jl')
+
+_INDEX_HEADER = struct.Struct('<8sqqq')  # marca, tamanho e data de modificação (ns) do arquivo, número de elementos
+_INDEX_MAGIC = b'JDOCIDX1'
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+_SPACES = b' \t\r\n'
+
+
+def readOnly(name: str):
+    """
+    Returns a method that raises an exception, it replaces the methods that change the documents of a read-only jDocument.
+    """
+    def method(*args, **kwargs):
+        raise Exception(f"Err: the documents of a mapped jDocument are read-only, '{name}' can not be used!")
+
+    return method
+
+
+def _restore(filename: str, cacheSize: int, starts: array, ends: array) -> MappedArray:
+    # recria o MappedArray num processo (pickle), sem indexar de novo o arquivo
+    return MappedArray(filename, cacheSize, _offsets=(starts, ends))
+
+
+class MappedArray(Sequence):
+    """
+    Read-only list of the elements of a JSON Lines file or of a Json array file, decoded on demand from a memory map.
+    Supports len(), indexes (also negative), slices (lists of decoded elements) and iteration; the iteration decodes the
+    elements in the order of the file without using the cache, so a scan does not discard the elements that are being reused.
+
+    Examples:
+        catalog = MappedArray('catalog.jsonl', indexFile='catalog.jsonl.idx')
+        len(catalog)
+        catalog[1000]['title']
+        jCatalog = jDocument(catalog)
+    """
+
+    def __init__(self, filename: str, cacheSize: int = CONST_MMAP_CACHE_SIZE, indexFile: str = None, flagJsonl: bool = None, _offsets: tuple = None):
+        """
+        Args:
+            filename: name of the file (JSON Lines or a Json array).
+            cacheSize: number of decoded elements kept in the LRU cache.
+            indexFile: name of the file where the offsets are saved and reused, when "None" the file is indexed every time.
+            flagJsonl: "True" for JSON Lines, "False" for a Json array, when "None" JSON Lines if the extension is .jsonl, .ndjson or .jl
+                       or if the file does not start with '['.
+        """
+        self.filename = os.fspath(filename)
+        self.cacheSize = cacheSize
+        self._file = open(self.filename, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # um arquivo vazio não pode ser mapeado
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        if _offsets is not None:
+            self._starts, self._ends = _offsets
+        else:
+            self._starts, self._ends = self._loadIndex(indexFile) if indexFile else (None, None)
+            if self._starts is None:
+                if flagJsonl is None:
+                    flagJsonl = self.filename.lower().endswith(CONST_MMAP_JSONL_EXTENSIONS) or not self._mm[:1024].lstrip().startswith(b'[')
+
+                self._starts, self._ends = self._indexJsonl() if flagJsonl else self._indexArray()
+                if indexFile:
+                    self._saveIndex(indexFile)
+            # endif --
+        # endif --
+
+        self._cached = lru_cache(maxsize=cacheSize)(self._decode)
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.filename}> : {len(self._starts)} elements"
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._cached(i) for i in range(len(self._starts))[item]]
+
+        if item < 0:
+            item += len(self._starts)
+        if not 0 <= item < len(self._starts):
+            raise IndexError(f"{__class__.__name__} index out of range")
+
+        return self._cached(item)
+
+    def __iter__(self):
+        loads = js.loads
+        mm = self._mm
+        for start, end in zip(self._starts, self._ends):
+            yield loads(mm[start:end])
+        # endfor --
+
+    def __reduce__(self):
+        # os processos (spawn) abrem o arquivo de novo e recebem os offsets
+        return _restore, (self.filename, self.cacheSize, self._starts, self._ends)
+
+    def __deepcopy__(self, memodict=None) -> list:
+        # uma cópia é uma lista em memória, com os elementos decodificados de novo
+        return list(self)
+
+    def _decode(self, position: int) -> any:
+        return js.loads(self._mm[self._starts[position]:self._ends[position]])
+
+    def cacheInfo(self):
+        """
+        Returns the statistics of the LRU cache (hits, misses, maxsize, currsize).
+        """
+        return self._cached.cache_info()
+
+    def close(self):
+        """
+        Closes the memory map and the file, the elements can not be read anymore.
+        """
+        self._cached.cache_clear()
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def _indexJsonl(self) -> tuple:
+        # início e fim de cada linha não vazia
+        starts = array('q')
+        ends = array('q')
+        mm = self._mm
+        size = len(mm)
+        find = mm.find
+        pos = 0
+        while pos < size:
+            end = find(b'\n', pos)
+            if end < 0:
+                end = size
+
+            if end > pos and (mm[pos] not in _SPACES or mm[pos:end].strip()):
+                starts.append(pos)
+                ends.append(end)
+            # endif --
+
+            pos = end + 1
+        # endwhile --
+
+        return starts, ends
+
+    def _indexArray(self) -> tuple:
+        # decodifica cada elemento uma vez (sem converter datas) para localizar o seu fim; os separadores são ASCII, então só o
+        # tamanho em bytes dos elementos pode ser diferente do número de caracteres
+        starts = array('q')
+        ends = array('q')
+        flagAscii = _NON_ASCII.search(self._mm) is None
+        with open(self.filename, encoding='utf-8', buffering=CONST_STREAM_BUFFER_SIZE) as f:
+            reader = JsonReader(f)
+            reader.expect('[')
+            if reader.peek() == ']':
+                return starts, ends
+
+            lastChar = lastByte = reader.offset + reader.pos
+            while True:
+                reader.peek()
+                startChar = reader.offset + reader.pos
+                startByte = lastByte + startChar - lastChar
+                reader.decode(flagKey=True)
+                endChar = reader.offset + reader.pos
+                length = endChar - startChar
+                if not flagAscii:
+                    length = len(reader.buffer[reader.pos - length:reader.pos].encode('utf-8'))
+
+                starts.append(startByte)
+                ends.append(startByte + length)
+                lastChar, lastByte = endChar, startByte + length
+                if reader.expect(',]') == ']':
+                    return starts, ends
+            # endwhile --
+
+    def _fileStamp(self) -> tuple:
+        stat = os.fstat(self._file.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+    def _loadIndex(self, indexFile: str) -> tuple:
+        # offsets salvos, se o arquivo não mudou desde que foram salvos
+        try:
+            with open(indexFile, 'rb') as f:
+                magic, size, mtime, q = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+                if magic != _INDEX_MAGIC or (size, mtime) != self._fileStamp():
+                    return None, None
+
+                starts = array('q')
+                ends = array('q')
+                starts.fromfile(f, q)
+                ends.fromfile(f, q)
+                return starts, ends
+        except (OSError, EOFError, struct.error):
+            return None, None
+
+    def _saveIndex(self, indexFile: str):
+        # grava num arquivo temporário e troca, para que um processo nunca leia um índice incompleto
+        tempFile = f"{indexFile}.{os.getpid()}.tmp"
+        with open(tempFile, 'wb') as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, *self._fileStamp(), len(self._starts)))
+            self._starts.tofile(f)
+            self._ends.tofile(f)
+        # endwith --
+
+        os.replace(tempFile, indexFile)
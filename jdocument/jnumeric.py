@@ -0,0 +1,203 @@
+"""
+jnumeric
+
+Optional NumPy backend of the aggregate functions: when NumPy is installed, the numeric values of an attribute are
+converted once into an ndarray and sum, mean, min, max, median, std, quantile and histogram are computed vectorized.
+When NumPy is not installed, the values are not numeric (strings, dates, booleans) or the list is small (the conversion
+would cost more than the computation), the pure Python functions are used.
+The results of both backends are the same, except for the last digits of sum, mean and std of floats (NumPy uses pairwise summation):
+min, max and the median of an odd number of values return the element of the list itself, so a list of int and float values
+keeps the type of the element (1000, not 1000.0).
+
+Functions:
+    getBackend() -> str
+    setBackend(backend: str = None) -> str
+    toArray(lstValues: list) -> numpy.ndarray | None
+    quantile(lstValues: list, q: float | list, method: str = 'linear', arr=None) -> float | list
+    histogram(lstValues: list, bins: int = 10, arr=None) -> dict
+    stdev(lstValues: list) -> float | None
+"""
+from __future__ import annotations
+
+import math
+import statistics
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CONST_BACKEND_NUMPY = 'numpy'
+CONST_BACKEND_PYTHON = 'python'
+CONST_NUMERIC_MIN_VALUES = 1000  # abaixo disso a conversão para ndarray não compensa
+CONST_QUANTILE_METHODS = ('linear', 'lower', 'higher', 'nearest', 'midpoint')
+
+_backend = CONST_BACKEND_NUMPY if numpy is not None else CONST_BACKEND_PYTHON
+
+
+def _median(arr: any, lstValues: list) -> any:
+    # como statistics.median(): com um número ímpar de valores, o elemento do meio da ordenação (estável) da lista
+    if len(arr) % 2:
+        return lstValues[int(numpy.argsort(arr, kind='stable')[len(arr) // 2])]
+
+    return numpy.median(arr).item()
+
+
+# funções calculadas sobre o ndarray (não vazio) dos valores e a lista original (o ndarray de int e float é todo float)
+NUMERIC_FUNCTIONS = {
+    'sum': lambda arr, lstValues: arr.sum().item(),
+    'mean': lambda arr, lstValues: arr.mean().item(),
+    'min': lambda arr, lstValues: lstValues[int(arr.argmin())],
+    'max': lambda arr, lstValues: lstValues[int(arr.argmax())],
+    'median': _median,
+    'std': lambda arr, lstValues: arr.std(ddof=1).item() if len(arr) > 1 else None,
+}
+
+
+def getBackend() -> str:
+    """
+    Returns the backend of the aggregate functions: 'numpy' or 'python'.
+    """
+    return _backend
+
+
+def setBackend(backend: str = None) -> str:
+    """
+    Selects the backend of the aggregate functions.
+
+    Examples:
+        setBackend('python')    # pure Python, even if NumPy is installed
+        setBackend()            # NumPy if it is installed
+
+    Args:
+        backend: 'numpy', 'python' or None (NumPy if it is installed).
+
+    Returns:
+        str: the previous backend.
+    """
+    global _backend
+    previous = _backend
+
+    if backend is None:
+        backend = CONST_BACKEND_NUMPY if numpy is not None else CONST_BACKEND_PYTHON
+
+    if backend == CONST_BACKEND_NUMPY and numpy is None:
+        raise Exception("Err: NumPy is not installed!")
+
+    if backend not in (CONST_BACKEND_NUMPY, CONST_BACKEND_PYTHON):
+        raise Exception(f"Invalid backend '{backend}'")
+
+    _backend = backend
+    return previous
+
+
+def toArray(lstValues: list) -> any:
+    """
+    Converts the values into a numeric ndarray, or returns None if the NumPy backend is not selected, the list is small or
+    the values are not all numbers (int or float).
+    """
+    if _backend != CONST_BACKEND_NUMPY or len(lstValues) < CONST_NUMERIC_MIN_VALUES:
+        return None
+
+    try:
+        arr = numpy.asarray(lstValues)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    if arr.ndim != 1 or arr.dtype.kind not in 'if':
+        # strings, datas, booleanos, listas... ficam com as funções do Python
+        return None
+
+    if arr.dtype.kind == 'i' and int(numpy.abs(arr).max()) * len(arr) >= 2 ** 63:
+        # a soma poderia estourar o int64
+        return None
+
+    return arr
+
+
+def _quantile(lstSorted: list, q: float, method: str) -> float:
+    # quantil dos valores ordenados, com os mesmos métodos de numpy.quantile()
+    h = (len(lstSorted) - 1) * q
+    lo = math.floor(h)
+    hi = min(lo + 1, len(lstSorted) - 1)
+
+    match method:
+        case 'lower':
+            return lstSorted[lo]
+        case 'higher':
+            return lstSorted[math.ceil(h)]
+        case 'nearest':
+            return lstSorted[round(h)]
+        case 'midpoint':
+            return (lstSorted[lo] + lstSorted[math.ceil(h)]) / 2
+        case _:
+            return lstSorted[lo] + (h - lo) * (lstSorted[hi] - lstSorted[lo])
+    # endmatch --
+
+
+def quantile(lstValues: list, q: float | list, method: str = 'linear', arr: any = None) -> float | list:
+    """
+    Returns the quantile "q" (0 <= q <= 1) of the values, or the list of quantiles if "q" is a list.
+
+    Args:
+        lstValues: list of values (not empty).
+        q: quantile or list of quantiles.
+        method: 'linear' (default), 'lower', 'higher', 'nearest' or 'midpoint', as numpy.quantile().
+        arr: the values already converted by toArray(), if any.
+    """
+    lstQ = q if isinstance(q, (list, tuple)) else [q]
+    for qt in lstQ:
+        if not 0 <= qt <= 1:
+            raise Exception(f"Invalid quantile {qt}, it must be between 0 and 1")
+
+    if method not in CONST_QUANTILE_METHODS:
+        raise Exception(f"Invalid method '{method}', it must be one of {CONST_QUANTILE_METHODS}")
+
+    arr = toArray(lstValues) if arr is None else arr
+    if arr is not None:
+        result = numpy.quantile(arr, lstQ, method=method).tolist()
+    else:
+        lstSorted = sorted(lstValues)
+        result = [_quantile(lstSorted, qt, method) for qt in lstQ]
+    # endif --
+
+    return result if isinstance(q, (list, tuple)) else result[0]
+
+
+def histogram(lstValues: list, bins: int = 10, arr: any = None) -> dict:
+    """
+    Returns the histogram of the values with "bins" intervals of the same width between the minimum and the maximum, as numpy.histogram().
+
+    Args:
+        lstValues: list of values (not empty).
+        bins: number of intervals.
+        arr: the values already converted by toArray(), if any.
+
+    Returns:
+        dict: 'counts' (number of values of each interval) and 'edges' (the bins + 1 limits of the intervals, the last one is closed).
+    """
+    arr = toArray(lstValues) if arr is None else arr
+    if arr is not None:
+        counts, edges = numpy.histogram(arr, bins=bins)
+        return {'counts': counts.tolist(), 'edges': edges.tolist()}
+
+    lo, hi = min(lstValues), max(lstValues)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+
+    width = (hi - lo) / bins
+    edges = [lo + width * i for i in range(bins)] + [float(hi)]
+    counts = [0] * bins
+    for val in lstValues:
+        i = min(int((val - lo) / width), bins - 1)
+        counts[i] += 1
+    # endfor --
+
+    return {'counts': counts, 'edges': edges}
+
+
+def stdev(lstValues: list) -> float | None:
+    """
+    Sample standard deviation of the values (pure Python), None if there are less than 2 values.
+    """
+    return statistics.stdev(lstValues) if len(lstValues) > 1 else None
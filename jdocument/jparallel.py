@@ -0,0 +1,167 @@
+"""
+jparallel
+
+Runs the scan of the queries of an array jDocument (findDocs, searchDocs, findAnyDocs and the aggregate functions) over a
+pool of processes: the list is split in chunks, each chunk is sent (pickled) to a worker with a picklable predicate and the
+results are merged in the original order of the list.
+
+When the number of workers is informed, the shared pool with this number of workers is used (see getPool()): it is created
+on the first use and reused by the next scans (and by the parallel decoding and encoding of jstream and jbulk), so only the
+first scan pays the start of the processes. The workers are started by "fork" only when the process has a single thread
+(forking a process whose other threads may hold locks can deadlock the workers), otherwise by "forkserver" or "spawn".
+When an Executor is informed it is used as is; its number of workers (used to size the chunks) is informed by the caller,
+by default the number of CPUs.
+When a sketch is informed (see jsketch), each chunk adds the values of the attribute to a copy of the (empty) sketch and only
+the partial sketches travel back, to be merged by the main process.
+
+Functions:
+    getPool(workers: int) -> ProcessPoolExecutor
+    shutdownPools()
+    resolveExecutor(parallel: int | Executor, workers: int = None) -> tuple
+    parallelScan(lstDocs: list, predicate, args: tuple, parallel: int | Executor, qty: int = None, attribute: str = None, sketch=None,
+                 workers: int = None) -> list
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from copy import deepcopy
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_PARALLEL_CHUNKS = 4  # chunks por worker, para balancear a carga e encerrar cedo quando "qty" é informado
+CONST_PARALLEL_MIN_CHUNK = 1000
+
+_pools = {}  # pools de processos compartilhados, pelo número de workers
+_poolsLock = threading.Lock()
+
+
+def _poolContext():
+    # "fork" só num processo com uma única thread, as outras threads podem estar com locks adquiridos no momento do fork
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def getPool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared pool of processes with "workers" workers, created on the first use and reused by the next calls.
+
+    Args:
+        workers: number of worker processes.
+    """
+    workers = max(1, int(workers))
+    with _poolsLock:
+        executor = _pools.get(workers)
+        if executor is None:
+            executor = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=_poolContext())
+    # endwith --
+
+    return executor
+
+
+def shutdownPools():
+    """
+    Shuts down the shared pools of processes (see getPool()), the next parallel scan creates a new pool.
+    """
+    with _poolsLock:
+        executors = list(_pools.values())
+        _pools.clear()
+    # endwith --
+
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def resolveExecutor(parallel: int | Executor, workers: int = None) -> tuple:
+    """
+    Returns the Executor of a parallel operation and its number of workers.
+
+    Args:
+        parallel: number of worker processes (the shared pool of getPool()) or an Executor.
+        workers: number of workers of the informed Executor, when "None" the number of CPUs.
+
+    Returns:
+        tuple: (executor, workers).
+    """
+    if isinstance(parallel, Executor):
+        return parallel, max(1, int(workers or os.cpu_count() or 1))
+
+    workers = max(1, int(parallel))
+    return getPool(workers), workers
+
+
+def _scan(lstDocs: list, start: int, end: int, offset: int, predicate, args: tuple, qty: int | None, attribute: str | None, sketch) -> list:
+    # testa os documentos lstDocs[start:end], retorna as posições (+offset), os valores preenchidos do atributo ou o sketch desses valores
+    steps = compilePath(attribute) if attribute else None
+    result = []
+    partial = deepcopy(sketch) if sketch is not None else None
+    add = result.append if partial is None else partial.add
+    for i in range(start, end):
+        obj = lstDocs[i]
+        if predicate is None or predicate(obj, *args):
+            if steps is None:
+                result.append(i + offset)
+            else:
+                val = getPathDefault(obj, steps)
+                if val:
+                    add(val)
+            # endif --
+
+            if qty and len(result) >= qty:
+                break
+        # endif --
+    # endfor --
+
+    return result if partial is None else [partial]
+
+
+def _scanChunk(lstDocs: list, offset: int, predicate, args: tuple, qty: int | None, attribute: str | None, sketch) -> list:
+    return _scan(lstDocs, 0, len(lstDocs), offset, predicate, args, qty, attribute, sketch)
+
+
+def _chunks(size: int, workers: int) -> list:
+    # divide a lista em intervalos (início, fim)
+    chunkSize = max(CONST_PARALLEL_MIN_CHUNK, -(-size // (workers * CONST_PARALLEL_CHUNKS)))
+    return [(start, min(start + chunkSize, size)) for start in range(0, size, chunkSize)]
+
+
+def parallelScan(lstDocs: list, predicate, args: tuple, parallel: int | Executor, qty: int = None, attribute: str = None, sketch=None,
+                 workers: int = None) -> list:
+    """
+    Tests the documents of the list in parallel and returns, in the order of the list, the positions of the documents that
+    match the predicate or, when "attribute" is informed, the filled values of the attribute of these documents.
+
+    Args:
+        lstDocs: list of documents.
+        predicate: picklable function predicate(doc, *args) -> bool, or None to select all documents.
+        args: arguments of the predicate (picklable).
+        parallel: number of worker processes (the shared pool of getPool()) or an Executor.
+        qty: maximum number of results, when "None" it will be all.
+        attribute: name of the attribute whose values are returned.
+        sketch: empty sketch (see jsketch) that receives the values of the attribute in each chunk.
+        workers: number of workers of the informed Executor, when "None" the number of CPUs.
+
+    Returns:
+        list: positions, values or the partial sketches of the chunks.
+    """
+    executor, workers = resolveExecutor(parallel, workers)
+    futures = [executor.submit(_scanChunk, lstDocs[start:end], start, predicate, args, qty, attribute, sketch) for start, end in _chunks(len(lstDocs), workers)]
+
+    # junta os resultados na ordem da lista
+    result = []
+    for future in futures:
+        result.extend(future.result())
+        if qty and len(result) >= qty:
+            # já localizou a quantidade necessária, cancela os demais
+            for pending in futures:
+                pending.cancel()
+            return result[:qty]
+        # endif --
+    # endfor --
+
+    return result
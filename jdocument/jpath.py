@@ -0,0 +1,277 @@
+"""
+jpath
+
+Compiles the attribute paths used by jDocument (e.g. 'team[1].address.street' or 'data[name=maria].age') into a
+tuple of steps that is parsed only once and kept in a bounded LRU cache, keyed by the path string.
+
+The steps of a compiled path are:
+    str --> key of a dictionary
+    int --> index of a list
+    PathPredicate --> first element of a list whose attribute is equal to a value (list[attribute=value])
+
+Functions:
+    compilePath(attribute: str) -> tuple
+    getPathValue(data: any, steps: tuple) -> any
+    getPathDefault(data: any, steps: tuple, defaultValue: any = None) -> any
+    setPathValue(data: any, steps: tuple, value: any)
+    removePathValue(data: any, steps: tuple) -> int
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+CONST_PATH_ARRAY = 'Array'
+CONST_PATH_CACHE_SIZE = 1024
+
+rebrackets = re.compile(r"\[([^\]]*)\]")  # RegEx para extrair o conteúdo de cada '[...]'
+
+
+class PathPredicate:
+    """
+    Step of a compiled path that selects the first element of a list whose attribute is equal to a value.
+    The comparison is the same one used by jDocument.findDocs(), the value of the attribute is converted to string.
+    """
+    __slots__ = ('attribute', 'value', 'steps')
+
+    def __init__(self, attribute: str, value: str):
+        self.attribute = attribute
+        self.value = value
+        self.steps = compilePath(attribute)
+
+    def __repr__(self):
+        return f"[{self.attribute}={self.value}]"
+
+    def test(self, obj: any) -> bool:
+        """
+        Returns "True" if the element matches the predicate.
+        """
+        val = getPathDefault(obj, self.steps)
+
+        # se o atributo for uma lista ou um dicionário (objeto) então transforma em string
+        if isinstance(val, (dict, list)):
+            val = str(val)
+
+        return str(val) == self.value
+
+    def find(self, lst: list) -> any:
+        """
+        Returns the first element of the list that matches the predicate, raises KeyError if there is none.
+        """
+        for obj in lst:
+            if self.test(obj):
+                return obj
+
+        raise KeyError(repr(self))
+
+
+def _splitPath(attribute: str) -> list:
+    # separa os tokens pelo '.', ignorando os pontos que estiverem dentro de '[...]'
+    tokens = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(attribute):
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+        elif c == '.' and depth == 0:
+            tokens.append(attribute[start:i])
+            start = i + 1
+        # endif --
+    # endfor --
+
+    tokens.append(attribute[start:])
+
+    return tokens
+
+
+@lru_cache(maxsize=CONST_PATH_CACHE_SIZE)
+def compilePath(attribute: str) -> tuple:
+    """
+    Compiles an attribute path into a tuple of steps. The result is cached, so the same path is parsed only once.
+
+    Examples:
+        compilePath('team[1].address.street')   # ('team', 1, 'address', 'street')
+        compilePath('data[name=maria].age')     # ('data', [name=maria], 'age')
+        compilePath('Array[0].name')            # (0, 'name')
+
+    Args:
+        attribute: attribute name using the json punctuation convention.
+
+    Returns:
+        tuple: steps of the path.
+    """
+    steps = []
+    for tk in _splitPath(attribute):
+        if '[' not in tk:
+            steps.append(tk)
+            continue
+        # endif --
+
+        # tratamento especial para listas
+        #   itens[10].nome --> pega o valor do atributo "nome" do objeto 10 da lista "itens"
+        #   itens[nome=maria].idade --> pega o valor do atributo "idade" do objeto cujo
+        #                               atributo "nome" é igual a "maria" da lista "itens"
+        #   Array[10] --> o próprio documento é a lista
+        lst = tk.split('[')[0]
+        if lst != CONST_PATH_ARRAY:
+            steps.append(lst)
+        # endif --
+
+        brackets = rebrackets.findall(tk)
+        if not brackets:
+            raise ValueError(f"Invalid attribute path '{attribute}'")
+        # endif --
+
+        for pont in brackets:
+            if pont.replace('-', '').isnumeric():
+                # indice numérico
+                steps.append(int(pont))
+
+            elif '=' in pont:
+                # condição
+                p1, p2 = pont.split('=', 1)
+                steps.append(PathPredicate(p1.strip(), p2.strip()))
+
+            else:
+                raise ValueError(f"Invalid attribute path '{attribute}'")
+            # endif --
+        # endfor --
+    # endfor --
+
+    return tuple(steps)
+
+
+def getPathValue(data: any, steps: tuple) -> any:
+    """
+    Runs a compiled path over raw data (dict or list), raises an exception if the path does not exist.
+
+    Args:
+        data: dictionary or list.
+        steps: compiled path, see compilePath().
+
+    Returns:
+        any: value of the attribute.
+    """
+    for step in steps:
+        if step.__class__ is PathPredicate:
+            data = step.find(data)
+        else:
+            data = data[step]
+    # endfor --
+
+    return data
+
+
+def getPathDefault(data: any, steps: tuple, defaultValue: any = None) -> any:
+    """
+    Same as getPathValue(), but returns "defaultValue" if the path does not exist.
+    """
+    try:
+        for step in steps:
+            if step.__class__ is PathPredicate:
+                data = step.find(data)
+            else:
+                data = data[step]
+        # endfor --
+
+        return data
+
+    except Exception:
+        return defaultValue
+
+
+def setPathValue(data: any, steps: tuple, value: any):
+    """
+    Adds or updates the value of a compiled path, creating the subdocuments that do not exist.
+    When the path goes through a list of documents, the value is updated in all documents of the list.
+
+    Args:
+        data: dictionary or list.
+        steps: compiled path, see compilePath().
+        value: value to be assigned.
+    """
+    step = steps[0]
+
+    if isinstance(data, list) and step.__class__ is str:
+        # o caminho passa por uma lista de documentos, atualiza todos os documentos da lista
+        for obj in data:
+            if isinstance(obj, dict):
+                setPathValue(obj, steps, value)
+        # endfor --
+        return
+    # endif --
+
+    if len(steps) == 1:
+        if step.__class__ is PathPredicate:
+            data[data.index(step.find(data))] = value
+        else:
+            data[step] = value
+        # endif --
+        return
+    # endif --
+
+    if step.__class__ is str:
+        if not data.get(step):
+            # cria o subdocumento se não existir
+            data[step] = {}
+        # endif --
+        sub = data[step]
+    else:
+        sub = getPathValue(data, (step,))
+    # endif --
+
+    setPathValue(sub, steps[1:], value)
+
+
+def removePathValue(data: any, steps: tuple) -> int:
+    """
+    Removes the attribute (or the list element) addressed by a compiled path.
+    When the path goes through a list of documents, the attribute is removed from all documents of the list.
+
+    Args:
+        data: dictionary or list.
+        steps: compiled path, see compilePath().
+
+    Returns:
+        int: the number of occurrences removed.
+    """
+    step = steps[0]
+
+    if isinstance(data, list) and step.__class__ is str:
+        return sum(removePathValue(obj, steps) for obj in data if isinstance(obj, dict))
+    # endif --
+
+    if len(steps) > 1:
+        try:
+            sub = getPathValue(data, (step,))
+        except Exception:
+            return 0
+
+        return removePathValue(sub, steps[1:])
+    # endif --
+
+    if step.__class__ is PathPredicate:
+        try:
+            data.remove(step.find(data))
+        except Exception:
+            return 0
+
+        return 1
+    # endif --
+
+    if step.__class__ is int:
+        if not isinstance(data, list) or not -len(data) <= step < len(data):
+            return 0
+
+        del data[step]
+        return 1
+    # endif --
+
+    if isinstance(data, dict) and step in data:
+        del data[step]
+        return 1
+    # endif --
+
+    return 0
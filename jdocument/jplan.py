@@ -0,0 +1,122 @@
+"""
+jplan
+
+Cost model of the conditions of findDocs() and searchDocs(), used to order the evaluation of the filters:
+inside an AND group the conditions are tested from the cheapest and most selective to the most expensive, and the OR
+groups are tested from the cheapest and most likely to match, so the short-circuit skips the expensive conditions
+(regular expressions, full-text search) for most documents. The result of the filter does not change, only the order
+in which the conditions are tested.
+
+The cost of a condition is a relative estimate of its operator (and of the depth of its attribute); the selectivity
+(fraction of documents that pass) is taken from the indexes or from a sample of the list, see jDocument.explain(),
+otherwise a default of the operator is used.
+
+Functions:
+    conditionCost(attribute: str, oper: str, value: any) -> float
+    defaultSelectivity(oper: str, value: any) -> float
+    findCondition(attribute: str, rule: any, flagMacros: bool) -> tuple
+    planAnd(conditions: list) -> tuple
+    planOr(groups: list) -> list
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+CONST_PLAN_MIN_DOCS = 1000  # listas menores usam apenas as estimativas padrão, a amostragem custaria mais que a pesquisa
+CONST_PLAN_SAMPLE = 100  # número de documentos da amostra
+CONST_PLAN_STATISTICS_SIZE = 1024  # número máximo de estimativas guardadas por jDocument
+
+# custo relativo de cada operador (uma leitura de atributo com comparação simples vale 1)
+CONST_PLAN_COSTS = {
+    'eq': 1.0, 'dif': 1.0, 'lt': 1.2, 'lteq': 1.2, 'gt': 1.2, 'gteq': 1.2, 'in': 2.0, 'nin': 2.0,
+    'ct': 3.0, 'nct': 3.0, 'RegExp': 8.0, 'all': 50.0,
+}
+CONST_PLAN_PATH_COST = 0.2  # custo de cada nível a mais no caminho do atributo ('a.b.c')
+CONST_PLAN_DATE_COST = 4.0  # custo da conversão do valor do atributo para datetime
+
+# fração padrão de documentos que passam em cada operador
+CONST_PLAN_SELECTIVITY = {
+    'eq': 0.1, 'dif': 0.9, 'lt': 0.33, 'lteq': 0.33, 'gt': 0.33, 'gteq': 0.33, 'in': 0.2, 'nin': 0.8,
+    'ct': 0.25, 'nct': 0.75, 'RegExp': 0.5, 'all': 0.25,
+}
+
+# macros de findDocs() e os operadores equivalentes de searchDocs()
+CONST_PLAN_MACROS = (('IN:', 'in'), ('NIN:', 'nin'), ('CT:', 'ct'), ('NCT:', 'nct'), ('RE:', 'RegExp'))
+
+
+def conditionCost(attribute: str, oper: str, value: any) -> float:
+    """
+    Returns the estimated cost of testing the condition "attribute oper value" on one document.
+    """
+    if attribute == 'all':
+        return CONST_PLAN_COSTS['all']
+
+    cost = CONST_PLAN_COSTS.get(oper, 1.0) + CONST_PLAN_PATH_COST * attribute.count('.')
+    if isinstance(value, datetime):
+        cost += CONST_PLAN_DATE_COST
+
+    return cost
+
+
+def defaultSelectivity(oper: str, value: any) -> float:
+    """
+    Returns the default fraction of documents that pass the condition, used when there are no statistics.
+    """
+    if not value and oper in ('eq', 'dif'):
+        # "eq" com valor vazio pesquisa os documentos sem o atributo
+        return 1 - CONST_PLAN_SELECTIVITY[oper]
+
+    return CONST_PLAN_SELECTIVITY.get(oper, 0.5)
+
+
+def findCondition(attribute: str, rule: any, flagMacros: bool) -> tuple:
+    """
+    Returns the operator and the value of searchDocs() equivalent to a rule of findDocs().
+    """
+    if flagMacros and isinstance(rule, str):
+        for macro, oper in CONST_PLAN_MACROS:
+            if rule.startswith(macro):
+                return oper, rule[len(macro):]
+    # endif --
+
+    return 'eq', rule
+
+
+def _rank(cost: float, selectivity: float) -> float:
+    # ordem de um AND: as condições mais baratas e que mais descartam documentos primeiro
+    return cost / (1 - selectivity) if selectivity < 1 else float('inf')
+
+
+def planAnd(conditions: list) -> tuple:
+    """
+    Orders the conditions of an AND group.
+
+    Args:
+        conditions: list of (cost, selectivity, condition).
+
+    Returns:
+        tuple: (expected cost, selectivity, ordered conditions) of the group.
+    """
+    ordered = sorted(conditions, key=lambda cond: _rank(cond[0], cond[1]))
+
+    # custo esperado: cada condição só é testada se as anteriores passaram
+    cost, selectivity = 0.0, 1.0
+    for condCost, condSelectivity, _ in ordered:
+        cost += selectivity * condCost
+        selectivity *= condSelectivity
+    # endfor --
+
+    return cost, selectivity, ordered
+
+
+def planOr(groups: list) -> list:
+    """
+    Orders the AND groups of an OR, the groups most likely to match (and cheapest) first.
+
+    Args:
+        groups: list of (cost, selectivity, conditions), as returned by planAnd().
+
+    Returns:
+        list: the ordered groups.
+    """
+    return sorted(groups, key=lambda group: group[0] / group[1] if group[1] > 0 else float('inf'))
@@ -1,9 +1,65 @@
+"""
+jsjson
+
+Encoding and decoding of Json with dates: dumps() converts the dates (datetime, date) into ISO strings and loads() converts
+the ISO strings back into dates (see decodeDate()). The object_hook converts the values of each object once (the objects
+inside it were already converted), the strings that can not be dates are rejected by their shape, before any parsing, and
+the conversion can be limited to some attributes or turned off (see setDateAttributes()).
+The documents are decoded by the fastest backend installed (orjson, ujson, simplejson or the standard json), selected at
+import time or by setBackend(); a document that the backend does not accept (NaN, integers larger than 64 bits, ...) is
+decoded by the standard json, so the result (or the error) is the same with every backend.
+The documents are always encoded by the encoder of the standard json (C accelerated, with encoders created once), because
+the other backends can not reproduce its output (separators ', ' and ': ', indent=4, representation of the floats): the
+output of dumps() is byte-identical with every backend.
+
+Classes:
+    JSONDateTimeEncoder
+
+Functions:
+    getBackend() -> str
+    installedBackends() -> list
+    setBackend(backend: str = None) -> str
+    decodeDate(val: str) -> any
+    dateHook(dateAttributes: bool | str | list | tuple | set = None)
+    getDateAttributes() -> any
+    setDateAttributes(dateAttributes: bool | str | list | tuple | set = True) -> any
+    datetime_decoder(d)
+    dumps(obj, flagPretty: bool = False, ensure_ascii: bool = False) -> str
+    loads(obj, dateAttributes: bool | str | list | tuple | set = None)
+"""
+from __future__ import annotations
+
 import datetime
+import json
+import re
 
 try:
-    import simplejson as json
+    import orjson
 except ImportError:
-    import json
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+CONST_BACKEND_ORJSON = 'orjson'
+CONST_BACKEND_UJSON = 'ujson'
+CONST_BACKEND_SIMPLEJSON = 'simplejson'
+CONST_BACKEND_JSON = 'json'
+
+# backends na ordem de preferência (do mais rápido) e a função que decodifica um documento (sem converter as datas)
+_BACKENDS = {
+    CONST_BACKEND_ORJSON: orjson.loads if orjson is not None else None,
+    CONST_BACKEND_UJSON: ujson.loads if ujson is not None else None,
+    CONST_BACKEND_SIMPLEJSON: simplejson.loads if simplejson is not None else None,
+    CONST_BACKEND_JSON: json.loads,
+}
 
 
 class JSONDateTimeEncoder(json.JSONEncoder):
@@ -14,43 +70,235 @@ class JSONDateTimeEncoder(json.JSONEncoder):
             return json.JSONEncoder.default(self, obj)
 
 
+# os encoders são criados uma única vez: (flagPretty, ensure_ascii) -> encode
+_ENCODERS = {
+    (False, False): JSONDateTimeEncoder(ensure_ascii=False).encode,
+    (False, True): JSONDateTimeEncoder(ensure_ascii=True).encode,
+    (True, False): JSONDateTimeEncoder(ensure_ascii=False, indent=4).encode,
+    (True, True): JSONDateTimeEncoder(ensure_ascii=True, indent=4).encode,
+}
+
+# formatos usuais das datas, convertidos com fromisoformat()
+_DATE_ISO = re.compile(r'\d{4}-\d\d-\d\d', re.ASCII)
+_DATETIME_ISO = re.compile(r'\d{4}-\d\d-\d\dT(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d\.(?:\d{6}|\d{3})', re.ASCII)
+
+_dateAttributes = True
+_backend = next(name for name, func in _BACKENDS.items() if func is not None)
+_decode = _BACKENDS[_backend]
+
+
+def getBackend() -> str:
+    """
+    Returns the backend that decodes the documents: 'orjson', 'ujson', 'simplejson' or 'json'.
+    """
+    return _backend
+
+
+def installedBackends() -> list:
+    """
+    Returns the backends installed, from the fastest.
+    """
+    return [name for name, func in _BACKENDS.items() if func is not None]
+
+
+def setBackend(backend: str = None) -> str:
+    """
+    Selects the backend that decodes the documents.
+
+    Examples:
+        setBackend('json')      # the standard json, even if orjson is installed
+        setBackend()            # the fastest backend installed
+
+    Args:
+        backend: 'orjson', 'ujson', 'simplejson', 'json' or None (the fastest installed).
+
+    Returns:
+        str: the previous backend.
+    """
+    global _backend, _decode
+    previous = _backend
+
+    if backend is None:
+        backend = installedBackends()[0]
+
+    if backend not in _BACKENDS:
+        raise Exception(f"Invalid backend '{backend}'")
+
+    if _BACKENDS[backend] is None:
+        raise Exception(f"Err: {backend} is not installed!")
+
+    _backend = backend
+    _decode = _BACKENDS[backend]
+    return previous
+
+
+def decodeDate(val: str) -> any:
+    """
+    Returns the date of an ISO string, the same of strptime() with the formats '%Y-%m-%dT%H:%M:%S.%f' (datetime) and '%Y-%m-%d'
+    (date), or the string itself when it is not a date. The strings that can not be dates are rejected by their shape (4 digits
+    and '-') and the usual formats are converted with fromisoformat(); only the unusual formats accepted by strptime() (month
+    and day with 1 digit, 1 to 6 digits of fraction, ...) are converted with strptime().
+    """
+    if len(val) < 8 or val[4] != '-' or not val[:4].isdecimal():
+        return val
+
+    try:
+        if len(val) == 10 and _DATE_ISO.fullmatch(val):
+            return datetime.date.fromisoformat(val)
+
+        if _DATETIME_ISO.fullmatch(val):
+            return datetime.datetime.fromisoformat(val)
+    except ValueError:
+        # dia ou mês inválido, também não é uma data para o strptime()
+        return val
+
+    try:
+        return datetime.datetime.strptime(val, '%Y-%m-%dT%H:%M:%S.%f')
+    except ValueError:
+        try:
+            return datetime.datetime.strptime(val, '%Y-%m-%d').date()
+        except ValueError:
+            return val
+
+
+def _decodeList(lst: list) -> list:
+    # converte os strings de uma lista e das suas sublistas, os objetos da lista já foram convertidos pelo object_hook
+    return [decodeDate(v) if v.__class__ is str else _decodeList(v) if v.__class__ is list else v for v in lst]
+
+
+def _objectHook(d: dict) -> dict:
+    # object_hook que converte os valores do objeto, sem percorrer de novo os objetos internos (já convertidos)
+    for k, v in d.items():
+        if v.__class__ is str:
+            if len(v) >= 8 and v[4] == '-':
+                d[k] = decodeDate(v)
+        elif v.__class__ is list:
+            d[k] = _decodeList(v)
+    # endfor --
+
+    return d
+
+
+def _attributesHook(attributes: frozenset):
+    # object_hook que converte apenas os valores dos atributos informados
+    def hook(d: dict) -> dict:
+        for k in attributes:
+            v = d.get(k)
+            if v.__class__ is str:
+                d[k] = decodeDate(v)
+            elif v.__class__ is list:
+                d[k] = _decodeList(v)
+        # endfor --
+
+        return d
+
+    return hook
+
+
+def dateHook(dateAttributes: bool | str | list | tuple | set = None):
+    """
+    Returns the object_hook that converts the dates of the decoded objects, "None" when the dates are not converted.
+
+    Args:
+        dateAttributes: True (all the attributes), False (no attribute), names of the attributes whose values are converted (at any
+            level of the document) or None (see setDateAttributes()).
+    """
+    if dateAttributes is None:
+        dateAttributes = _dateAttributes
+
+    if dateAttributes is True:
+        return _objectHook
+
+    if not dateAttributes:
+        return None
+
+    return _attributesHook(frozenset([dateAttributes] if isinstance(dateAttributes, str) else dateAttributes))
+
+
+def getDateAttributes() -> any:
+    """
+    Returns the attributes whose dates are converted by loads(), see setDateAttributes().
+    """
+    return _dateAttributes
+
+
+def setDateAttributes(dateAttributes: bool | str | list | tuple | set = True) -> any:
+    """
+    Selects the attributes whose dates are converted by loads() (and by the documents created from Json strings).
+
+    Examples:
+        setDateAttributes(False)                        # the dates are kept as strings
+        setDateAttributes(['created', 'updated'])       # only the values of 'created' and 'updated'
+        setDateAttributes()                             # all the attributes
+
+    Args:
+        dateAttributes: True (all the attributes), False (no attribute) or names of the attributes (at any level of the document).
+
+    Returns:
+        the previous selection.
+    """
+    global _dateAttributes
+    previous = _dateAttributes
+    _dateAttributes = dateAttributes if isinstance(dateAttributes, (bool, str)) else tuple(dateAttributes)
+    return previous
+
+
 def datetime_decoder(d):
-    if isinstance(d, list):
-        pairs = enumerate(d)
-    elif isinstance(d, dict):
-        pairs = d.items()
-    else:
-        pairs = None
-
-    result = []
-    for k, v in pairs:
-        if isinstance(v, str):
-            try:
-                # The %f format code is only supported in Python >= 2.6.
-                # For Python <= 2.5 strip off microseconds
-                # v = datetime.datetime.strptime(v.rsplit('.', 1)[0],
-                #     '%Y-%m-%dT%H:%M:%S')
-                v = datetime.datetime.strptime(v, '%Y-%m-%dT%H:%M:%S.%f')
-            except ValueError:
-                try:
-                    v = datetime.datetime.strptime(v, '%Y-%m-%d').date()
-                except ValueError:
-                    pass
-        elif isinstance(v, (dict, list)):
-            v = datetime_decoder(v)
-        result.append((k, v))
-    if isinstance(d, list):
-        return [x[1] for x in result]
-    elif isinstance(d, dict):
-        return dict(result)
+    """
+    Returns a copy of a list or of a dictionary with the ISO strings (at any level) converted into dates, see decodeDate().
+    """
+    if isinstance(d, dict):
+        return {k: decodeDate(v) if isinstance(v, str) else datetime_decoder(v) if isinstance(v, (dict, list)) else v for k, v in d.items()}
+
+    return [decodeDate(v) if isinstance(v, str) else datetime_decoder(v) if isinstance(v, (dict, list)) else v for v in d]
+
+
+def _applyHook(obj: any, hook) -> any:
+    # aplica o object_hook como o json: primeiro nos objetos internos, depois no objeto que os contém
+    if obj.__class__ is dict:
+        for v in obj.values():
+            if v.__class__ is dict or v.__class__ is list:
+                _applyHook(v, hook)
+        # endfor --
+        return hook(obj)
+    # endif --
+
+    if obj.__class__ is list:
+        for v in obj:
+            if v.__class__ is dict or v.__class__ is list:
+                _applyHook(v, hook)
+        # endfor --
+    # endif --
+
+    return obj
 
 
 def dumps(obj, flagPretty: bool = False, ensure_ascii: bool = False):
-    if flagPretty:
-        return json.dumps(obj, indent=4, ensure_ascii=ensure_ascii, cls=JSONDateTimeEncoder)
-    else:
-        return json.dumps(obj, ensure_ascii=ensure_ascii, cls=JSONDateTimeEncoder)
+    return _ENCODERS[bool(flagPretty), bool(ensure_ascii)](obj)
+
+
+def loads(obj, dateAttributes: bool | str | list | tuple | set = None):
+    """
+    Decodes a Json document, converting the ISO strings into dates (see decodeDate()).
+
+    Examples:
+        loads('{"created": "2021-03-04"}')                                  # {'created': date(2021, 3, 4)}
+        loads('{"created": "2021-03-04"}', dateAttributes=False)            # {'created': '2021-03-04'}
+        loads('{"created": "2021-03-04", "code": "2021-03-04"}', dateAttributes=['created'])
+
+    Args:
+        obj: the Json (str or bytes).
+        dateAttributes: True (all the attributes), False (no attribute), names of the attributes whose values are converted (at any
+            level of the document) or None (see setDateAttributes()).
+    """
+    hook = dateHook(dateAttributes)
+    if _decode is json.loads:
+        return json.loads(obj, object_hook=hook)
 
+    try:
+        val = _decode(obj)
+    except (ValueError, OverflowError):
+        # documento que o backend não aceita: o json padrão decodifica ou gera o erro
+        return json.loads(obj, object_hook=hook)
 
-def loads(obj):
-    return json.loads(obj, object_hook=datetime_decoder)
+    return val if hook is None else _applyHook(val, hook)
@@ -0,0 +1,470 @@
+"""
+jsketch
+
+Summaries of streams of values with bounded memory, used when the number of (distinct) values is too large to keep them all
+(see jDocument.topOccurrences(), countDistinct() and quantile()) or when the values arrive as a stream and are not kept.
+
+SpaceSaving keeps "capacity" counters and returns the most frequent values: every value whose frequency is greater than
+total / capacity is monitored, and the count of a value exceeds its true frequency by at most its error (<= total / capacity).
+CountMinSketch estimates the frequency of any value with a fixed table of counters (width x depth): the estimate never
+underestimates and exceeds the true frequency by at most 2 * total / width with probability 1 - 1 / 2 ** depth.
+HyperLogLog estimates the number of distinct values with 2 ** precision registers (16 KB with the default precision 14):
+the standard error is 1.04 / sqrt(2 ** precision), 0.81% with the default precision (the error is below 3 standard errors
+with probability 99.7%).
+KLLSketch keeps a sample of about 3 * capacity values of a stream of comparable values (numbers, strings or dates) and returns
+approximate quantiles: the rank of the returned value differs from the requested rank by at most about 2 / capacity of the
+number of values (1% with the default capacity 200) with high probability.
+
+HyperLogLog and KLLSketch can be merged (merge()), so the sketches of chunks of a list, of files or of processes can be combined;
+the hash of HyperLogLog does not depend on the process (unlike hash()), so the sketches can be pickled and merged anywhere.
+
+Classes:
+    SpaceSaving
+    CountMinSketch
+    HyperLogLog
+    KLLSketch
+
+Functions:
+    attributeValues(docs, attribute: str)
+"""
+from __future__ import annotations
+
+import math
+import random
+from hashlib import blake2b
+from heapq import heappush, heapreplace, nlargest
+from operator import itemgetter
+
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_SKETCH_CAPACITY = 1000  # contadores do SpaceSaving
+CONST_SKETCH_WIDTH = 2048  # colunas do CountMinSketch
+CONST_SKETCH_DEPTH = 4  # linhas do CountMinSketch
+CONST_HLL_PRECISION = 14  # 2 ** 14 registradores
+CONST_KLL_CAPACITY = 200  # itens do maior compactador do KLLSketch
+
+
+def attributeValues(docs, attribute: str):
+    """
+    Generates the filled values of an attribute of the documents (dict) of an iterable, e.g. a stream of documents read from a file.
+
+    Examples:
+        hll = HyperLogLog()
+        hll.update(attributeValues(stream, 'customer.id'))
+    """
+    steps = compilePath(attribute)
+    for obj in docs:
+        val = getPathDefault(obj, steps)
+        if val:
+            yield val
+    # endfor --
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of a stream: keeps at most "capacity" counters; when a new value arrives and all the counters are in use,
+    the value with the smallest count is replaced and the new value inherits its count (which becomes its error).
+
+    Examples:
+        summary = SpaceSaving(capacity=100)
+        for doc in stream:
+            summary.add(doc['type'])
+        summary.top(3)  # [('fruit', 2100, 0), ('vegetable', 1300, 0), ('dairy', 800, 12)]
+    """
+    __slots__ = ('capacity', 'counts', 'errors', 'heap', 'total', 'order')
+
+    def __init__(self, capacity: int = CONST_SKETCH_CAPACITY):
+        if capacity < 1:
+            raise Exception(f"Invalid capacity {capacity}, it must be greater than 0")
+
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []  # (contagem, ordem, valor) de cada valor monitorado, a contagem pode estar desatualizada (menor)
+        self.total = 0
+        self.order = 0  # desempate do heap, os valores podem não ser comparáveis
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {len(self.counts)}/{self.capacity} counters, {self.total} values"
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, val: any, count: int = 1):
+        """
+        Adds "count" occurrences of a (hashable) value.
+        """
+        self.total += count
+        counts = self.counts
+        if val in counts:
+            # o heap é corrigido apenas quando o valor chegar ao topo, veja abaixo
+            counts[val] += count
+            return
+
+        self.order += 1
+        if len(counts) < self.capacity:
+            counts[val] = count
+            self.errors[val] = 0
+            heappush(self.heap, (count, self.order, val))
+            return
+
+        # localiza o valor com a menor contagem, atualizando as entradas desatualizadas do heap
+        heap = self.heap
+        while True:
+            minCount, _, minVal = heap[0]
+            if counts[minVal] == minCount:
+                break
+
+            heapreplace(heap, (counts[minVal], heap[0][1], minVal))
+        # endwhile --
+
+        del counts[minVal]
+        del self.errors[minVal]
+        counts[val] = minCount + count
+        self.errors[val] = minCount
+        heapreplace(heap, (minCount + count, self.order, val))
+
+    def update(self, values):
+        """
+        Adds one occurrence of each value of an iterable.
+        """
+        for val in values:
+            self.add(val)
+
+    def top(self, k: int = None) -> list:
+        """
+        Returns the "k" values with the largest counts (all the monitored values if "k" is None), in descending order of count.
+
+        Returns:
+            list: (value, count, error) of each value; the true frequency is between count - error and count.
+        """
+        if k is None:
+            items = sorted(self.counts.items(), key=itemgetter(1), reverse=True)
+        else:
+            items = nlargest(k, self.counts.items(), key=itemgetter(1))
+
+        return [(val, count, self.errors[val]) for val, count in items]
+
+
+class CountMinSketch:
+    """
+    Count-min sketch: estimates the frequency of the values of a stream with a fixed table of width x depth counters.
+    The hash of the values (hash()) changes between processes for strings, so the sketches can only be merged in the same process.
+
+    Examples:
+        sketch = CountMinSketch()
+        for doc in stream:
+            sketch.add(doc['customer'])
+        sketch.estimate('ACME')     # 1532
+    """
+    __slots__ = ('width', 'depth', 'table', 'total')
+
+    def __init__(self, width: int = CONST_SKETCH_WIDTH, depth: int = CONST_SKETCH_DEPTH):
+        if width < 1 or depth < 1:
+            raise Exception(f"Invalid width/depth {width}/{depth}, they must be greater than 0")
+
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {self.width}x{self.depth} counters, {self.total} values"
+
+    def _columns(self, val: any) -> list:
+        # uma coluna por linha, cada linha com um hash diferente do valor
+        return [hash((row, val)) % self.width for row in range(self.depth)]
+
+    def add(self, val: any, count: int = 1):
+        """
+        Adds "count" occurrences of a (hashable) value.
+        """
+        self.total += count
+        for row, col in zip(self.table, self._columns(val)):
+            row[col] += count
+
+    def update(self, values):
+        """
+        Adds one occurrence of each value of an iterable.
+        """
+        for val in values:
+            self.add(val)
+
+    def estimate(self, val: any) -> int:
+        """
+        Returns the estimated frequency of a value (never less than the true frequency).
+        """
+        return min(row[col] for row, col in zip(self.table, self._columns(val)))
+
+    def merge(self, other: CountMinSketch) -> CountMinSketch:
+        """
+        Adds the counters of another sketch with the same width and depth (built in the same process).
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise Exception("Err: the sketches must have the same width and depth!")
+
+        for row, otherRow in zip(self.table, other.table):
+            for i, count in enumerate(otherRow):
+                row[i] += count
+        # endfor --
+
+        self.total += other.total
+        return self
+
+
+def _hllSigma(x: float) -> float:
+    # sigma(x) = x + sum(x ** (2 ** k) * 2 ** (k - 1)), correção dos registradores vazios
+    if x == 1:
+        return math.inf
+
+    y, z = 1.0, x
+    while True:
+        x *= x
+        zPrevious = z
+        z += x * y
+        y += y
+        if z == zPrevious:
+            return z
+    # endwhile --
+
+
+def _hllTau(x: float) -> float:
+    # tau(x) = (1 - x - sum((1 - x ** (2 ** -k)) ** 2 * 2 ** -k)) / 3, correção dos registradores no valor máximo
+    if x in (0, 1):
+        return 0.0
+
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        zPrevious = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == zPrevious:
+            return z / 3
+    # endwhile --
+
+
+class HyperLogLog:
+    """
+    HyperLogLog: estimates the number of distinct values of a stream with 2 ** precision registers of one byte.
+    The values are compared as in a set, 1, 1.0 and True are the same value.
+
+    Examples:
+        hll = HyperLogLog()
+        hll.update(['a', 'b', 'a'])
+        hll.count()     # 2
+
+        # sketches of two chunks
+        hll.merge(otherHll)
+    """
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = CONST_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise Exception(f"Invalid precision {precision}, it must be between 4 and 18")
+
+        self.precision = precision
+        self.registers = bytearray(2 ** precision)
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {len(self.registers)} registers, ~{self.count()} distinct values"
+
+    @staticmethod
+    def hash(val: any) -> int:
+        """
+        Returns the 64 bits hash of a value, the same in any process.
+        """
+        if isinstance(val, str):
+            data = b's' + val.encode('utf-8', 'surrogatepass')
+
+        elif isinstance(val, (int, float)):
+            # valores numéricos iguais (1, 1.0, True) têm o mesmo hash, como num set
+            if isinstance(val, float) and val.is_integer():
+                val = int(val)
+            data = b'n' + repr(int(val) if isinstance(val, bool) else val).encode()
+
+        else:
+            data = b'o' + repr(val).encode('utf-8', 'surrogatepass')
+        # endif --
+
+        return int.from_bytes(blake2b(data, digest_size=8).digest(), 'big')
+
+    def add(self, val: any):
+        """
+        Adds a value.
+        """
+        h = self.hash(val)
+        bits = 64 - self.precision
+        rest = h & ((1 << bits) - 1)
+        rank = bits - rest.bit_length() + 1  # posição do primeiro bit 1 dos bits restantes
+        i = h >> bits
+        if rank > self.registers[i]:
+            self.registers[i] = rank
+
+    def update(self, values):
+        """
+        Adds the values of an iterable.
+        """
+        for val in values:
+            self.add(val)
+
+    def count(self) -> int:
+        """
+        Returns the estimated number of distinct values.
+        The estimator of Ertl (2017) uses the histogram of the registers and has no bias from a few values to billions, without
+        switching to the linear counting of the empty registers (the classic estimator has a bias of about 1% near 2.5 * 2 ** precision).
+        """
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = [0] * (q + 2)
+        for r in self.registers:
+            histogram[r] += 1
+        # endfor --
+
+        if histogram[0] == m:
+            return 0
+
+        z = m * _hllTau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        # endfor --
+        z += m * _hllSigma(histogram[0] / m)
+
+        return round(m * m / (2 * math.log(2) * z))
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """
+        Adds the values of another sketch with the same precision.
+        """
+        if other.precision != self.precision:
+            raise Exception("Err: the sketches must have the same precision!")
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+
+class KLLSketch:
+    """
+    KLL sketch: approximate quantiles of a stream of comparable values, keeping about 3 * capacity values.
+    The values are kept in a hierarchy of compactors, the values of the level h represent 2 ** h values of the stream each; when
+    a compactor is full its values are sorted and half of them (the even or the odd positions, at random) go to the next level.
+
+    Examples:
+        kll = KLLSketch()
+        kll.update(prices)
+        kll.quantile([0.5, 0.95, 0.99])     # [20.81, 29.02, 29.86]
+        kll.merge(otherKll)
+    """
+    __slots__ = ('capacity', 'compactors', 'size', 'maxSize', 'total', 'rng')
+
+    def __init__(self, capacity: int = CONST_KLL_CAPACITY, seed: int = 0):
+        if capacity < 8:
+            raise Exception(f"Invalid capacity {capacity}, it must be at least 8")
+
+        self.capacity = capacity
+        self.compactors = []
+        self.size = 0
+        self.maxSize = 0
+        self.total = 0
+        self.rng = random.Random(seed)
+        self._grow()
+
+    def __repr__(self):
+        return f"{__class__.__name__} : {self.size} items, {self.total} values"
+
+    def __len__(self):
+        return self.total
+
+    def _levelCapacity(self, level: int) -> int:
+        # os níveis mais baixos guardam menos itens (2/3 a cada nível abaixo do mais alto)
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil((2 / 3) ** depth * self.capacity)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self.maxSize = sum(self._levelCapacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) >= self._levelCapacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+
+                compactor.sort()
+                keep = [compactor.pop()] if len(compactor) % 2 else []
+                self.compactors[level + 1].extend(compactor[self.rng.randint(0, 1)::2])
+                self.compactors[level] = keep
+                self.size = sum(len(c) for c in self.compactors)
+                if self.size < self.maxSize:
+                    break
+            # endif --
+        # endfor --
+
+    def add(self, val: any):
+        """
+        Adds a value.
+        """
+        self.compactors[0].append(val)
+        self.size += 1
+        self.total += 1
+        if self.size >= self.maxSize:
+            self._compress()
+
+    def update(self, values):
+        """
+        Adds the values of an iterable.
+        """
+        for val in values:
+            self.add(val)
+
+    def merge(self, other: KLLSketch) -> KLLSketch:
+        """
+        Adds the values of another sketch (with the same capacity).
+        """
+        if other.capacity != self.capacity:
+            raise Exception("Err: the sketches must have the same capacity!")
+
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+
+        self.size = sum(len(c) for c in self.compactors)
+        self.total += other.total
+        while self.size >= self.maxSize:
+            self._compress()
+
+        return self
+
+    def quantile(self, q: float | list) -> any:
+        """
+        Returns the approximate quantile "q" (0 <= q <= 1) of the values, or the list of quantiles if "q" is a list;
+        "None" if the sketch is empty.
+        """
+        lstQ = q if isinstance(q, (list, tuple)) else [q]
+        for qt in lstQ:
+            if not 0 <= qt <= 1:
+                raise Exception(f"Invalid quantile {qt}, it must be between 0 and 1")
+
+        if not self.total:
+            return [None] * len(lstQ) if isinstance(q, (list, tuple)) else None
+
+        # itens ordenados com o peso do seu nível
+        items = sorted(((val, 2 ** level) for level, compactor in enumerate(self.compactors) for val in compactor), key=itemgetter(0))
+        weight = sum(w for _, w in items)
+
+        result = []
+        for qt in lstQ:
+            target = qt * weight
+            cumulative = 0
+            for val, w in items:
+                cumulative += w
+                if cumulative >= target:
+                    break
+            # endfor --
+            result.append(val)
+        # endfor --
+
+        return result if isinstance(q, (list, tuple)) else result[0]
@@ -0,0 +1,350 @@
+"""
+jsort
+
+Sort keys of the documents of an array jDocument, used by sortDocs() and topDocs(): the key of each document is built once,
+a tuple with the keys of all the sort attributes, so the list is sorted by all the attributes with a single (stable) sort.
+Values of different types are never compared directly: each value is ordered first by its family (numbers, strings,
+dates, others) and then by its value; the documents without the attribute (or with None) are placed at the end, in both orders.
+The same keys sort files larger than the memory (JSON Lines, one document per line): sortJsonl() sorts runs of lines that
+fit in the memory, spills each run (with the keys) to a temporary file and merges the runs with heapq.merge(); iterMerge()
+and mergeJsonl() merge lists (or jDocuments) and files that are already sorted.
+
+Functions:
+    parseSortKeys(attribute: str | dict | list) -> list
+    valueKey(val: any) -> tuple
+    descendingKey(val: any) -> tuple
+    sortKey(lstSortKeys: list)
+    positionKey(lstSortKeys: list, readers: list)
+    isDescending(lstSortKeys: list) -> bool
+    sortJsonl(inputFile: str, outputFile: str, attribute: str | dict | list, memoryLimit: int = CONST_SORT_MEMORY_LIMIT, tempDir: str = None) -> int
+    iterMerge(sources: list, attribute: str | dict | list)
+    mergeJsonl(sources: list, outputFile: str, attribute: str | dict | list) -> int
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from datetime import date, datetime, time, timezone
+from heapq import merge
+from operator import itemgetter
+
+from jDocument import jsjson as js
+from jDocument.jpath import compilePath, getPathDefault
+
+CONST_SORT_ASC = 1
+CONST_SORT_DESC = -1
+
+CONST_FAMILY_NUMBER = 0
+CONST_FAMILY_STRING = 1
+CONST_FAMILY_DATE = 2
+CONST_FAMILY_OTHER = 3
+
+CONST_SORT_MEMORY_LIMIT = 64 * 1024 * 1024  # tamanho (caracteres) das linhas de cada run de sortJsonl()
+CONST_SORT_MAX_RUNS = 128  # número máximo de arquivos temporários abertos ao mesmo tempo
+
+_PRESENT = 0  # os documentos sem o atributo ficam no final (1 na ordem crescente, -1 na decrescente)
+_MISSING_ASC = (1, 0, 0)
+_MISSING_DESC = (-1, 0, 0)
+
+
+def parseSortKeys(attribute: str | dict | list) -> list:
+    """
+    Returns the attributes of a sort as a list of tuples (name, compiled path, flagDesc).
+    An attribute can be a name (ascending order) or a dictionary with names and orders (1 ascending, -1 descending).
+    """
+    lstSortKeys = []
+    for key in ([attribute] if isinstance(attribute, (str, dict)) else attribute):
+        for at, order in ({key: CONST_SORT_ASC} if isinstance(key, str) else key).items():
+            lstSortKeys.append((at, compilePath(at), order != CONST_SORT_ASC))
+    # endfor --
+
+    if not lstSortKeys:
+        raise Exception("Err: no attribute to sort!")
+
+    return lstSortKeys
+
+
+def valueKey(val: any) -> tuple:
+    """
+    Returns the key of a (not None) value: its family (numbers, strings, dates, others) and a value comparable to the other values of the family.
+    """
+    cls = val.__class__
+    if cls is int or cls is float or cls is bool:
+        return _PRESENT, CONST_FAMILY_NUMBER, val
+
+    if cls is str:
+        return _PRESENT, CONST_FAMILY_STRING, val
+
+    if isinstance(val, datetime):
+        # as datas com fuso horário são comparadas em UTC com as datas sem fuso
+        return _PRESENT, CONST_FAMILY_DATE, val.astimezone(timezone.utc).replace(tzinfo=None) if val.tzinfo else val
+
+    if isinstance(val, date):
+        return _PRESENT, CONST_FAMILY_DATE, datetime.combine(val, time())
+
+    if isinstance(val, (int, float)):
+        return _PRESENT, CONST_FAMILY_NUMBER, val
+
+    # listas, objetos, ...: pela sua representação
+    return _PRESENT, CONST_FAMILY_OTHER, repr(val)
+
+
+def descendingKey(val: any) -> tuple:
+    """
+    Returns the key of a (not None) value in descending order: the inverse of valueKey(), so that a single ascending sort can
+    mix attributes in ascending and in descending order.
+    """
+    present, family, val = valueKey(val)
+    if family == CONST_FAMILY_NUMBER:
+        val = -val
+
+    elif family == CONST_FAMILY_DATE:
+        val = datetime.min - val
+
+    else:
+        # os códigos dos caracteres negativos e uma marca final maior que todos eles ('ab' antes de 'a')
+        val = tuple([-ord(ch) for ch in val]) + (1,)
+    # endif --
+
+    return present, -family, val
+
+
+def isDescending(lstSortKeys: list) -> bool:
+    """
+    Returns True if all the attributes of the sort are in descending order: the list is sorted with reverse=True and the keys are not inverted.
+    """
+    return all(flagDesc for _, _, flagDesc in lstSortKeys)
+
+
+def sortKey(lstSortKeys: list):
+    """
+    Returns the key function of the documents for a sort (see parseSortKeys()), to be used with reverse=isDescending(lstSortKeys).
+
+    Examples:
+        lstSortKeys = parseSortKeys(['type', {'features.price': -1}])
+        lstDocs.sort(key=sortKey(lstSortKeys), reverse=isDescending(lstSortKeys))
+    """
+    flagReverse = isDescending(lstSortKeys)
+    missing = _MISSING_DESC if flagReverse else _MISSING_ASC
+
+    if len(lstSortKeys) == 1:
+        # um único atributo, o caso mais comum
+        steps = lstSortKeys[0][1]
+
+        def key(obj: any) -> tuple:
+            val = getPathDefault(obj, steps)
+            return missing if val is None else valueKey(val)
+
+        return key
+    # endif --
+
+    # as chaves dos atributos (3 itens cada) ficam numa única tupla, mais rápida de comparar; com ordens diferentes as chaves
+    # dos atributos em ordem decrescente são invertidas
+    flagMixed = not flagReverse and any(flagDesc for _, _, flagDesc in lstSortKeys)
+    lstSteps = [(steps, descendingKey if flagDesc and flagMixed else valueKey) for _, steps, flagDesc in lstSortKeys]
+
+    def key(obj: any) -> tuple:
+        lstKey = []
+        for steps, func in lstSteps:
+            val = getPathDefault(obj, steps)
+            lstKey += missing if val is None else func(val)
+        # endfor --
+
+        return tuple(lstKey)
+
+    return key
+
+
+def positionKey(lstSortKeys: list, readers: list):
+    """
+    Returns the key function of the positions of the documents of a list for a sort, the same keys of sortKey(): the value of each
+    attribute at a position is returned by its reader (e.g. a column of the list, see jcolumn.Column.reader()).
+
+    Examples:
+        order = sorted(range(len(lstDocs)), key=positionKey(lstSortKeys, readers), reverse=isDescending(lstSortKeys))
+    """
+    flagReverse = isDescending(lstSortKeys)
+    missing = _MISSING_DESC if flagReverse else _MISSING_ASC
+
+    if len(lstSortKeys) == 1:
+        read = readers[0]
+
+        def key(i: int) -> tuple:
+            val = read(i)
+            return missing if val is None else valueKey(val)
+
+        return key
+    # endif --
+
+    flagMixed = not flagReverse and any(flagDesc for _, _, flagDesc in lstSortKeys)
+    lstReaders = [(read, descendingKey if flagDesc and flagMixed else valueKey) for read, (_, _, flagDesc) in zip(readers, lstSortKeys)]
+
+    def key(i: int) -> tuple:
+        lstKey = []
+        for read, func in lstReaders:
+            val = read(i)
+            lstKey += missing if val is None else func(val)
+        # endfor --
+
+        return tuple(lstKey)
+
+    return key
+
+
+def _readLines(filename: str):
+    # gera as linhas (não vazias) de um arquivo JSON Lines, sempre terminadas por '\n'
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line if line.endswith('\n') else line + '\n'
+    # endfor --
+
+
+def _writeRun(entries: list, tempDir: str | None):
+    # grava um run (chave, linha) num arquivo temporário, que é apagado ao ser fechado
+    run = tempfile.TemporaryFile(dir=tempDir)
+    pickler = pickle.Pickler(run, pickle.HIGHEST_PROTOCOL)
+    for entry in entries:
+        pickler.dump(entry)
+
+    run.seek(0)
+    return run
+
+
+def _readRun(run):
+    # gera os pares (chave, linha) de um run e fecha o arquivo
+    unpickler = pickle.Unpickler(run)
+    try:
+        while True:
+            yield unpickler.load()
+    except EOFError:
+        pass
+    finally:
+        run.close()
+
+
+def sortJsonl(inputFile: str, outputFile: str, attribute: str | dict | list, memoryLimit: int = CONST_SORT_MEMORY_LIMIT,
+              tempDir: str = None) -> int:
+    """
+    Sorts a JSON Lines file (one document per line) that can be larger than the memory, with the same order of jDocument.sortDocs().
+    The lines are read in runs of about "memoryLimit" characters, each run is sorted in memory and spilled, with the keys, to a
+    temporary file; the runs are merged with heapq.merge() (at most CONST_SORT_MAX_RUNS at a time). The sort is stable and the
+    lines are written as they were read.
+
+    Examples:
+        sortJsonl('export.jsonl', 'export_sorted.jsonl', 'timestamp')
+        sortJsonl('export.jsonl', 'export_sorted.jsonl', ['customer.id', {'timestamp': -1}], memoryLimit=256 * 1024 * 1024)
+
+    Args:
+        inputFile: name of the JSON Lines file to be sorted.
+        outputFile: name of the sorted file, it can not be the input file.
+        attribute (str|dict|list): attributes of the ordering, see jDocument.sortDocs().
+        memoryLimit: approximate size (characters) of the lines of each run.
+        tempDir: directory of the temporary files, when "None" the default of the system.
+
+    Returns:
+        int: the number of documents written.
+    """
+    if os.path.abspath(inputFile) == os.path.abspath(outputFile):
+        raise Exception("Err: the output file must be different from the input file!")
+
+    lstSortKeys = parseSortKeys(attribute)
+    key = sortKey(lstSortKeys)
+    flagReverse = isDescending(lstSortKeys)
+    getKey = itemgetter(0)
+
+    runs = []
+    entries = []
+    size = 0
+    for line in _readLines(inputFile):
+        entries.append((key(js.loads(line)), line))
+        size += len(line)
+        if size >= memoryLimit:
+            entries.sort(key=getKey, reverse=flagReverse)
+            runs.append(_writeRun(entries, tempDir))
+            entries = []
+            size = 0
+        # endif --
+    # endfor --
+
+    entries.sort(key=getKey, reverse=flagReverse)
+    if runs:
+        if entries:
+            runs.append(_writeRun(entries, tempDir))
+
+        # os runs são combinados em grupos consecutivos, para manter a ordem dos iguais
+        while len(runs) > CONST_SORT_MAX_RUNS:
+            runs = [_writeRun(merge(*map(_readRun, runs[i:i + CONST_SORT_MAX_RUNS]), key=getKey, reverse=flagReverse), tempDir)
+                    for i in range(0, len(runs), CONST_SORT_MAX_RUNS)]
+        # endwhile --
+
+        entries = merge(*map(_readRun, runs), key=getKey, reverse=flagReverse)
+    # endif --
+
+    q = 0
+    with open(outputFile, 'w', encoding='utf-8') as f:
+        for _, line in entries:
+            f.write(line)
+            q += 1
+
+    return q
+
+
+def _iterSource(source) -> any:
+    # gera os pares (documento, linha ou None) de uma lista, de um jDocument ou de um arquivo JSON Lines
+    if isinstance(source, (str, os.PathLike)):
+        for line in _readLines(source):
+            yield js.loads(line), line
+    else:
+        for obj in (source if isinstance(source, list) else source.value()):
+            yield obj, None
+    # endif --
+
+
+def _mergeSources(sources: list, attribute: str | dict | list):
+    lstSortKeys = parseSortKeys(attribute)
+    key = sortKey(lstSortKeys)
+
+    return merge(*map(_iterSource, sources), key=lambda entry: key(entry[0]), reverse=isDescending(lstSortKeys))
+
+
+def iterMerge(sources: list, attribute: str | dict | list):
+    """
+    Merges lists of documents (or array jDocuments) and JSON Lines files already sorted by the attributes (see jDocument.sortDocs()),
+    generating the documents in order, one by one. The documents with the same keys keep the order of the sources.
+
+    Examples:
+        jAll = jDocument(list(iterMerge([jMonday, jTuesday, 'wednesday.jsonl'], 'timestamp')))
+
+    Args:
+        sources: lists, jDocuments or names of JSON Lines files, each one sorted.
+        attribute (str|dict|list): attributes of the ordering, see jDocument.sortDocs().
+    """
+    for obj, _ in _mergeSources(sources, attribute):
+        yield obj
+
+
+def mergeJsonl(sources: list, outputFile: str, attribute: str | dict | list) -> int:
+    """
+    Merges lists of documents (or array jDocuments) and JSON Lines files already sorted by the attributes (see jDocument.sortDocs())
+    into a JSON Lines file. The lines of the files are written as they were read.
+
+    Examples:
+        mergeJsonl(['part1_sorted.jsonl', 'part2_sorted.jsonl'], 'all_sorted.jsonl', 'timestamp')
+
+    Args:
+        sources: lists, jDocuments or names of JSON Lines files, each one sorted.
+        outputFile: name of the JSON Lines file.
+        attribute (str|dict|list): attributes of the ordering, see jDocument.sortDocs().
+
+    Returns:
+        int: the number of documents written.
+    """
+    q = 0
+    with open(outputFile, 'w', encoding='utf-8') as f:
+        for obj, line in _mergeSources(sources, attribute):
+            f.write(js.dumps(obj) + '\n' if line is None else line)
+            q += 1
+
+    return q
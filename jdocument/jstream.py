@@ -0,0 +1,355 @@
+"""
+jstream
+
+Incremental reading of large Json files: the elements of an array (the whole document or the array at a path of the document,
+e.g. 'data') are decoded one at a time from a buffer of the file, so the memory depends on the size of an element and not on
+the size of the file. The elements are decoded as in jsjson.loads() (dates converted as selected by jsjson.setDateAttributes()).
+The values of the document before the array (other attributes) are skipped without being decoded.
+
+JSON Lines (NDJSON, one document per line) are read and written line by line through buffered files: iterJsonl() decodes
+the lines one at a time or, when the number of workers (or an Executor) is informed, in batches of lines decoded by a pool of
+processes (the shared pool of jparallel.getPool(), at most 2 batches per worker in memory); writeJsonl() writes the documents in blocks of lines, the whole output
+is never built in memory.
+
+Classes:
+    JsonReader
+
+Functions:
+    iterJsonArray(file, prefix: str = None, chunkSize: int = CONST_STREAM_CHUNK_SIZE)
+    iterJsonl(file, parallel: int | Executor = None, batchSize: int = CONST_JSONL_BATCH_SIZE, workers: int = None)
+    writeJsonl(docs, file) -> int
+"""
+from __future__ import annotations
+
+import io
+import os
+import re
+from collections import deque
+from concurrent.futures import Executor
+
+from jDocument import jsjson as js
+from jDocument.jparallel import resolveExecutor
+
+CONST_STREAM_CHUNK_SIZE = 1024 * 1024  # caracteres lidos do arquivo de cada vez
+CONST_STREAM_BUFFER_SIZE = 1024 * 1024  # buffer dos arquivos JSON Lines
+CONST_JSONL_BATCH_SIZE = 5000  # linhas decodificadas por um worker de cada vez
+CONST_JSONL_WRITE_LINES = 1000  # linhas gravadas de cada vez
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_CHARS = '0123456789.eE+-'
+# trechos de um valor que é pulado: texto sem aspas nem delimitadores, um string completo ou um delimitador
+_SKIP_TOKEN = re.compile(r'[^"\[\]{}]+|"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+
+
+class JsonReader:
+    """
+    Reads the Json values of a text file one at a time, keeping in memory only the part of the file that was not read yet.
+
+    Examples:
+        reader = JsonReader(f)
+        reader.expect('[')
+        obj = reader.decode()
+    """
+    __slots__ = ('file', 'chunkSize', 'buffer', 'pos', 'offset', 'eof', 'decoder', 'keyDecoder')
+
+    def __init__(self, file, chunkSize: int = CONST_STREAM_CHUNK_SIZE):
+        self.file = file
+        self.chunkSize = chunkSize
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0  # caracteres já descartados do buffer: a posição no arquivo é offset + pos
+        self.eof = False
+        self.decoder = js.json.JSONDecoder(object_hook=js.dateHook())
+        self.keyDecoder = js.json.JSONDecoder()
+
+    def _read(self, size: int) -> bool:
+        # descarta o que já foi lido e adiciona ao buffer mais "size" caracteres do arquivo, retorna False no fim do arquivo
+        if self.eof:
+            return False
+
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.offset += self.pos
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skips the whitespaces and returns the next character, '' at the end of the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self._read(self.chunkSize):
+                return ''
+        # endwhile --
+
+    def expect(self, chars: str) -> str:
+        """
+        Skips the whitespaces and reads the next character, that must be one of "chars".
+        """
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise Exception(f"Err: invalid Json, expected {' or '.join(repr(c) for c in chars)} and found {repr(ch) if ch else 'the end of the file'}!")
+
+        self.pos += 1
+        return ch
+
+    def decode(self, flagKey: bool = False) -> any:
+        """
+        Skips the whitespaces and decodes the next value (a key of an object when flagKey=True, without converting dates).
+        """
+        if not self.peek():
+            raise Exception("Err: invalid Json, unexpected end of the file!")
+
+        decoder = self.keyDecoder if flagKey else self.decoder
+        size = self.chunkSize
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buffer, self.pos)
+                # um número no fim do buffer pode continuar no próximo trecho do arquivo ("-5" de "-5e-08")
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in _NUMBER_CHARS):
+                    self.pos = end
+                    return obj
+            except ValueError:
+                if self.eof:
+                    raise
+
+            # o valor não está todo no buffer: lê trechos cada vez maiores, para que um valor grande seja decodificado poucas vezes
+            if not self._read(size):
+                continue
+
+            size = max(size, len(self.buffer))
+        # endwhile --
+
+    def skip(self):
+        """
+        Skips the next value without decoding it.
+        """
+        ch = self.peek()
+        if ch not in '[{':
+            self.decode()
+            return
+
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN.match(self.buffer, self.pos)
+            if match is None:
+                # string incompleto no fim do buffer
+                if not self._read(self.chunkSize):
+                    raise Exception("Err: invalid Json, unexpected end of the file!")
+                continue
+            # endif --
+
+            self.pos = match.end()
+            token = match.group()
+            if token in '[{':
+                depth += 1
+            elif token in ']}':
+                depth -= 1
+                if not depth:
+                    return
+            # endif --
+
+            if self.pos >= len(self.buffer) and not self._read(self.chunkSize):
+                raise Exception("Err: invalid Json, unexpected end of the file!")
+        # endwhile --
+
+    def seekPath(self, prefix: str):
+        """
+        Moves to the value of the attribute "prefix" (dot notation for attributes of subdocuments) of the object that starts at the next value.
+        """
+        for step in prefix.split('.'):
+            self.expect('{')
+            if self.peek() == '}':
+                raise Exception(f"Err: the attribute '{prefix}' does not exist!")
+
+            while True:
+                key = self.decode(flagKey=True)
+                self.expect(':')
+                if key == step:
+                    break
+
+                self.skip()
+                if self.expect(',}') == '}':
+                    raise Exception(f"Err: the attribute '{prefix}' does not exist!")
+            # endwhile --
+        # endfor --
+
+
+def iterJsonArray(file, prefix: str = None, chunkSize: int = CONST_STREAM_CHUNK_SIZE):
+    """
+    Generates the elements of the Json array of a file (the whole document or the array at the path "prefix"), decoding one element at a time.
+
+    Examples:
+        for obj in iterJsonArray('orders.json'):
+            ...
+
+        for obj in iterJsonArray('page.json', prefix='data'):
+            ...
+
+    Args:
+        file: name of the file or a file (text) already opened.
+        prefix: path (dot notation) of the array in the document, when "None" the document itself is the array.
+        chunkSize: number of characters read from the file at a time.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, encoding='utf-8') as f:
+            yield from iterJsonArray(f, prefix, chunkSize)
+        return
+    # endif --
+
+    reader = JsonReader(file, chunkSize)
+    hook = reader.decoder.object_hook
+    if prefix:
+        reader.seekPath(prefix)
+        key = prefix.rsplit('.', 1)[-1]
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+
+    while True:
+        obj = reader.decode()
+        if prefix and hook is not None and not isinstance(obj, dict):
+            # como em jsjson.loads(): o objeto que contém o array converte as datas dos seus elementos (os objetos já foram convertidos)
+            obj = hook({key: [obj]})[key][0]
+
+        yield obj
+        if reader.expect(',]') == ']':
+            return
+    # endwhile --
+
+
+def _decodeLines(lines: list, backend: str, dateAttributes: any) -> list:
+    # decodifica um lote de linhas (num worker do pool compartilhado, com o backend e as datas selecionados no processo principal)
+    if js.getBackend() != backend:
+        js.setBackend(backend)
+
+    return [js.loads(line, dateAttributes) for line in lines]
+
+
+def _iterBatches(f, batchSize: int):
+    # gera lotes de linhas não vazias
+    batch = []
+    for line in f:
+        if line.strip():
+            batch.append(line)
+            if len(batch) >= batchSize:
+                yield batch
+                batch = []
+        # endif --
+    # endfor --
+
+    if batch:
+        yield batch
+
+
+def iterJsonl(file, parallel: int | Executor = None, batchSize: int = CONST_JSONL_BATCH_SIZE, workers: int = None):
+    """
+    Generates the documents of a JSON Lines file (one document per line, the empty lines are ignored), in the order of the file.
+    The lines are decoded as in jsjson.loads() (dates converted as selected by jsjson.setDateAttributes()).
+
+    Examples:
+        for obj in iterJsonl('orders.jsonl'):
+            ...
+
+        # lines decoded by 4 processes
+        lstOrders = list(iterJsonl('orders.jsonl', parallel=4))
+
+    Args:
+        file: name of the file or a file (text or binary) already opened.
+        parallel: number of worker processes (or an Executor) that decode batches of lines, when "None" the lines are decoded one at a time.
+        batchSize: number of lines of each batch.
+        workers: number of workers of the informed Executor, when "None" the number of CPUs.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, encoding='utf-8', buffering=CONST_STREAM_BUFFER_SIZE) as f:
+            yield from iterJsonl(f, parallel, batchSize, workers)
+        return
+    # endif --
+
+    if not parallel:
+        loads = js.loads
+        for line in file:
+            if line.strip():
+                yield loads(line)
+        # endfor --
+        return
+    # endif --
+
+    executor, workers = resolveExecutor(parallel, workers)
+    backend, dateAttributes = js.getBackend(), js.getDateAttributes()
+
+    # no máximo 2 lotes por worker aguardando, para que a memória não dependa do tamanho do arquivo
+    pending = deque()
+    try:
+        for batch in _iterBatches(file, batchSize):
+            pending.append(executor.submit(_decodeLines, batch, backend, dateAttributes))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        # endfor --
+
+        while pending:
+            yield from pending.popleft().result()
+
+    finally:
+        # o pool é compartilhado: apenas os lotes que não serão lidos são cancelados
+        for future in pending:
+            future.cancel()
+
+
+def writeJsonl(docs, file) -> int:
+    """
+    Writes the documents in a JSON Lines file (one document per line), encoded as in jsjson.dumps(). The lines are written in blocks,
+    so the memory does not depend on the number of documents.
+
+    Examples:
+        writeJsonl(lstOrders, 'orders.jsonl')
+
+    Args:
+        docs: iterable of documents (dict, list or any value that can be encoded).
+        file: name of the file or a file (text or binary) already opened.
+
+    Returns:
+        int: the number of lines written.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'w', encoding='utf-8', buffering=CONST_STREAM_BUFFER_SIZE) as f:
+            return writeJsonl(docs, f)
+    # endif --
+
+    if isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+        # arquivo binário: grava em UTF-8, sem fechar o arquivo
+        f = io.TextIOWrapper(file, encoding='utf-8')
+        try:
+            return writeJsonl(docs, f)
+        finally:
+            f.flush()
+            f.detach()
+    # endif --
+
+    # um único encoder para todas as linhas, o mesmo resultado de jsjson.dumps()
+    dumps = js.JSONDateTimeEncoder(ensure_ascii=False).encode
+    q = 0
+    lines = []
+    for obj in docs:
+        lines.append(dumps(obj))
+        if len(lines) >= CONST_JSONL_WRITE_LINES:
+            file.write('\n'.join(lines) + '\n')
+            q += len(lines)
+            lines = []
+        # endif --
+    # endfor --
+
+    if lines:
+        file.write('\n'.join(lines) + '\n')
+        q += len(lines)
+
+    return q
@@ -0,0 +1,218 @@
+"""
+jview
+
+Views of an array jDocument: groupings (see jDocument.groupBy()) whose groups are kept up to date document by document.
+Each inserted, removed or replaced document updates only the group of its keys (constant time), so the result of the view is
+read without scanning the list. Only the functions that can be undone when a document is removed are allowed (see CONST_VIEW_FUNCTIONS):
+count, sum, mean (sum / count), ocorrences and countDistinct; min, max, median, ... would need the values of the group.
+The sums of floats are updated by additions and subtractions, so after many changes they can differ in the last digits from
+the sum computed again (groupBy()).
+A change that can not be applied to the groups (e.g. a value that is not a number in a 'sum' view) marks the view as stale: the
+view is rebuilt from the list on its next use, where the error is raised as in groupBy(), so a view never shows a partial change.
+
+Classes:
+    ViewAccumulator
+    View
+"""
+from __future__ import annotations
+
+from collections import Counter
+
+from jDocument.jaggregate import parseGroupKeys, parseAggregations, groupKey, copyKeyValues, rowPath
+from jDocument.jpath import getPathDefault, setPathValue
+
+CONST_VIEW_FUNCTIONS = ('count', 'sum', 'mean', 'ocorrences', 'countDistinct')
+
+
+class ViewAccumulator:
+    """
+    Accumulates the filled values of an attribute of a group, values can be added and removed.
+
+    Examples:
+        acc = ViewAccumulator(['sum', 'ocorrences'])
+        acc.add(10)
+        acc.add(20)
+        acc.remove(10)
+        acc.result()  # {'sum': 20, 'ocorrences': {20: 1}}
+    """
+    __slots__ = ('functions', 'count', 'total', 'counter', 'flagSum')
+
+    def __init__(self, functions: list | tuple):
+        self.functions = functions
+        self.count = 0
+        self.total = 0
+        self.counter = Counter() if 'ocorrences' in functions or 'countDistinct' in functions else None
+        self.flagSum = 'sum' in functions or 'mean' in functions  # apenas a soma exige valores numéricos
+
+    def add(self, val: any):
+        """
+        Adds a (filled) value.
+        """
+        if self.flagSum:
+            self.total += val
+        if self.counter is not None:
+            self.counter[val] += 1
+        self.count += 1
+
+    def remove(self, val: any):
+        """
+        Removes a (filled) value that was added.
+        """
+        if self.flagSum:
+            self.total -= val
+        self.count -= 1
+        if self.counter is not None:
+            if self.counter[val] > 1:
+                self.counter[val] -= 1
+            else:
+                del self.counter[val]
+        # endif --
+
+    def result(self) -> dict:
+        """
+        Returns the result of each function, "None" when there are no values (except for 'count').
+        """
+        result = {}
+        for name in self.functions:
+            if not self.count:
+                result[name] = 0 if name == 'count' else None
+            elif name == 'count':
+                result[name] = self.count
+            elif name == 'sum':
+                result[name] = self.total
+            elif name == 'mean':
+                result[name] = self.total / self.count
+            elif name == 'ocorrences':
+                result[name] = dict(self.counter)
+            else:
+                result[name] = len(self.counter)
+        # endfor --
+
+        return result
+
+
+class View:
+    """
+    Grouping of the documents of a list kept up to date document by document, see jDocument.createView().
+    The keys and the aggregations are the same of jDocument.groupBy(), with the functions of CONST_VIEW_FUNCTIONS.
+    """
+    __slots__ = ('name', 'keys', 'aggregations', 'attributes', 'groups', 'stale')
+
+    def __init__(self, name: str, keys: str | dict | list, aggregations: dict = None):
+        self.name = name
+        self.keys = parseGroupKeys(keys)
+        self.aggregations = parseAggregations(aggregations, self.keys, CONST_VIEW_FUNCTIONS)
+        self.attributes = [at for at, _, _ in self.keys] + [at for at, _, _ in self.aggregations]
+        self.groups = {}
+        self.stale = True
+
+    def __repr__(self):
+        return f"{__class__.__name__}<{self.name}> : {len(self.groups)} groups"
+
+    def build(self, lstDocs: list):
+        """
+        (Re)builds the groups from the list of documents.
+        """
+        # monta os grupos numa variável local, para que uma leitura concorrente nunca veja a visão pela metade
+        groups = {}
+        for obj in lstDocs:
+            self._add(groups, obj)
+
+        self.groups = groups
+        self.stale = False
+
+    def _add(self, groups: dict, obj: any):
+        hashKey, keyValues = groupKey(obj, self.keys)
+        group = groups.get(hashKey)
+        if group is None:
+            group = groups[hashKey] = [copyKeyValues(keyValues), 0, [ViewAccumulator(functions) for _, _, functions in self.aggregations]]
+
+        group[1] += 1
+        for (_, steps, _), acc in zip(self.aggregations, group[2]):
+            val = getPathDefault(obj, steps)
+            if val:
+                acc.add(val)
+        # endfor --
+
+    def add(self, obj: any):
+        """
+        Adds a document to its group, the view becomes stale if the document can not be added (see the module).
+        """
+        if self.stale:
+            return
+
+        try:
+            self._add(self.groups, obj)
+        except Exception:
+            # a visão será reconstruída a partir da lista no próximo uso
+            self.stale = True
+
+    def _remove(self, obj: any):
+        hashKey, _ = groupKey(obj, self.keys)
+        group = self.groups[hashKey]
+        if group[1] == 1:
+            del self.groups[hashKey]
+            return
+
+        group[1] -= 1
+        for (_, steps, _), acc in zip(self.aggregations, group[2]):
+            val = getPathDefault(obj, steps)
+            if val:
+                acc.remove(val)
+        # endfor --
+
+    def remove(self, obj: any):
+        """
+        Removes a document (with the same values it had when it was added) from its group, the group is removed with its last document;
+        the view becomes stale if the document can not be removed (e.g. it was changed through another reference).
+        """
+        if self.stale:
+            return
+
+        try:
+            self._remove(obj)
+        except Exception:
+            self.stale = True
+
+    def replace(self, oldObj: any, newObj: any):
+        """
+        Updates the groups when a document is replaced by another.
+        """
+        self.remove(oldObj)
+        self.add(newObj)
+
+    def tracks(self, attributes) -> bool:
+        """
+        Returns True if changing one of the attributes (names in the dot notation) can change the groups of the view.
+        """
+        for at in attributes:
+            if '[' in at:
+                # caminho com índices de lista, na dúvida considera que altera a visão
+                return True
+
+            for tracked in self.attributes:
+                if at == tracked or tracked.startswith(at + '.') or at.startswith(tracked + '.') or '[' in tracked:
+                    return True
+            # endfor --
+        # endfor --
+
+        return False
+
+    def rows(self) -> list:
+        """
+        Returns the groups as documents, in the same format of jDocument.groupBy(), in the order in which they were created.
+        """
+        lstRows = []
+        for keyValues, count, accumulators in self.groups.values():
+            row = {}
+            for (at, steps, _), val in zip(self.keys, copyKeyValues(keyValues)):
+                setPathValue(row, rowPath(at, steps), val)
+
+            row['count'] = count
+            for (at, steps, _), acc in zip(self.aggregations, accumulators):
+                setPathValue(row, rowPath(at, steps), acc.result())
+
+            lstRows.append(row)
+        # endfor --
+
+        return lstRows
@@ -0,0 +1,495 @@
+"""
+benchmark
+
+Micro-benchmarks of jDocument, run from the "tests" folder:
+    python benchmark.py             # runs all benchmarks
+    python benchmark.py paths       # runs only the benchmark "paths"
+    python benchmark.py parallel    # crossover between the serial and the parallel scan (uses all the CPUs)
+    python benchmark.py numeric     # pure Python x NumPy backend at 10k, 1M and 10M documents
+"""
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from jDocument import jDocument, compileFilter, compileExpression, jnumeric, jsjson, loads, sortJsonl, iterBulkChunks, writeBulk
+from jDocument.helpers import dumpBulkElastik
+from jDocument.jpath import compilePath, getPathValue
+
+
+def loadJsonSample(filename: str) -> dict | list:
+    with open(filename) as f:
+        filedata = json.load(f)
+    return filedata
+
+
+def timeit(label: str, func, *args) -> float:
+    t = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - t
+    print(f"{label:<60} {elapsed:8.3f}s")
+    return elapsed
+
+
+def legacyValue(dic: dict, attribute: str, defaultValue: any = None) -> any:
+    # replica of the lookup used by jDocument.value() before the paths were compiled
+    val = defaultValue
+    try:
+        for tk in attribute.split('.'):
+            if '[' in tk:
+                lst = tk.split('[')[0]
+                pont = tk.split('[')[1].replace(']', '')
+                if pont.replace('-', '').isnumeric():
+                    idx = int(pont)
+                    val = dic[idx] if lst == 'Array' else dic[lst][idx]
+            else:
+                val = dic[tk]
+            dic = val
+    except Exception:
+        val = defaultValue
+    return val
+
+
+def legacyDateDecoder(d):
+    # replica of the object_hook used by jsjson.loads() before decodeDate(): strptime() on every string, objects traversed again
+    pairs = enumerate(d) if isinstance(d, list) else d.items()
+    result = []
+    for k, v in pairs:
+        if isinstance(v, str):
+            try:
+                v = datetime.strptime(v, '%Y-%m-%dT%H:%M:%S.%f')
+            except ValueError:
+                try:
+                    v = datetime.strptime(v, '%Y-%m-%d').date()
+                except ValueError:
+                    pass
+        elif isinstance(v, (dict, list)):
+            v = legacyDateDecoder(v)
+        result.append((k, v))
+    return [x[1] for x in result] if isinstance(d, list) else dict(result)
+
+
+def legacyBulk(jlist: list, idAttrib: str) -> str:
+    # replica of helpers.dumpBulkElastik() before jbulk: string concatenation and get()/getJson() per document
+    s = ''
+    for jDoc in jlist:
+        s += '{ "index" : { "_id" : "' + jDoc.get(idAttrib) + '" } }\n'
+        s += f'{jDoc.getJson(flagPretty=False)}\n'
+    return s
+
+
+def benchPaths(lookups: int = 1_000_000):
+    print("\n" + '-' * 20 + f" COMPILED PATHS ({lookups:,} lookups)")
+    data = loadJsonSample('../tests/products_sample.json')
+    paths = ['Array[3].features.price', 'Array[3].title', 'Array[10].features.rating', 'Array[-1].features.width']
+    jProducts = jDocument(data)
+    rounds = lookups // len(paths)
+
+    def legacy():
+        for _ in range(rounds):
+            for at in paths:
+                legacyValue(data, at)
+
+    def compiled():
+        for _ in range(rounds):
+            for at in paths:
+                getPathValue(data, compilePath(at))
+
+    def jDocumentValue():
+        for _ in range(rounds):
+            for at in paths:
+                jProducts.value(at)
+
+    t1 = timeit("split the path on every lookup (previous)", legacy)
+    t2 = timeit("compiled path (LRU cache)", compiled)
+    timeit("jDocument.value()", jDocumentValue)
+    print(f"speedup: {t1 / t2:.1f}x  ({t1 / lookups * 1e9:.0f} ns -> {t2 / lookups * 1e9:.0f} ns per lookup)")
+    print(f"cache: {compilePath.cache_info()}")
+
+
+def benchExpression(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" EXPRESSION FILTER ({len(data):,} documents)")
+    exprFilter = "jDoc['features.price'] > 28 and jDoc['type'] != 'fruit'"
+    jProducts = jDocument(data)
+
+    def evalPerDocument():
+        # eval() of the text with a jDocument per document (previous behaviour)
+        return [obj for obj in data if eval(exprFilter, {'jDoc': jDocument(obj)})]
+
+    def compiled():
+        return jProducts.searchDocs(exprFilter=exprFilter)
+
+    t1 = timeit("eval() per document", evalPerDocument)
+    t2 = timeit("compiled expression", compiled)
+    print(f"speedup: {t1 / t2:.1f}x  ({compileExpression(exprFilter)})")
+
+
+def benchParallel(sizes: tuple = (10_000, 100_000, 1_000_000)):
+    workers = os.cpu_count() or 1
+    print("\n" + '-' * 20 + f" PARALLEL SCAN ({workers} CPUs)")
+    sample = loadJsonSample('../tests/products_sample.json')
+    exprFilter = "jDoc['features.price'] > 28 and jDoc['type'] != 'fruit'"
+
+    for size in sizes:
+        jProducts = jDocument((sample * (size // len(sample) + 1))[:size])
+        t1 = timeit(f"searchDocs() serial ({size:,} documents)", jProducts.searchDocs, None, exprFilter)
+        t2 = timeit(f"searchDocs() parallel={workers} ({size:,} documents)", lambda: jProducts.searchDocs(exprFilter=exprFilter, parallel=workers))
+        print(f"speedup: {t1 / t2:.2f}x")
+
+
+def benchPlan(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" QUERY PLAN ({len(data):,} documents)")
+    jOrFilters = [{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'fresh'}, {'Attribute': 'type', 'Operator': 'eq', 'Value': 'fruit'}]}]
+    jProducts = jDocument(data)
+    conditions = [cond[3] for cond in compileFilter(jOrFilters).conditions[0]]
+
+    def writtenOrder():
+        # conditions tested in the order they were written (previous behaviour)
+        return [obj for obj in data if all(cond(obj) for cond in conditions)]
+
+    def planned():
+        return jProducts.searchDocs(jOrFilters=jOrFilters)
+
+    t1 = timeit("AND in the written order", writtenOrder)
+    t2 = timeit("AND in the order of the plan", planned)
+    print(f"speedup: {t1 / t2:.1f}x  {[cond['attribute'] for cond in jProducts.explain(jOrFilters=jOrFilters)['groups'][0]['conditions']]}")
+
+
+def benchText(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" TEXT INDEX ({len(data):,} documents)")
+    jOrFilters = [{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'blueberries'}]}]
+    jProducts = jDocument(data)
+
+    t1 = timeit("findAnyDocs() scan", jProducts.findAnyDocs, ['blueberries'])
+    t3 = timeit("searchDocs() 'all' ct scan", jProducts.searchDocs, jOrFilters)
+    timeit("createIndex('all')", jProducts.createIndex, 'all')
+    t2 = timeit("findAnyDocs() with the text index", jProducts.findAnyDocs, ['blueberries'])
+    t4 = timeit("searchDocs() 'all' ct with the text index", jProducts.searchDocs, jOrFilters)
+    print(f"speedup: findAnyDocs {t1 / t2:.1f}x, searchDocs {t3 / t4:.1f}x  ({jProducts._textIndex})")
+
+
+def benchAggregate(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" AGGREGATE ({len(data):,} documents)")
+    functions = ['count', 'sum', 'min', 'max', 'mean', 'median']
+    jProducts = jDocument(data)
+
+    def separateCalls():
+        return {name: getattr(jProducts, name)('features.price', filters={'type': 'fruit'}) for name in functions}
+
+    def singlePass():
+        return jProducts.aggregate('features.price', functions, filters={'type': 'fruit'})
+
+    t1 = timeit("one call per function", separateCalls)
+    t2 = timeit("aggregate()", singlePass)
+    print(f"speedup: {t1 / t2:.1f}x  (same results: {separateCalls() == singlePass()})")
+
+
+def benchGroupBy(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" GROUP BY ({len(data):,} documents)")
+    jProducts = jDocument(data)
+
+    def ocorrencesAndFilters():
+        # one filter per group (previous way of grouping)
+        return {tp: (jProducts.sum('features.price', filters={'type': tp}), jProducts.mean('features.price', filters={'type': tp}))
+                for tp in jProducts.ocorrences('type')}
+
+    def groupBy():
+        return jProducts.groupBy('type', {'features.price': ['sum', 'mean']})
+
+    t1 = timeit("ocorrences() + sum()/mean() per group", ocorrencesAndFilters)
+    t2 = timeit("groupBy()", groupBy)
+    print(f"speedup: {t1 / t2:.1f}x  ({len(groupBy())} groups)")
+
+
+def benchNumeric(sizes: tuple = (10_000, 1_000_000, 10_000_000)):
+    print("\n" + '-' * 20 + f" NUMERIC BACKEND ({jnumeric.getBackend()})")
+    if jnumeric.numpy is None:
+        print("NumPy is not installed")
+        return
+
+    sample = loadJsonSample('../tests/products_sample.json')
+    functions = ['sum', 'min', 'max', 'mean', 'median', 'std']
+
+    def statistics(jProducts: jDocument):
+        return (jProducts.aggregate('features.price', functions), jProducts.quantile('features.price', [0.5, 0.9, 0.99]),
+                jProducts.histogram('features.price'))
+
+    for size in sizes:
+        jProducts = jDocument((sample * (size // len(sample) + 1))[:size])
+        previous = jnumeric.setBackend('python')
+        t1 = timeit(f"aggregate() + quantile() + histogram() Python ({size:,} documents)", statistics, jProducts)
+        jnumeric.setBackend('numpy')
+        t2 = timeit(f"aggregate() + quantile() + histogram() NumPy ({size:,} documents)", statistics, jProducts)
+        jnumeric.setBackend(previous)
+        print(f"speedup: {t1 / t2:.1f}x")
+
+
+def benchColumns(scale: int = 20_000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" COLUMN CACHE ({len(data):,} documents)")
+    jOrFilters = [{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 29}]}]
+    jProducts = jDocument(data)
+
+    def analytics():
+        return jProducts.sum('features.price'), jProducts.max('features.price'), jProducts.median('features.price')
+
+    t1 = timeit("search price > 29 (scan)", jProducts.searchDocs, jOrFilters)
+    t5 = timeit("sortDocs({'features.price': -1}) (documents)", jProducts.sortDocs, {'features.price': -1})
+    jProducts.createColumnCache()
+    t2 = timeit("sum() + max() + median() (first call, extracts the column)", analytics)
+    t3 = timeit("sum() + max() + median() (column cached)", analytics)
+    t4 = timeit("search price > 29 (column cached)", jProducts.searchDocs, jOrFilters)
+    t6 = timeit("sortDocs({'features.price': -1}) (column cached)", jProducts.sortDocs, {'features.price': -1})
+    print(f"speedup: analytics {t2 / t3:.1f}x, search {t1 / t4:.1f}x, sort {t5 / t6:.1f}x  {jProducts.columnStats()}")
+
+
+def benchOccurrences(size: int = 20_000, distinct: int = 5_000):
+    print("\n" + '-' * 20 + f" OCCURRENCES ({size:,} documents, {distinct:,} distinct values)")
+    jOrders = jDocument([{'customer': {'id': f"C{i % distinct:05d}"}} for i in range(size)])
+    lstValues = jOrders._getListOfValues('customer.id')
+
+    def legacy():
+        # previous implementation: one count() per distinct value
+        return dict((item, lstValues.count(item)) for item in set(lstValues))
+
+    t1 = timeit("set() + list.count() (previous ocorrences)", legacy)
+    t2 = timeit("ocorrences()", jOrders.ocorrences, 'customer.id')
+    timeit("topOccurrences(k=10)", jOrders.topOccurrences, 'customer.id', 10)
+    timeit("topOccurrences(k=10, capacity=100) (Space-Saving)", lambda: jOrders.topOccurrences('customer.id', 10, capacity=100))
+    print(f"speedup: {t1 / t2:.1f}x")
+
+
+def benchSketches(size: int = 200_000, distinct: int = 50_000):
+    print("\n" + '-' * 20 + f" SKETCHES ({size:,} documents, {distinct:,} distinct values)")
+    jOrders = jDocument([{'customer': {'id': f"C{i % distinct:06d}"}, 'total': (i * 37) % 10007 / 10} for i in range(size)])
+
+    timeit("countDistinct() (exact)", jOrders.countDistinct, 'customer.id')
+    timeit("countDistinct(precision=14) (HyperLogLog)", lambda: jOrders.countDistinct('customer.id', precision=14))
+    timeit("quantile(0.5) (exact)", jOrders.quantile, 'total', 0.5)
+    timeit("quantile(0.5, capacity=200) (KLL)", lambda: jOrders.quantile('total', 0.5, capacity=200))
+    print(f"distinct: {jOrders.countDistinct('customer.id')} exact, {jOrders.countDistinct('customer.id', precision=14)} approximate")
+    print(f"median: {jOrders.quantile('total', 0.5)} exact, {jOrders.quantile('total', 0.5, capacity=200)} approximate")
+
+
+def benchViews(size: int = 200_000, batches: int = 20, batchSize: int = 100):
+    print("\n" + '-' * 20 + f" VIEWS ({size:,} documents, {batches} batches of {batchSize} inserts and removals)")
+    types = ('fruit', 'vegetable', 'dairy', 'meat', 'bakery')
+
+    def newDocs(start: int) -> list:
+        return [{'id': i, 'type': types[i % len(types)], 'features': {'price': i % 97 + 0.5}} for i in range(start, start + batchSize)]
+
+    def run(flagView: bool):
+        jProducts = jDocument(newDocs(0) * (size // batchSize))
+        if flagView:
+            jProducts.createView('priceByType', 'type', {'features.price': ['sum', 'mean']})
+        for batch in range(batches):
+            jProducts.addDoc(newDocs(size + batch * batchSize))
+            jProducts.removeDocs(position=0)
+            if flagView:
+                jProducts.getView('priceByType')
+            else:
+                jProducts.groupBy('type', {'features.price': ['sum', 'mean']})
+        # endfor --
+
+    t1 = timeit("groupBy() after each batch", run, False)
+    t2 = timeit("createView() + getView() after each batch", run, True)
+    print(f"speedup: {t1 / t2:.1f}x")
+
+
+def benchSort(scale: int = 5000, n: int = 100):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" SORT ({len(data):,} documents)")
+
+    def legacy():
+        # previous implementation: one sort per attribute (of a copy of the list), without dotted paths
+        lstDocs = list(data)
+        for at in ('rating', 'type'):
+            lstDocs.sort(key=lambda e: (not e.get(at), e.get(at)))
+        return lstDocs
+
+    timeit("one sort per attribute (previous sortDocs)", legacy)
+    timeit("sortDocs(['type', {'features.price': -1}])", lambda: jDocument(list(data)).sortDocs(['type', {'features.price': -1}]))
+    jProducts = jDocument(data)
+    t1 = timeit(f"sortDocs() + first {n}", lambda: jDocument(list(data)).sortDocs({'features.price': -1})[:n])
+    t2 = timeit(f"topDocs(n={n})", jProducts.topDocs, {'features.price': -1}, n)
+    print(f"speedup: {t1 / t2:.1f}x")
+
+
+def benchExternalSort(scale: int = 4000, memoryLimit: int = 8 * 1024 * 1024):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" EXTERNAL SORT ({len(data):,} documents, runs of {memoryLimit:,} characters)")
+    with tempfile.TemporaryDirectory() as tempDir:
+        inputFile, outputFile = os.path.join(tempDir, 'products.jsonl'), os.path.join(tempDir, 'products_sorted.jsonl')
+        with open(inputFile, 'w', encoding='utf-8') as f:
+            for obj in data:
+                f.write(json.dumps(obj) + '\n')
+
+        print(f"input: {os.path.getsize(inputFile):,} bytes")
+        timeit("jDocument(file).sortDocs() (all in memory)", lambda: jDocument(loads('[' + ','.join(open(inputFile, encoding='utf-8')) + ']')).sortDocs(['type', {'features.price': -1}]))
+        timeit("sortJsonl()", sortJsonl, inputFile, outputFile, ['type', {'features.price': -1}], memoryLimit)
+
+
+def benchStream(scale: int = 1000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    print("\n" + '-' * 20 + f" STREAMING ({len(data):,} documents)")
+    with tempfile.TemporaryDirectory() as tempDir:
+        filename = os.path.join(tempDir, 'products.json')
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        print(f"file: {os.path.getsize(filename):,} bytes")
+        del data
+
+        def whole():
+            with open(filename, encoding='utf-8') as f:
+                return jDocument(f.read()).sum('features.price')
+
+        def stream():
+            return sum(obj['features']['price'] for obj in jDocument.iterFile(filename, flagRawDocs=True))
+
+        for label, func in (("jDocument(file.read()).sum()", whole), ("sum() of iterFile()", stream)):
+            tracemalloc.start()
+            timeit(label, func)
+            print(f"{'':<60} peak memory {tracemalloc.get_traced_memory()[1] / 1024 / 1024:8.1f} MB")
+            tracemalloc.stop()
+        # endfor --
+
+
+def benchJsonl(scale: int = 4000, workers: int = 4):
+    jProducts = jDocument(loadJsonSample('../tests/products_sample.json') * scale)
+    print("\n" + '-' * 20 + f" JSON LINES ({len(jProducts):,} documents)")
+    with tempfile.TemporaryDirectory() as tempDir:
+        filename = os.path.join(tempDir, 'products.jsonl')
+
+        def writeWhole():
+            # previous way: the whole array as one string
+            with open(os.path.join(tempDir, 'products.json'), 'w', encoding='utf-8') as f:
+                f.write(jProducts.getJson())
+
+        for label, func in (("getJson() + write", writeWhole), ("toJsonl()", lambda: jProducts.toJsonl(filename))):
+            tracemalloc.start()
+            timeit(label, func)
+            print(f"{'':<60} peak memory {tracemalloc.get_traced_memory()[1] / 1024 / 1024:8.1f} MB")
+            tracemalloc.stop()
+        # endfor --
+
+        t1 = timeit("fromJsonl(flagLazy=False)", jDocument.fromJsonl, filename, False)
+        t2 = timeit(f"fromJsonl(flagLazy=False, parallel={workers})", jDocument.fromJsonl, filename, False, workers)
+        print(f"speedup: {t1 / t2:.1f}x")
+
+
+def benchJsonBackends(scale: int = 1000):
+    print("\n" + '-' * 20 + f" JSON BACKENDS (selected: {jsjson.getBackend()})")
+    for filename in ('products_sample.json', 'page_sample.json', 'squad_sample.json'):
+        sample = loadJsonSample(f'../tests/{filename}')
+        data = sample * scale if isinstance(sample, list) else [sample] * scale
+        txt = jsjson.dumps(data)
+        print(f"{filename}: {len(txt):,} characters")
+
+        # the documents are always encoded by the standard json, the backends decode them
+        timeit("dumps()", jsjson.dumps, data)
+        timeit("dumps(flagPretty=True)", jsjson.dumps, data, True)
+        previous = jsjson.getBackend()
+        results = []
+        for backend in jsjson.installedBackends():
+            jsjson.setBackend(backend)
+            timeit(f"loads() [{backend}]", jsjson.loads, txt)
+            results.append(jsjson.loads(txt))
+        # endfor --
+
+        jsjson.setBackend(previous)
+        print(f"same documents with all the backends = {all(result == results[0] for result in results)}")
+    # endfor --
+
+
+def benchDates(scale: int = 2000):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    for i, obj in enumerate(data):
+        obj['created'] = datetime(2021, 1, 1 + i % 28, i % 24, i % 60, i % 60, i % 1000 * 1000)
+    txt = jsjson.dumps(data)
+    print("\n" + '-' * 20 + f" DATE DECODING ({len(data):,} documents, {len(txt):,} characters, backend {jsjson.getBackend()})")
+
+    t1 = timeit("json.loads(object_hook=strptime decoder) (previous)", lambda: json.loads(txt, object_hook=legacyDateDecoder))
+    t2 = timeit("loads()", jsjson.loads, txt)
+    timeit("loads(dateAttributes=['created'])", jsjson.loads, txt, ['created'])
+    timeit("loads(dateAttributes=False)", jsjson.loads, txt, False)
+    print(f"speedup: {t1 / t2:.1f}x")
+    print(f"same documents = {json.loads(txt, object_hook=legacyDateDecoder) == jsjson.loads(txt)}")
+
+
+def benchMapped(scale: int = 4000, lookups: int = 100_000, workingSet: int = 500):
+    print("\n" + '-' * 20 + f" MAPPED FILES ({50 * scale:,} documents)")
+    with tempfile.TemporaryDirectory() as tempDir:
+        filename = os.path.join(tempDir, 'catalog.jsonl')
+        indexFile = filename + '.idx'
+        jDocument(loadJsonSample('../tests/products_sample.json') * scale).toJsonl(filename)
+        print(f"file: {os.path.getsize(filename):,} bytes")
+
+        for label, func in (("fromJsonl(flagLazy=False) (whole file in memory)", lambda: jDocument.fromJsonl(filename, False)),
+                            ("mapFile() (builds and saves the index)", lambda: jDocument.mapFile(filename, indexFile=indexFile)),
+                            ("mapFile() (saved index)", lambda: jDocument.mapFile(filename, indexFile=indexFile))):
+            tracemalloc.start()
+            jCatalog = None
+            t = time.perf_counter()
+            jCatalog = func()
+            print(f"{label:<60} {time.perf_counter() - t:8.3f}s {tracemalloc.get_traced_memory()[0] / 1024 / 1024:8.1f} MB")
+            tracemalloc.stop()
+        # endfor --
+
+        rnd = random.Random(0)
+        positions = [rnd.randrange(workingSet) for _ in range(lookups)]
+        timeit(f"{lookups:,} item() in a working set of {workingSet} documents", lambda: [jCatalog.item(i) for i in positions])
+        print(f"cache: {jCatalog.jData.cacheInfo()}")
+        timeit("sum() (decodes all the documents)", jCatalog.sum, 'features.price')
+        jCatalog.jData.close()
+
+
+def benchBulk(scale: int = 2000, workers: int = 4):
+    data = loadJsonSample('../tests/products_sample.json') * scale
+    data = [dict(obj, sku=f'SKU-{i}') for i, obj in enumerate(data)]
+    jProducts = jDocument(data)
+    print("\n" + '-' * 20 + f" ELASTICSEARCH BULK ({len(data):,} documents)")
+
+    timeit("string concatenation of jDocuments (previous)", legacyBulk, list(jProducts), 'sku')
+    timeit("dumpBulkElastik() (returns the string)", dumpBulkElastik, jProducts, 'sku')
+    timeit("writeBulk() into io.BytesIO", writeBulk, jProducts, io.BytesIO(), 'sku')
+    timeit("iterBulkChunks(maxBytes=5 MB)", lambda: sum(1 for _ in iterBulkChunks(jProducts, 'sku', maxBytes=5 * 1024 * 1024)))
+    timeit(f"writeBulk() into io.BytesIO (parallel={workers})", writeBulk, jProducts, io.BytesIO(), 'sku', 'index', None, 5000,
+           100 * 1024 * 1024, workers)
+
+
+BENCHMARKS = {
+    'paths': benchPaths,
+    'expression': benchExpression,
+    'parallel': benchParallel,
+    'plan': benchPlan,
+    'text': benchText,
+    'aggregate': benchAggregate,
+    'groupby': benchGroupBy,
+    'numeric': benchNumeric,
+    'columns': benchColumns,
+    'occurrences': benchOccurrences,
+    'sketches': benchSketches,
+    'views': benchViews,
+    'sort': benchSort,
+    'externalsort': benchExternalSort,
+    'stream': benchStream,
+    'jsonl': benchJsonl,
+    'jsonbackends': benchJsonBackends,
+    'dates': benchDates,
+    'mapped': benchMapped,
+    'bulk': benchBulk,
+}
+
+if __name__ == '__main__':
+    for name in (sys.argv[1:] or BENCHMARKS.keys()):
+        BENCHMARKS[name]()
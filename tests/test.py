@@ -1,5 +1,13 @@
+import io
 import json
-from jDocument import jDocument
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from jDocument import jDocument, compileFilter, compileExpression, sortJsonl, iterMerge, mergeJsonl, iterBulkChunks, writeBulk
+from jDocument.helpers import dumpBulkElastik
+from jDocument import jnumeric, jparallel, jsjson
+from jDocument.jsketch import CountMinSketch, HyperLogLog, KLLSketch, attributeValues
 
 
 def loadJsonSample(filename: str) -> dict | list:
@@ -19,8 +27,24 @@ print(f"Num of itens = {len(jProducts)}")
 print(f"Item number 3 = {jProducts[3]}")
 print(f"Num of itens of type 'fruit' = {jProducts.count(attribute='title', filters=[{'type': 'fruit'}])}")
 print(f"Num of itens per type = {jProducts.ocorrences(attribute='type')}")
+print(f"Top 3 types = {jProducts.topOccurrences('type', 3)}")
+print(f"Top 3 types (approximate, 4 counters) = {jProducts.topOccurrences('type', 3, capacity=4)}")
+sketch = CountMinSketch()
+sketch.update(jDoc['type'] for jDoc in jProducts)
+print(f"Estimated num of fruits (count-min sketch) = {sketch.estimate('fruit')}")
 print(f"Max price = {jProducts.max('features.price')}")
 print(f"Mean price = {jProducts.mean('features.price')}")
+print(f"Statistics of price of type 'fruit' = {jProducts.aggregate('features.price', ['count', 'sum', 'min', 'max', 'mean', 'median'], filters={'type': 'fruit'})}")
+print(f"Occurrences of the features equal to ocorrences() = {jProducts.aggregate('features', ['count', 'ocorrences'], filters={'type': 'fruit'})['ocorrences'] == jProducts.ocorrences('features', filters={'type': 'fruit'})}")
+print(f"Mean and max of price and rating = {jProducts.aggregate(['features.price', 'features.rating'], ['mean', 'max'])}")
+print(f"Sum and mean of price and max rating of the first type = {jProducts.groupBy('type', {'features.price': ['sum', 'mean'], 'features.rating': 'max'}).value()[0]}")
+print(f"Num of itens per type and rating = {[(row['type'], row['features']['rating'], row['count']) for row in jProducts.groupBy(['type', 'features.rating']).value()]}")
+jRows = jProducts.groupBy('features', {'features.price': 'sum'})
+jRows.item(0).set({'features.height': 0})
+print(f"Groups by the features = {len(jRows)}, source documents unchanged = {jProducts.value() == loadJsonSample('../tests/products_sample.json')}")
+print(f"Standard deviation of price = {jProducts.std('features.price')}")
+print(f"Quartiles of price = {jProducts.quantile('features.price', [0.25, 0.5, 0.75])}")
+print(f"Histogram of rating = {jProducts.histogram('features.rating', bins=4)}")
 
 jOrFilters = jDocument([
     {
@@ -37,6 +61,27 @@ jOrFilters = jDocument([
 print(f"Search products whose price is greater then 28 with a filter = {jProducts.searchDocs(jOrFilters=jOrFilters)}")
 print("Search products whose price is greater then 28 with a expression = {0}".format(jProducts.searchDocs(exprFilter='jDoc["features.price"] > 28')))
 
+exprFilter = "jDoc.get('features.price') == 29.97 and jDoc.get('features.color', 'none') == 'none'"
+print(f"Search products whose price is 29.97 with jDoc.get() = {jProducts.searchDocs(exprFilter=exprFilter)}")
+try:
+    jProducts.searchDocs(exprFilter="len(jDoc['title'] * 10 ** 9) > 0")
+except Exception as e:
+    print(e)
+try:
+    jProducts.searchDocs(exprFilter="len('x' * 1000000000) > 0")
+except Exception as e:
+    print(e)
+try:
+    jProducts.searchDocs(exprFilter="len(str(['a' * 10000] * 10000)) > 0")
+except Exception as e:
+    print(e)
+try:
+    jProducts.searchDocs(exprFilter="len('a'" + ".replace('a', 'aaaaaaaaaa')" * 8 + ") > 0")
+except Exception as e:
+    print(e)
+exprFilter = "str(jDoc['features.rating']).replace('4', 'four') == 'four' and len(str(jDoc['features'])) > 0"
+print(f"Products of rating 4 with str() and replace() = {len(jProducts.searchDocs(exprFilter=exprFilter))}")
+
 jFirstProduct = jProducts.searchOneDoc(jOrFilters=jOrFilters)
 
 print(f"(jDocment) First product whose price is greater than 28 = {jFirstProduct}")
@@ -72,3 +117,313 @@ print(f"data of year equal to '2000' = { [item for item in jPage.doc.data if ite
 print(f"data name of year equal to '2000' = { [item.doc.name for item in jPage.doc.data if item.doc.year == 2000] }")
 print(f"list of attributes = {jPage.getAttributes()}")
 print(f"datatype of attribute 'total' = {jPage.getDataType('total')}")
+
+# products sample
+print("\n" + '-' * 20 + " INDEXES")
+data = loadJsonSample('../tests/products_sample.json')
+jProducts = jDocument(data)
+jProducts.createIndex(['type', 'features.rating'])
+
+print(f"Products of type 'meat' = {jProducts.findDocs({'type': 'meat'})}")
+print(f"Products of type 'fruit' and rating 4 = {jProducts.findDocs([{'type': 'fruit'}, {'features.rating': '4'}])}")
+print(f"Title of first product of type 'vegan' = {jProducts.get('Array[type=vegan].title')}")
+jProducts.addDoc({'title': 'Steak', 'type': 'meat', 'features': {'price': 35.5, 'rating': 5}})
+print(f"Products of type 'meat' after addDoc = {jProducts.findDocs({'type': 'meat'})}")
+print(f"Removed products of type 'meat' = {jProducts.removeDocs(filters={'type': 'meat'})}")
+print(f"Num of itens after removeDocs = {len(jProducts)}")
+
+jProducts.createIndex('features.price', flagSorted=True)
+print(f"Search products whose price is greater then 28 with a sorted index = {jProducts.searchDocs(jOrFilters=jOrFilters)}")
+print(f"Max price with a sorted index = {jProducts.max('features.price')}")
+
+jFilterPrice = compileFilter(jOrFilters)
+print(f"Search products whose price is greater then 28 with a compiled filter = {jProducts.searchDocs(jOrFilters=jFilterPrice)}")
+print(f"Num of products whose price is greater then 28 with a compiled filter = {jProducts.count('title', jOrFilters=jFilterPrice)}")
+lstOrFilters = [{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 28}]}]
+jFilterCopy = compileFilter(lstOrFilters)
+lstOrFilters[0]['And'][0]['Value'] = 10
+print(f"Compiled filter unchanged by the source list = {jFilterCopy.source[0]['And'][0]['Value']}, pickled = {len(jProducts.searchDocs(jOrFilters=pickle.loads(pickle.dumps(jFilterCopy.planned({(0, 0): 0.5})))))}")
+print("Search products whose price is greater then 28 with a compiled expression = {0}".format(jProducts.searchDocs(exprFilter=compileExpression('jDoc["features.price"] > 28'))))
+
+print(f"First 3 products whose price is greater then 28 (generator) = {[jDoc['title'] for jDoc in jProducts.iterSearchDocs(jOrFilters=jOrFilters, qty=3)]}")
+print(f"First product of type 'vegan' (generator) = {next(jProducts.iterFindDocs({'type': 'vegan'}, flagRawDocs=True))['title']}")
+print(f"Products with 'strawberry' (generator) = {len(list(jProducts.iterFindAnyDocs(['strawberry'])))}")
+
+# products sample
+print("\n" + '-' * 20 + " THREADS")
+from concurrent.futures import ThreadPoolExecutor
+
+data = loadJsonSample('../tests/products_sample.json') * 20
+jCatalog = jDocument(data, flagThreadSafe=True)
+jCatalog.createIndex('type').createIndex('features.price', flagSorted=True)
+queries = [
+    lambda: len(jCatalog.findDocs({'type': 'fruit'})),
+    lambda: len(jCatalog.searchDocs(jOrFilters=jOrFilters)),
+    lambda: len(jCatalog.searchDocs(exprFilter="jDoc['features.rating'] == 4 and jDoc['type'] != 'fruit'")),
+    lambda: jCatalog.count('title', filters=[{'type': 'dairy'}]),
+    lambda: jCatalog.ocorrences('type', jOrFilters=jOrFilters),
+    lambda: jCatalog.max('features.price'),
+]
+expected = [query() for query in queries]
+
+
+def runQuery(n: int) -> bool:
+    if n % 50 == 0:
+        # mutação exclusiva: adiciona e remove um documento
+        jCatalog.addDoc({'title': f'tmp {n}', 'type': 'tmp', 'features': {'price': 1.0}})
+        jCatalog.removeDocs(filters={'type': 'tmp'})
+        return True
+    if n % 7 == 0:
+        # a iteração não é protegida pelo lock, usa o lock de leitura explicitamente
+        with jCatalog.lock.read():
+            return len([jDoc for jDoc in jCatalog if jDoc['type'] == 'bakery']) == 120
+    return queries[n % len(queries)]() == expected[n % len(queries)]
+
+
+with ThreadPoolExecutor(max_workers=16) as executor:
+    results = list(executor.map(runQuery, range(3000)))
+
+print(f"Concurrent queries = {len(results)}, wrong results = {results.count(False)}, num of itens = {len(jCatalog)}")
+
+# products sample
+print("\n" + '-' * 20 + " PARALLEL")
+data = loadJsonSample('../tests/products_sample.json') * 100
+jCatalog = jDocument(data)
+exprFilter = "jDoc['features.price'] > 28 and jDoc['type'] != 'fruit'"
+
+print(f"Search with parallel=2 equal to serial = {jCatalog.searchDocs(exprFilter=exprFilter, parallel=2) == jCatalog.searchDocs(exprFilter=exprFilter)}")
+print(f"Find with parallel=2 equal to serial = {jCatalog.findDocs({'type': 'fruit'}, qty=10, parallel=2) == jCatalog.findDocs({'type': 'fruit'}, qty=10)}")
+print(f"Sum of prices with parallel=2 = {jCatalog.sum('features.price', exprFilter=exprFilter, parallel=2) == jCatalog.sum('features.price', exprFilter=exprFilter)}")
+print(f"Shared pool reused by the next scans = {jparallel.getPool(2) is jparallel.getPool(2)}, count with an Executor of 2 workers = {jCatalog.count('title', exprFilter=exprFilter, parallel=jparallel.getPool(2)) == jCatalog.count('title', exprFilter=exprFilter)}")
+
+# products sample
+print("\n" + '-' * 20 + " QUERY PLAN")
+jOrFilters = [{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'fresh'}, {'Attribute': 'type', 'Operator': 'eq', 'Value': 'fruit'}]}]
+jPlan = jCatalog.explain(jOrFilters=jOrFilters)
+print(f"Order of the conditions = {[cond['attribute'] for cond in jPlan['groups'][0]['conditions']]}, estimates = {[cond['estimate'] for cond in jPlan['groups'][0]['conditions']]}")
+print(f"Num of fresh fruits = {len(jCatalog.searchDocs(jOrFilters=jOrFilters))}")
+print(f"Planned filter reused by the next searches = {jCatalog._planFilter(compileFilter(jOrFilters)) is jCatalog._planFilter(compileFilter(jOrFilters))}")
+try:
+    compileFilter([{'And': [{'Attribute': 'type', 'Operator': 'in', 'Value': 5}]}])
+except Exception as e:
+    print(e)
+try:
+    jDocument([{'n': 'abc'}, {'n': 3}]).searchDocs(jOrFilters=[{'And': [{'Attribute': 'n', 'Operator': 'gt', 'Value': 2}]}])
+except TypeError as e:
+    print(f"Values that can not be compared raise = {e}")
+try:
+    jCatalog.searchDocs(jOrFilters=[{'And': [{'Attribute': 'title', 'Operator': 'gt', 'Value': 5}, {'Attribute': 'type', 'Operator': 'eq', 'Value': 'meat'}]}])
+except TypeError as e:
+    print(f"Reordered conditions raise as written = {e}")
+jPlan = jCatalog.explain(filters={'title': 'RE:^s', 'type': 'fruit'}, flagMacros=True)
+print(f"Order of the rules = {[cond['attribute'] for cond in jPlan['groups'][0]['conditions']]}, access = {jPlan['access']}")
+print(f"Num of fruits starting with 's' = {len(jCatalog.findDocs({'title': 'RE:^s', 'type': 'fruit'}, flagMacros=True))}")
+
+# products sample
+print("\n" + '-' * 20 + " TEXT INDEX")
+jCatalog.createIndex('all')
+print(f"Products with 'strawberry' or 'blueberries' = {len(jCatalog.findAnyDocs(['strawberry', 'blueberries']))}")
+print(f"Search of 'fresh' within the documents = {len(jCatalog.searchDocs(jOrFilters=[{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'fresh'}]}]))}")
+jCatalog.addDoc({'title': 'Pão de queijo', 'type': 'bakery', 'features': {'price': 3.5}})
+print(f"Products with 'pão' after addDoc = {jCatalog.findAnyDocs(['pão'])}")
+print(f"Removed products with 'pão' = {jCatalog.removeDocs(filters={'title': 'Pão de queijo'})}, products with 'queijo' = {len(jCatalog.findAnyDocs(['queijo']))}")
+print(f"Access of the text search = {jCatalog.explain(jOrFilters=[{'And': [{'Attribute': 'all', 'Operator': 'ct', 'Value': 'fresh'}]}])['access']}")
+
+# products sample
+print("\n" + '-' * 20 + " NUMERIC")
+functions = ['sum', 'min', 'max', 'mean', 'median', 'std']
+previous = jnumeric.setBackend('python')
+lstPython = [jCatalog.aggregate('features.price', functions), jCatalog.quantile('features.price', [0.1, 0.9]), jCatalog.histogram('features.price')]
+jnumeric.setBackend()
+lstNumeric = [jCatalog.aggregate('features.price', functions), jCatalog.quantile('features.price', [0.1, 0.9]), jCatalog.histogram('features.price')]
+jnumeric.setBackend(previous)
+jMixed = jDocument([{'v': i % 1000 + 0.5 if i % 3 else i % 1000 + 1} for i in range(3001)])
+print(f"Min, max and median of int and float values = {jMixed.aggregate('v', ['min', 'max', 'median'])}, max = {jMixed.max('v')}")
+print(f"Aggregates of price equal with both backends = {all(round(lstPython[0][name], 6) == round(lstNumeric[0][name], 6) for name in functions)}")
+print(f"Quantiles of price equal with both backends = {[round(val, 6) for val in lstPython[1]] == [round(val, 6) for val in lstNumeric[1]]}")
+print(f"Histogram of price equal with both backends = {lstPython[2]['counts'] == lstNumeric[2]['counts']}, counts = {lstNumeric[2]['counts']}")
+
+# products sample
+print("\n" + '-' * 20 + " COLUMNS")
+jCatalog = jDocument(loadJsonSample('../tests/products_sample.json') * 100).createColumnCache()
+print(f"Mean, max and sum of price = {jCatalog.mean('features.price')}, {jCatalog.max('features.price')}, {round(jCatalog.sum('features.price'), 2)}")
+print(f"Max price of fruits = {jCatalog.max('features.price', filters={'type': 'fruit'})}")
+print(f"Products with price > 29 = {len(jCatalog.searchDocs(jOrFilters=[{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 29}]}]))}")
+print(f"Cache of columns = {jCatalog.columnStats()}")
+jCatalog.addDoc({'title': 'Truffle', 'type': 'vegetable', 'features': {'price': 99.9, 'rating': 5}})
+print(f"Max price after addDoc = {jCatalog.max('features.price')}, products with price > 29 = {len(jCatalog.searchDocs(jOrFilters=[{'And': [{'Attribute': 'features.price', 'Operator': 'gt', 'Value': 29}]}]))}")
+jCatalog[0] = {'title': 'Saffron', 'type': 'spice', 'features': {'price': 120.5, 'rating': 4}}
+print(f"Max price after replacing a document = {jCatalog.max('features.price')}, cache of columns = {jCatalog.columnStats()}")
+lstOrder = [jDoc['title'] for jDoc in jDocument(jCatalog.value()[:]).sortDocs(['type', {'features.price': -1}])]
+print(f"Sort with the columns equal to the sort without = {[jDoc['title'] for jDoc in jCatalog.sortDocs(['type', {'features.price': -1}])] == lstOrder}, top 3 = {[jDoc['features.price'] for jDoc in jCatalog.topDocs({'features.price': -1}, 3)]}")
+print(f"Max price after the sort = {jCatalog.max('features.price')}, cache of columns = {jCatalog.columnStats()}")
+jProducts = jDocument(loadJsonSample('../tests/products_sample.json'))
+print(f"Max price = {jProducts.max('features.price')}, cache of columns = {jProducts.columnStats()}")
+jProducts.item(0).set({'features.price': 100.0})
+print(f"Max price after a change through item() = {jProducts.max('features.price')}, sum = {round(jProducts.sum('features.price'), 2)}")
+
+# sketches: approximate distinct counts and quantiles with bounded memory
+print("\n" + '-' * 20 + " SKETCHES")
+jOrders = jDocument([{'customer': {'id': f"C{(i * 7919) % 30000:05d}"}, 'total': (i * 37) % 10000 / 10} for i in range(60000)])
+exact, approx = jOrders.countDistinct('customer.id'), jOrders.countDistinct('customer.id', precision=14)
+print(f"Distinct customers = {exact}, approximate (HyperLogLog) = {approx}, error below 2 * 0.81% = {abs(approx - exact) / exact < 0.0162}")
+print(f"Approximate distinct customers with parallel=2 equal to serial = {jOrders.countDistinct('customer.id', precision=14, parallel=2) == approx}")
+exact, approx = jOrders.quantile('total', [0.1, 0.5, 0.9]), jOrders.quantile('total', [0.1, 0.5, 0.9], capacity=200)
+lstSorted = sorted(jOrders._getListOfValues('total'))
+ranks = [sum(1 for val in lstSorted if val <= a) / len(lstSorted) for a in approx]
+print(f"Deciles of total = {exact}, approximate (KLL) = {approx}, rank error below 1% = {all(abs(r - q) < 0.01 for r, q in zip(ranks, [0.1, 0.5, 0.9]))}")
+hll1, hll2 = HyperLogLog(), HyperLogLog()
+hll1.update(attributeValues(jOrders.value()[:30000], 'customer.id'))
+hll2.update(attributeValues(iter(jOrders.value()[30000:]), 'customer.id'))
+hll1.merge(hll2)
+print(f"Merged HyperLogLog of two halves = {hll1.count()}")
+kll1, kll2 = KLLSketch(), KLLSketch()
+kll1.update(range(0, 5000))
+kll2.update(range(5000, 10000))
+kll1.merge(kll2)
+print(f"Median of the merged KLL sketches of 0..9999 = {kll1.quantile(0.5)}")
+
+# views: groupings kept up to date by the changes of the list
+print("\n" + '-' * 20 + " VIEWS")
+jProducts = jDocument(loadJsonSample('../tests/products_sample.json'))
+jProducts.createView('priceByType', 'type', {'features.price': ['count', 'sum', 'mean'], 'features.rating': 'ocorrences'})
+print(f"View of the first type = {jProducts.getView('priceByType').value()[0]}")
+jProducts.addDoc({'title': 'Kiwi', 'type': 'fruit', 'features': {'price': 10, 'rating': 5}})
+jProducts.removeDocs(filters={'type': 'meat'})
+jProducts[0] = {'title': 'Gouda', 'type': 'dairy', 'features': {'price': 20, 'rating': 3}}
+jProducts.set({'features.rating': 4})
+lstView = sorted(jProducts.getView('priceByType').value(), key=lambda row: row['type'])
+lstGroups = sorted(jProducts.groupBy('type', {'features.price': ['count', 'sum', 'mean'], 'features.rating': 'ocorrences'}).value(), key=lambda row: row['type'])
+print(f"Types of the view after addDoc, removeDocs, replace and set = {[(row['type'], row['count'], row['features']['rating']['ocorrences']) for row in lstView]}")
+print(f"View equal to groupBy = {[(row['type'], row['count']) for row in lstView] == [(row['type'], row['count']) for row in lstGroups] and all(abs(a['features']['price']['sum'] - b['features']['price']['sum']) < 1e-9 and a['features']['rating'] == b['features']['rating'] for a, b in zip(lstView, lstGroups))}")
+jProducts.createView('titlesByType', 'type', {'title': ['countDistinct', 'ocorrences']})
+jProducts.addDoc({'title': 'Kiwi', 'type': 'fruit', 'features': {'price': 'n/a'}})
+print(f"Distinct titles of the fruits (view of strings) = {[row['title']['countDistinct'] for row in jProducts.getView('titlesByType').value() if row['type'] == 'fruit']}")
+try:
+    jProducts.getView('priceByType')
+except TypeError:
+    print(f"Sum of a price that is not a number raises when the view is read, documents = {len(jProducts)}")
+jProducts.removeDocs(filters={'features.price': 'n/a'})
+print(f"View equal to groupBy after the price removed = {sorted((row['type'], row['count']) for row in jProducts.getView('priceByType').value()) == sorted((row['type'], row['count']) for row in jProducts.groupBy('type', {'features.price': 'sum'}).value())}")
+jByFeatures = jDocument([{'features': {'color': 'red'}}, {'features': {'color': 'blue'}}])
+jByFeatures.createView('byFeatures', 'features')
+jByFeatures.getView('byFeatures')[0].set({'features.color': 'green'})
+print(f"View unchanged by its rows = {[row['features']['color'] for row in jByFeatures.getView('byFeatures').value()]}")
+print(f"Views removed = {jProducts.dropView()}")
+
+# sort: composite keys with nested attributes, in place, and top-N without sorting
+print("\n" + '-' * 20 + " SORT")
+jProducts = jDocument(loadJsonSample('../tests/products_sample.json'))
+print(f"3 most expensive products (topDocs) = {[(jDoc['title'], jDoc['features.price']) for jDoc in jProducts.topDocs({'features.price': -1}, 3)]}")
+print(f"2 cheapest fruits (topDocs) = {[(jDoc['title'], jDoc['features.price']) for jDoc in jProducts.topDocs('features.price', 2, filters={'type': 'fruit'})]}")
+jProducts.sortDocs(['type', {'features.rating': -1}, 'features.price'])
+print(f"First 4 products by type, rating (desc) and price = {[(jDoc['type'], jDoc['features.rating'], jDoc['features.price']) for jDoc in jProducts[:4]]}")
+jMixed = jDocument([{'v': 'b'}, {'v': 2}, {}, {'v': None}, {'v': 1.5}, {'v': 'a'}])
+print(f"Mixed types in ascending order = {[jDoc.get('v') for jDoc in jMixed.sortDocs('v')]}")
+print(f"Mixed types in descending order = {[jDoc.get('v') for jDoc in jMixed.sortDocs({'v': -1})]}")
+
+# external sort: JSON Lines files larger than the memory, sorted in runs and merged
+print("\n" + '-' * 20 + " EXTERNAL SORT")
+with tempfile.TemporaryDirectory() as tempDir:
+    inputFile, outputFile = os.path.join(tempDir, 'products.jsonl'), os.path.join(tempDir, 'products_sorted.jsonl')
+    with open(inputFile, 'w', encoding='utf-8') as f:
+        for obj in loadJsonSample('../tests/products_sample.json'):
+            f.write(json.dumps(obj) + '\n')
+
+    print(f"Sorted lines (runs of 2000 characters) = {sortJsonl(inputFile, outputFile, ['type', {'features.price': -1}], memoryLimit=2000)}")
+    with open(outputFile, encoding='utf-8') as f:
+        lstSorted = [json.loads(line) for line in f]
+    jProducts = jDocument(loadJsonSample('../tests/products_sample.json')).sortDocs(['type', {'features.price': -1}])
+    print(f"Same order of sortDocs() = {lstSorted == jProducts.value()}")
+
+    jCheap, jExpensive = jProducts.topDocs('features.price', 10), jDocument(loadJsonSample('../tests/products_sample.json')).sortDocs('features.price')[10:]
+    print(f"Merge of 2 sorted lists = {[jDoc['features']['price'] for jDoc in iterMerge([jExpensive, jCheap], 'features.price')][8:12]}")
+    jTop = jProducts.topDocs(['type', {'features.price': -1}], 10)
+    mergeJsonl([outputFile, jTop], os.path.join(tempDir, 'merged.jsonl'), ['type', {'features.price': -1}])
+    with open(os.path.join(tempDir, 'merged.jsonl'), encoding='utf-8') as f:
+        print(f"Merged lines = {[(obj['type'], obj['features']['price']) for obj in map(json.loads, f)][:4]}")
+
+# streaming: the elements of a large array are decoded one at a time
+print("\n" + '-' * 20 + " STREAMING")
+print(f"Num of products read one at a time = {sum(1 for _ in jDocument.iterFile('../tests/products_sample.json'))}")
+jFilterCheap = compileFilter([{'And': [{'Attribute': 'features.price', 'Operator': 'lt', 'Value': 15}]}])
+print(f"Cheap products (streamed and filtered) = {[obj['title'] for obj in jDocument.iterFile('../tests/products_sample.json', flagRawDocs=True) if jFilterCheap(obj)]}")
+hll = HyperLogLog()
+hll.update(attributeValues(jDocument.iterFile('../tests/products_sample.json', flagRawDocs=True), 'type'))
+print(f"Distinct types (streamed into a HyperLogLog) = {hll.count()}")
+print(f"Names of the array 'data' of the page = {[jDoc['name'] for jDoc in jDocument.iterFile('../tests/page_sample.json', prefix='data')]}")
+
+# JSON Lines: read and written line by line
+print("\n" + '-' * 20 + " JSON LINES")
+with tempfile.TemporaryDirectory() as tempDir:
+    jsonlFile = os.path.join(tempDir, 'products.jsonl')
+    jProducts = jDocument(loadJsonSample('../tests/products_sample.json'))
+    print(f"Lines written = {jProducts.toJsonl(jsonlFile)}")
+    print(f"First product read (lazy) = {next(jDocument.fromJsonl(jsonlFile))['title']}")
+    print(f"Same documents read back = {jDocument.fromJsonl(jsonlFile, flagLazy=False).value() == jProducts.value()}")
+    print(f"Same documents decoded by 2 processes = {list(jDocument.fromJsonl(jsonlFile, parallel=2, flagRawDocs=True)) == jProducts.value()}")
+
+print("\n" + '-' * 20 + " JSON BACKENDS")
+txt = jsjson.dumps(jDocument(loadJsonSample('../tests/products_sample.json')).value())
+previous = jsjson.setBackend('json')
+expected = (jsjson.loads(txt), jsjson.loads('[{"d": "2021-03-04"}, "2021-03-04", 1e400, 123456789012345678901234567890]'))
+results = []
+for backend in jsjson.installedBackends():
+    jsjson.setBackend(backend)
+    results.append((jsjson.loads(txt), jsjson.loads('[{"d": "2021-03-04"}, "2021-03-04", 1e400, 123456789012345678901234567890]')))
+jsjson.setBackend(previous)
+print(f"Same documents decoded by all the backends = {all(result == expected for result in results)}")
+print(f"Dates decoded only in the objects = {expected[1][:2]}")
+print(f"Pretty with dates = {jsjson.dumps({'d': datetime(2021, 3, 4, 5, 6, 7), 'name': 'Açaí'}, flagPretty=True)}")
+print(f"Ascii = {jsjson.dumps({'name': 'Açaí'}, ensure_ascii=True)}")
+
+print("\n" + '-' * 20 + " DATES")
+print(f"Dates decoded = {[jsjson.decodeDate(txt) for txt in ['2021-03-04', '2021-03-04T05:06:07.123', '2021-3-4', '2021-02-30', '15-4020']]}")
+txt = '{"created": "2021-03-04", "code": "2021-03-04", "history": [{"updated": "2021-03-05T10:00:00.000000"}]}'
+print(f"All the attributes = {jsjson.loads(txt)}")
+print(f"Only 'updated' = {jsjson.loads(txt, dateAttributes=['updated'])}")
+previous = jsjson.setDateAttributes(False)
+print(f"Dates kept as strings = {jDocument(txt).value('created')!r}")
+jsjson.setDateAttributes(previous)
+print(f"Dates converted again = {jDocument(txt).value('created')!r}")
+
+print("\n" + '-' * 20 + " MAPPED FILES")
+with tempfile.TemporaryDirectory() as tempDir:
+    data = loadJsonSample('../tests/products_sample.json')
+    jsonlFile = os.path.join(tempDir, 'products.jsonl')
+    arrayFile = os.path.join(tempDir, 'products.json')
+    jDocument(data).toJsonl(jsonlFile)
+    with open(arrayFile, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+    for filename in (jsonlFile, arrayFile):
+        jMapped = jDocument.mapFile(filename, indexFile=filename + '.idx')
+        print(f"{os.path.basename(filename)}: {len(jMapped)} documents, item 3 = {jMapped.item(3)['title']}, last = {jMapped[-1]['title']}")
+        print(f"Same documents = {[jDoc.value() for jDoc in jMapped] == data}")
+        print(f"Fruits = {len(jMapped.findDocs({'type': 'fruit'}))}, mean price = {jMapped.mean('features.price')}")
+        jMapped.createIndex('type')
+        print(f"Fruits (index) = {len(jMapped.findDocs({'type': 'fruit'}))}, saved index reused = {jDocument.mapFile(filename, indexFile=filename + '.idx').jData._starts == jMapped.jData._starts}")
+        try:
+            jMapped.addDoc({'title': 'new'})
+        except Exception as e:
+            print(e)
+        jMapped.jData.close()
+    # endfor --
+
+print("\n" + '-' * 20 + " ELASTICSEARCH BULK")
+data = [dict(obj, sku=f'SKU-{i}') for i, obj in enumerate(loadJsonSample('../tests/products_sample.json'))]
+lines = dumpBulkElastik(jDocument(data), 'sku', index='products').splitlines()
+print(f"Lines = {len(lines)}, first action = {lines[0]}")
+print(f"Same documents = {[json.loads(line) for line in lines[1::2]] == data}")
+print(f"Documents per chunk = {[len(chunk.splitlines()) for chunk in iterBulkChunks(data, 'sku', action='delete', maxDocs=20)]}")
+chunks = list(iterBulkChunks([jDocument(obj) for obj in data], 'sku', maxBytes=4000))
+print(f"Chunks of at most 4000 bytes = {len(chunks) > 1 and all(len(chunk) <= 4000 for chunk in chunks)}, same documents = {b''.join(chunks).decode('utf-8').splitlines() == dumpBulkElastik(data, 'sku').splitlines()}")
+print(f"Update = {next(iterBulkChunks(data[:1], 'sku', action='update')).decode('utf-8').splitlines()[0]}")
+buffer = io.BytesIO()
+print(f"Documents written = {writeBulk(data, buffer, 'sku', parallel=2)}, same as serial = {buffer.getvalue() == b''.join(iterBulkChunks(data, 'sku'))}")
+with tempfile.TemporaryDirectory() as tempDir:
+    print(f"Documents written = {writeBulk(data, os.path.join(tempDir, 'products_{:02d}.ndjson'), 'sku', maxDocs=20)}, files = {sorted(os.listdir(tempDir))}")
+try:
+    dumpBulkElastik(data, action='delete')
+except Exception as e:
+    print(e)